@@ -7,6 +7,7 @@ from .models import (
     Widget,
     Filter,
     AnalysisFrameworkRole,
+    WidgetAttributeRefresh,
 )
 
 
@@ -15,6 +16,8 @@ AnalysisFrameworkRoleTypeEnum = convert_enum_to_graphene_enum(
 WidgetWidgetTypeEnum = convert_enum_to_graphene_enum(Widget.WidgetType, name='WidgetWidgetTypeEnum')
 WidgetWidthTypeEnum = convert_enum_to_graphene_enum(Widget.WidthType, name='WidgetWidthTypeEnum')
 WidgetFilterTypeEnum = convert_enum_to_graphene_enum(Filter.FilterType, name='WidgetFilterTypeEnum')
+WidgetAttributeRefreshStatusEnum = convert_enum_to_graphene_enum(
+    WidgetAttributeRefresh.Status, name='WidgetAttributeRefreshStatusEnum')
 
 enum_map = {
     get_enum_name_from_django_field(field): enum
@@ -23,5 +26,6 @@ enum_map = {
         (Widget.width, WidgetWidthTypeEnum),
         (Filter.filter_type, WidgetFilterTypeEnum),
         (AnalysisFrameworkRole.type, AnalysisFrameworkRoleTypeEnum),
+        (WidgetAttributeRefresh.status, WidgetAttributeRefreshStatusEnum),
     )
 }
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.17 on 2026-10-18 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis_framework', '0041_widget_mapping'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WidgetAttributeRefresh',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'Pending'), (1, 'Started'), (2, 'Success'), (3, 'Failed'), (4, 'Cancelled')], default=0)),
+                ('total_attributes', models.IntegerField(default=0)),
+                ('processed_attributes', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('widget', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attribute_refreshes', to='analysis_framework.widget')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WidgetAttributeRefreshChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_id', models.IntegerField()),
+                ('end_id', models.IntegerField()),
+                ('attributes_count', models.IntegerField()),
+                ('is_processed', models.BooleanField(default=False)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('refresh', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='analysis_framework.widgetattributerefresh')),
+            ],
+        ),
+    ]
@@ -1,7 +1,7 @@
 import copy
 from typing import Union, Optional
 
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 
 from utils.common import get_enum_display
@@ -68,6 +68,17 @@ class AnalysisFramework(UserResource):
         Clone analysis framework along with all widgets,
         filters and exportables
         """
+        clone_analysis_framework, _ = self.clone_with_id_map(user, title=title, description=description)
+        return clone_analysis_framework
+
+    @transaction.atomic
+    def clone_with_id_map(self, user, title: Optional[str] = None, description: Optional[str] = None):
+        """
+        Same as clone, but using bulk_create for each level.
+        Returns cloned framework and old->new id map for sections, widgets, filters and exportables
+        """
+        from .utils import get_widget_filters_and_exportable  # To avoid circular import
+
         title = title or "{} (cloned)".format(self.title[:230])  # Strip off extra chars from title
         description = description or ""
         clone_analysis_framework = AnalysisFramework(
@@ -79,26 +90,75 @@ class AnalysisFramework(UserResource):
         clone_analysis_framework.cloned_from = self
         clone_analysis_framework.save()
 
-        old_new_sections_map = {}
-        old_new_widgets_map = {}
+        id_map = dict(
+            sections={},
+            widgets={},
+            filters={},
+            exportables={},
+        )
+
+        # Sections
+        sections = list(self.section_set.all())
+        section_clones = []
+        for section in sections:
+            section_clone = copy.deepcopy(section)
+            section_clone.pk = None
+            section_clone.analysis_framework = clone_analysis_framework
+            section_clones.append(section_clone)
+        Section.objects.bulk_create(section_clones)
+        for section, section_clone in zip(sections, section_clones):
+            id_map['sections'][section.pk] = section_clone.pk
+
+        # Widgets (Conditional parents are assigned after all widgets are created)
+        widgets = list(self.widget_set.exclude(widget_id__in=Widget.DEPRECATED_TYPES))
+        widget_clones = []
+        for widget in widgets:
+            widget_clone = copy.deepcopy(widget)
+            widget_clone.pk = None
+            widget_clone.analysis_framework = clone_analysis_framework
+            widget_clone.section_id = id_map['sections'].get(widget.section_id)
+            widget_clone.conditional_parent_widget_id = None
+            widget_clones.append(widget_clone)
+        Widget.objects.bulk_create(widget_clones)
+        for widget, widget_clone in zip(widgets, widget_clones):
+            id_map['widgets'][widget.pk] = widget_clone.pk
         widgets_with_conditional = []
-        # Clone section and track old->new
-        for section in self.section_set.all():
-            old_new_sections_map[section.pk] = section.clone_to(clone_analysis_framework).pk
-        # Clone widget with new AF and section
-        for widget in self.widget_set.exclude(widget_id__in=Widget.DEPRECATED_TYPES):
-            cloned_widget = widget.clone_to(
-                clone_analysis_framework,
-                old_new_sections_map.get(widget.section_id),
-            )
-            old_new_widgets_map[widget.pk] = cloned_widget.pk
-            if cloned_widget.conditional_parent_widget_id:
-                widgets_with_conditional.append(cloned_widget)
-        # For widgets with conditional assigned.
-        for widget in widgets_with_conditional:
-            widget.conditional_parent_widget_id = old_new_widgets_map[widget.conditional_parent_widget_id]
-            widget.save(update_fields=('conditional_parent_widget_id',))
-        return clone_analysis_framework
+        for widget, widget_clone in zip(widgets, widget_clones):
+            if widget.conditional_parent_widget_id:
+                widget_clone.conditional_parent_widget_id = id_map['widgets'].get(widget.conditional_parent_widget_id)
+                widgets_with_conditional.append(widget_clone)
+        Widget.objects.bulk_update(widgets_with_conditional, ('conditional_parent_widget',))
+
+        # Filters/Exportables (Same as generated by Widget.save -> update_widget)
+        filters_map = {}
+        exportables_map = {}
+        for widget_clone in widget_clones:
+            filters, exportable = get_widget_filters_and_exportable(widget_clone)
+            for filter_key, filter in filters:
+                filters_map[(widget_clone.key, filter_key)] = Filter(
+                    **{
+                        **filter,
+                        'analysis_framework': clone_analysis_framework,
+                        'widget_key': widget_clone.key,
+                        'key': filter_key,
+                    }
+                )
+            if exportable:
+                exportables_map[widget_clone.key] = Exportable(
+                    analysis_framework=clone_analysis_framework,
+                    widget_key=widget_clone.key,
+                    data=exportable,
+                )
+        Filter.objects.bulk_create(filters_map.values())
+        Exportable.objects.bulk_create(exportables_map.values())
+        for filter_id, widget_key, filter_key in self.filter_set.values_list('id', 'widget_key', 'key'):
+            if (widget_key, filter_key) in filters_map:
+                id_map['filters'][filter_id] = filters_map[(widget_key, filter_key)].pk
+        for exportable_id, widget_key in self.exportable_set.values_list('id', 'widget_key'):
+            if widget_key in exportables_map:
+                id_map['exportables'][exportable_id] = exportables_map[widget_key].pk
+
+        return clone_analysis_framework, id_map
 
     @staticmethod
     def get_for(user):
@@ -335,9 +395,15 @@ class Widget(models.Model):
     def save(self, *args, **kwargs):
         if self.section:
             self.analysis_framework_id = self.section.analysis_framework_id
+        properties_changed = self.pk is not None and (
+            Widget.objects.filter(pk=self.pk).values_list('properties', flat=True).first() != self.properties
+        )
         super().save(*args, **kwargs)
         from .utils import update_widget
         update_widget(self)
+        if properties_changed:
+            # Existing entries' filter/export data are re-generated using new properties
+            WidgetAttributeRefresh.trigger(self)
 
     def __str__(self):
         return '{}:: {}:{} ({})'.format(self.analysis_framework_id, self.title, self.pk, self.widget_id)
@@ -369,6 +435,59 @@ class Widget(models.Model):
         return self.analysis_framework.can_modify(user)
 
 
+class WidgetAttributeRefresh(models.Model):
+    """
+    Re-generation of FilterData/ExportData of a widget's attributes (Eg: after widget properties change)
+    Attributes are processed by id range chunks in parallel (See analysis_framework.tasks)
+    """
+    class Status(models.IntegerChoices):
+        PENDING = 0, 'Pending'
+        STARTED = 1, 'Started'
+        SUCCESS = 2, 'Success'
+        FAILED = 3, 'Failed'
+        CANCELLED = 4, 'Cancelled'  # When a new refresh is triggered for the widget
+
+    ACTIVE_STATUS = [Status.PENDING, Status.STARTED]
+
+    widget = models.ForeignKey(Widget, on_delete=models.CASCADE, related_name='attribute_refreshes')
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.PENDING)
+    total_attributes = models.IntegerField(default=0)
+    processed_attributes = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Updated on each processed chunk, used to resume stalled refreshes
+    modified_at = models.DateTimeField(auto_now=True)
+    ended_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.widget_id}: {self.get_status_display()} ({self.processed_attributes}/{self.total_attributes})'
+
+    @classmethod
+    def trigger(cls, widget):
+        from .tasks import start_widget_attribute_refresh
+
+        cls.objects.filter(widget=widget, status__in=cls.ACTIVE_STATUS).update(status=cls.Status.CANCELLED)
+        if not widget.attribute_set.exists():
+            return
+        refresh = cls.objects.create(widget=widget)
+        transaction.on_commit(lambda: start_widget_attribute_refresh.delay(refresh.pk))
+        return refresh
+
+
+class WidgetAttributeRefreshChunk(models.Model):
+    """
+    Checkpoint for attributes (id range, inclusive) of a WidgetAttributeRefresh
+    """
+    refresh = models.ForeignKey(WidgetAttributeRefresh, on_delete=models.CASCADE, related_name='chunks')
+    start_id = models.IntegerField()
+    end_id = models.IntegerField()
+    attributes_count = models.IntegerField()
+    is_processed = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.refresh_id}: {self.start_id}-{self.end_id}'
+
+
 class Filter(models.Model):
     """
     A filter for a widget in an analysis framework
@@ -22,12 +22,14 @@ from .models import (
     Exportable,
     AnalysisFrameworkMembership,
     AnalysisFrameworkRole,
+    WidgetAttributeRefresh,
 )
 from .enums import (
     WidgetWidgetTypeEnum,
     WidgetWidthTypeEnum,
     WidgetFilterTypeEnum,
     AnalysisFrameworkRoleTypeEnum,
+    WidgetAttributeRefreshStatusEnum,
 )
 from .serializers import AnalysisFrameworkPropertiesGqlSerializer
 from .filter_set import AnalysisFrameworkGqFilterSet, AnalysisFrameworkTagGqFilterSet
@@ -201,6 +203,18 @@ class AnalysisFrameworkExportableType(DjangoObjectType):
         return root.widget_type  # NOTE: This is added from AnalysisFrameworkDetailType.resolve_exportables dataloader
 
 
+class WidgetAttributeRefreshType(DjangoObjectType):
+    class Meta:
+        model = WidgetAttributeRefresh
+        only_fields = (
+            'id', 'total_attributes', 'processed_attributes', 'created_at', 'modified_at', 'ended_at',
+        )
+
+    widget = graphene.ID(source='widget_id', required=True)
+    status = graphene.Field(WidgetAttributeRefreshStatusEnum, required=True)
+    status_display = EnumDescription(source='get_status_display', required=True)
+
+
 class AnalysisFrameworkMembershipType(ClientIdMixin, DjangoObjectType):
     class Meta:
         model = AnalysisFrameworkMembership
@@ -241,6 +255,8 @@ class AnalysisFrameworkDetailType(AnalysisFrameworkType):
         ),
     )
     properties = graphene.Field(AnalysisFrameworkPropertiesType)
+    # Latest refresh (Entries filter/export data re-generation) of each widget
+    widget_attribute_refreshes = DjangoListField(WidgetAttributeRefreshType)
 
     class Meta:
         model = AnalysisFramework
@@ -272,6 +288,12 @@ class AnalysisFrameworkDetailType(AnalysisFrameworkType):
             return info.context.dl.analysis_framework.members.load(root.id)
         return []  # NOTE: Always return empty array FIXME: without empty everything is returned
 
+    @staticmethod
+    def resolve_widget_attribute_refreshes(root, info):
+        return WidgetAttributeRefresh.objects.filter(
+            widget__analysis_framework=root,
+        ).order_by('widget_id', '-id').distinct('widget_id')
+
     @staticmethod
     def resolve_prediction_tags_mapping(root, info):
         project_membership_qs = ProjectMembership.objects\
@@ -1,12 +1,18 @@
 import logging
+from datetime import timedelta
 
 from celery import shared_task
+from django.db import models, transaction
 from django.utils import timezone
 
 from utils.common import redis_lock, get_temp_file
 from utils.files import generate_file_for_upload
 
-from .models import AnalysisFramework
+from .models import (
+    AnalysisFramework,
+    WidgetAttributeRefresh,
+    WidgetAttributeRefreshChunk,
+)
 from analysis_framework.export import export_af_to_csv
 
 logger = logging.getLogger(__name__)
@@ -29,3 +35,133 @@ def export_af_to_csv_task(af_id):
         logger.error(f'Failed to export AF: {af_id}', exc_info=True)
         return False
     return True
+
+
+# Attributes processed by a single task
+WIDGET_ATTRIBUTE_REFRESH_CHUNK_SIZE = 2000
+# Chunks are retried by resume_widget_attribute_refreshes
+WIDGET_ATTRIBUTE_REFRESH_MAX_ATTEMPTS = 3
+WIDGET_ATTRIBUTE_REFRESH_STALLED_THRESHOLD = timedelta(minutes=10)
+
+
+def _create_widget_attribute_refresh_chunks(refresh):
+    from entry.models import Attribute
+
+    attribute_ids = list(
+        Attribute.objects.filter(widget=refresh.widget_id).order_by('id').values_list('id', flat=True)
+    )
+    chunks = []
+    for index in range(0, len(attribute_ids), WIDGET_ATTRIBUTE_REFRESH_CHUNK_SIZE):
+        chunk_ids = attribute_ids[index:index + WIDGET_ATTRIBUTE_REFRESH_CHUNK_SIZE]
+        chunks.append(
+            WidgetAttributeRefreshChunk(
+                refresh=refresh,
+                start_id=chunk_ids[0],
+                end_id=chunk_ids[-1],
+                attributes_count=len(chunk_ids),
+            )
+        )
+    WidgetAttributeRefreshChunk.objects.bulk_create(chunks)
+    refresh.total_attributes = len(attribute_ids)
+
+
+def _dispatch_widget_attribute_refresh_chunks(refresh):
+    chunks_id = refresh.chunks.filter(is_processed=False).values_list('id', flat=True)
+    for chunk_id in chunks_id:
+        process_widget_attribute_refresh_chunk.delay(chunk_id)
+
+
+def _update_widget_attribute_refresh_status(refresh_id):
+    # Complete if all the chunks are processed
+    WidgetAttributeRefresh.objects.filter(
+        pk=refresh_id,
+        status=WidgetAttributeRefresh.Status.STARTED,
+    ).exclude(
+        chunks__is_processed=False,
+    ).update(
+        status=WidgetAttributeRefresh.Status.SUCCESS,
+        ended_at=timezone.now(),
+    )
+
+
+@shared_task
+@redis_lock('start_widget_attribute_refresh__{0}', 60 * 30)
+def start_widget_attribute_refresh(refresh_id):
+    refresh = WidgetAttributeRefresh.objects.filter(
+        pk=refresh_id,
+        status=WidgetAttributeRefresh.Status.PENDING,
+    ).first()
+    if refresh is None:
+        return False
+    with transaction.atomic():
+        _create_widget_attribute_refresh_chunks(refresh)
+        refresh.status = WidgetAttributeRefresh.Status.STARTED
+        refresh.save(update_fields=('status', 'total_attributes', 'modified_at'))
+    _dispatch_widget_attribute_refresh_chunks(refresh)
+    _update_widget_attribute_refresh_status(refresh.pk)  # For empty refresh
+    return True
+
+
+@shared_task
+@redis_lock('process_widget_attribute_refresh_chunk__{0}', 60 * 30)
+def process_widget_attribute_refresh_chunk(chunk_id):
+    from entry.models import Attribute
+    from entry.utils import update_entry_attributes
+
+    chunk = WidgetAttributeRefreshChunk.objects.select_related('refresh').filter(
+        pk=chunk_id,
+        is_processed=False,
+        refresh__status=WidgetAttributeRefresh.Status.STARTED,
+    ).first()
+    if chunk is None:  # Already processed or refresh is not active anymore
+        return False
+    refresh = chunk.refresh
+    try:
+        with transaction.atomic():
+            update_entry_attributes(
+                Attribute.objects.filter(
+                    widget=refresh.widget_id,
+                    id__gte=chunk.start_id,
+                    id__lte=chunk.end_id,
+                ).select_related('widget')
+            )
+            chunk.is_processed = True
+            chunk.save(update_fields=('is_processed',))
+            WidgetAttributeRefresh.objects.filter(pk=refresh.pk).update(
+                processed_attributes=models.F('processed_attributes') + chunk.attributes_count,
+                modified_at=timezone.now(),
+            )
+    except Exception:
+        logger.error(f'Failed to process widget attribute refresh chunk: {chunk_id}', exc_info=True)
+        WidgetAttributeRefreshChunk.objects.filter(pk=chunk_id).update(attempts=models.F('attempts') + 1)
+        return False
+    _update_widget_attribute_refresh_status(refresh.pk)
+    return True
+
+
+@shared_task
+@redis_lock('resume_widget_attribute_refreshes')
+def resume_widget_attribute_refreshes():
+    """
+    Scheduled task
+    Re-dispatch refreshes which haven't progressed for a while (Eg: worker crash/restart)
+    """
+    stalled_qs = WidgetAttributeRefresh.objects.filter(
+        status__in=WidgetAttributeRefresh.ACTIVE_STATUS,
+        modified_at__lt=timezone.now() - WIDGET_ATTRIBUTE_REFRESH_STALLED_THRESHOLD,
+    )
+    # Too many failures
+    stalled_qs.filter(
+        chunks__attempts__gte=WIDGET_ATTRIBUTE_REFRESH_MAX_ATTEMPTS,
+        chunks__is_processed=False,
+    ).update(
+        status=WidgetAttributeRefresh.Status.FAILED,
+        ended_at=timezone.now(),
+    )
+    for refresh in stalled_qs.all():
+        if refresh.status == WidgetAttributeRefresh.Status.PENDING:
+            start_widget_attribute_refresh.delay(refresh.pk)
+            continue
+        refresh.save(update_fields=('modified_at',))
+        _dispatch_widget_attribute_refresh_chunks(refresh)
+    return True
@@ -3,6 +3,8 @@ import json
 from unittest import mock
 
 from django.core.files.temp import NamedTemporaryFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from utils.graphene.tests import GraphQLTestCase, GraphQLSnapShotTestCase
 from user.factories import UserFactory
 from graphene_file_upload.django.testing import GraphQLFileUploadTestCase
@@ -870,6 +872,48 @@ class TestAnalysisFrameworkMutationSnapShotTestCase(GraphQLSnapShotTestCase):
         project.refresh_from_db()
         self.assertEqual(str(project.analysis_framework_id), response['analysisFrameworkClone']['result']['id'])
 
+    def test_analysis_framework_clone_id_map(self):
+        user = UserFactory.create()
+        af = AnalysisFrameworkFactory.create()
+        section1, section2 = SectionFactory.create_batch(2, analysis_framework=af)
+        widget1 = WidgetFactory.create(analysis_framework=af, section=section1, widget_id=Widget.WidgetType.NUMBER)
+        widget2 = WidgetFactory.create(
+            analysis_framework=af, section=section2, widget_id=Widget.WidgetType.MULTISELECT,
+            conditional_parent_widget=widget1,
+        )
+        widget3 = WidgetFactory.create(analysis_framework=af, widget_id=Widget.WidgetType.TEXT)
+
+        def _clone():
+            with CaptureQueriesContext(connection) as queries:
+                cloned = af.clone_with_id_map(user, title='AF (Cloned)')
+            return cloned, len(queries)
+
+        _, queries_count = _clone()
+        # Number of queries doesn't depend on the number of widgets
+        WidgetFactory.create_batch(3, analysis_framework=af, section=section1, widget_id=Widget.WidgetType.NUMBER)
+        (new_af, id_map), new_queries_count = _clone()
+        assert queries_count == new_queries_count
+
+        assert new_af.cloned_from == af
+        assert id_map['sections'].keys() == {section1.pk, section2.pk}
+        assert {widget1.pk, widget2.pk, widget3.pk}.issubset(id_map['widgets'].keys())
+        assert set(new_af.section_set.values_list('id', flat=True)) == set(id_map['sections'].values())
+        assert set(new_af.widget_set.values_list('id', flat=True)) == set(id_map['widgets'].values())
+        new_widget2 = Widget.objects.get(pk=id_map['widgets'][widget2.pk])
+        assert new_widget2.section_id == id_map['sections'][section2.pk]
+        assert new_widget2.conditional_parent_widget_id == id_map['widgets'][widget1.pk]
+        # Filters/Exportables are same as the original framework
+        for field, related_name in [
+            ('filters', 'filter_set'),
+            ('exportables', 'exportable_set'),
+        ]:
+            original_qs = getattr(af, related_name).order_by('widget_key')
+            new_qs = getattr(new_af, related_name).order_by('widget_key')
+            assert id_map[field].keys() == set(original_qs.values_list('id', flat=True))
+            assert set(new_qs.values_list('id', flat=True)) == set(id_map[field].values())
+            assert list(original_qs.values_list('widget_key', flat=True)) == \
+                list(new_qs.values_list('widget_key', flat=True))
+
     @mock.patch('analysis_framework.serializers.AfWidgetLimit')
     def test_widgets_limit(self, AfWidgetLimitMock):
         query = '''
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from unittest import mock
+
+from utils.graphene.tests import GraphQLTestCase
+
+from entry.models import ExportData
+from entry.factories import EntryFactory, EntryAttributeFactory
+from lead.factories import LeadFactory
+from project.factories import ProjectFactory
+from analysis_framework.models import Widget, WidgetAttributeRefresh
+from analysis_framework.factories import AnalysisFrameworkFactory, WidgetFactory
+from analysis_framework.tasks import resume_widget_attribute_refreshes
+
+
+class TestWidgetAttributeRefresh(GraphQLTestCase):
+    def setUp(self):
+        super().setUp()
+        self.af = AnalysisFrameworkFactory.create()
+        project = ProjectFactory.create(analysis_framework=self.af)
+        lead = LeadFactory.create(project=project)
+        self.widget = WidgetFactory.create(analysis_framework=self.af, widget_id=Widget.WidgetType.NUMBER)
+        self.other_widget = WidgetFactory.create(analysis_framework=self.af, widget_id=Widget.WidgetType.NUMBER)
+        for widget in [self.widget, self.other_widget]:
+            for value in range(5):
+                EntryAttributeFactory.create(
+                    entry=EntryFactory.create(project=project, lead=lead, analysis_framework=self.af),
+                    widget=widget,
+                    data={'value': value},
+                )
+        self.export_data_qs = ExportData.objects.filter(exportable__widget_key=self.widget.key)
+
+    @mock.patch('analysis_framework.tasks.WIDGET_ATTRIBUTE_REFRESH_CHUNK_SIZE', 2)
+    def test_widget_attribute_refresh(self):
+        self.export_data_qs.delete()
+
+        # Not triggered if properties are not changed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.widget.title = 'Updated title'
+            self.widget.save()
+        assert not WidgetAttributeRefresh.objects.exists()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.widget.properties = {'updated': True}
+            self.widget.save()
+        refresh = WidgetAttributeRefresh.objects.get(widget=self.widget)
+        assert refresh.status == WidgetAttributeRefresh.Status.SUCCESS
+        assert refresh.chunks.count() == 3
+        assert not refresh.chunks.filter(is_processed=False).exists()
+        assert refresh.total_attributes == refresh.processed_attributes == 5
+        assert self.export_data_qs.count() == 5
+
+    def test_widget_attribute_refresh_resume(self):
+        # NOTE: on_commit callbacks are not executed here, so refresh tasks are not started
+        self.widget.properties = {'updated': True}
+        self.widget.save()
+        refresh = WidgetAttributeRefresh.trigger(self.widget)
+        old_refresh = WidgetAttributeRefresh.objects.exclude(pk=refresh.pk).get()
+        assert old_refresh.status == WidgetAttributeRefresh.Status.CANCELLED
+        assert refresh.status == WidgetAttributeRefresh.Status.PENDING
+
+        # Stalled refresh are resumed
+        with mock.patch('analysis_framework.tasks.WIDGET_ATTRIBUTE_REFRESH_STALLED_THRESHOLD', timedelta(seconds=-1)):
+            resume_widget_attribute_refreshes()
+        refresh.refresh_from_db()
+        assert refresh.status == WidgetAttributeRefresh.Status.SUCCESS
+        assert refresh.processed_attributes == 5
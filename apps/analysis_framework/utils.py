@@ -2,39 +2,48 @@ from analysis_framework.models import Widget, Filter, Exportable
 from .widgets.store import widget_store
 
 
-def update_widget(widget):
+def get_widget_filters_and_exportable(widget):
+    """
+    Returns filters [(filter_key, filter_data)] and exportable data (or None) generated using widget's properties
+    """
     widget_properties = widget.properties or {}
     widget_module = widget_store.get(widget.widget_id)
 
     if widget_module is None:
         raise Exception(f'Unknown widget type: {widget.widget_id}')
 
-    new_filter_keys = []
+    filters = []
     if hasattr(widget_module, 'get_filters'):
-        filters = widget_module.get_filters(widget, widget_properties) or []
-        for filter in filters:
+        for filter in widget_module.get_filters(widget, widget_properties) or []:
             filter_key = filter.get('key', widget.key)
-            new_filter_keys.append(filter_key)
             filter['title'] = filter.get('title', widget.title)
-            Filter.objects.update_or_create(
-                analysis_framework=widget.analysis_framework,
-                widget_key=widget.key,
-                key=filter_key,
-                defaults=filter,
-            )
-
-    new_exportable_keys = []
+            filters.append((filter_key, filter))
+
+    exportable = None
     if hasattr(widget_module, 'get_exportable'):
-        exportable = widget_module.get_exportable(widget, widget_properties)
-        if exportable:
-            new_exportable_keys.append(widget.key)
-            Exportable.objects.update_or_create(
-                analysis_framework=widget.analysis_framework,
-                widget_key=widget.key,
-                defaults={
-                    'data': exportable,
-                },
-            )
+        exportable = widget_module.get_exportable(widget, widget_properties) or None
+    return filters, exportable
+
+
+def update_widget(widget):
+    filters, exportable = get_widget_filters_and_exportable(widget)
+
+    for filter_key, filter in filters:
+        Filter.objects.update_or_create(
+            analysis_framework=widget.analysis_framework,
+            widget_key=widget.key,
+            key=filter_key,
+            defaults=filter,
+        )
+
+    if exportable:
+        Exportable.objects.update_or_create(
+            analysis_framework=widget.analysis_framework,
+            widget_key=widget.key,
+            defaults={
+                'data': exportable,
+            },
+        )
 
 
 def update_widgets(widget_id=None, **widget_filters):
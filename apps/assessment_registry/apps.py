@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AssessmentRegistryConfig(AppConfig):
     name = 'assessment_registry'
+
+    def ready(self):
+        import assessment_registry.receivers  # noqa
@@ -1,4 +1,5 @@
 import graphene
+from typing import Optional
 from dataclasses import dataclass
 
 from django.db.models import Count, Sum, Avg, Case, Value, When
@@ -30,6 +31,7 @@ from .filter_set import (
     AssessmentDashboardFilterSet,
 )
 from .models import (
+    AssessmentDashboardAggregate,
     AssessmentRegistry,
     AssessmentRegistryOrganization,
     MethodologyAttribute,
@@ -57,11 +59,23 @@ def get_global_filters(_filter: dict, date_field="publication_date"):
     }
 
 
+def get_aggregate_qs(qs: models.QuerySet, *dimensions):
+    """
+    Return AssessmentDashboardAggregate rows of the grouping set with the given dimensions
+    """
+    return qs.filter(**{
+        f"{dimension}__isnull": dimension not in dimensions
+        for dimension in AssessmentDashboardAggregate.DIMENSIONS
+    }).order_by()
+
+
 @dataclass
 class AssessmentDashboardStat:
     cache_key: str
     assessment_registry_qs: models.QuerySet
     methodology_attribute_qs: models.QuerySet
+    # Not available when assessment filters are used
+    aggregate_qs: Optional[models.QuerySet] = None
 
 
 class AssessmentDashboardFilterInputType(graphene.InputObjectType):
@@ -429,15 +443,27 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
             'project': info.context.active_project.id,
             'filter': _filter.__dict__,
         })
+        aggregate_qs = None
+        if not any((_filter.get("assessment") or {}).values()):
+            # Rollup is only by date/dimensions, raw data is used for other filters
+            aggregate_qs = AssessmentDashboardAggregate.objects.filter(
+                project=info.context.active_project,
+                **get_global_filters(_filter, date_field="date"),
+            )
         return AssessmentDashboardStat(
             cache_key=cache_key,
             assessment_registry_qs=assessment_qs_filter,
             methodology_attribute_qs=methodology_attribute_qs,
+            aggregate_qs=aggregate_qs,
         )
 
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.TOTAL_ASSESSMENT_COUNT)
     def resolve_total_assessment(root: AssessmentDashboardStat, info) -> int:
+        if root.aggregate_qs is not None:
+            return get_aggregate_qs(root.aggregate_qs).aggregate(
+                count=Sum("assessment_count"),
+            )["count"] or 0
         return root.assessment_registry_qs.count()
 
     @staticmethod
@@ -449,6 +475,9 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.TOTAL_COLLECTION_TECHNIQUE_COUNT)
     def resolve_total_collection_technique(root: AssessmentDashboardStat, info) -> int:
+        if root.aggregate_qs is not None:
+            return get_aggregate_qs(root.aggregate_qs, "data_collection_technique")\
+                .values("data_collection_technique").distinct().count()
         return root.methodology_attribute_qs\
             .filter(data_collection_technique__isnull=False)\
             .values("data_collection_technique").distinct().count()
@@ -476,10 +505,18 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.COLLECTION_TECHNIQUE_COUNT)
     def resolve_collection_technique_count(root: AssessmentDashboardStat, info):
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "data_collection_technique")
+                .values("data_collection_technique")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("data_collection_technique")
+            )
+        # NOTE: Count of assessments (same as the rollup)
         return (
             root.methodology_attribute_qs.filter(data_collection_technique__isnull=False)
             .values("data_collection_technique")
-            .annotate(count=Count("data_collection_technique"))
+            .annotate(count=Count("assessment_registry", distinct=True))
             .order_by("data_collection_technique")
             .values('data_collection_technique', 'count')
         )
@@ -538,24 +575,40 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_PER_AFFECTED_GROUP)
     def resolve_assessment_per_affected_group(root: AssessmentDashboardStat, info):
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "affected_group")
+                .values("affected_group", "date")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("affected_group", "date")
+            )
         return root.assessment_registry_qs.annotate(
             affected_group=models.Func(models.F('affected_groups'), function='unnest'),
-        ).values('affected_group').order_by('affected_group').annotate(
-            count=Count('id')
-        ).values('affected_group', 'count').annotate(
-            date=TruncDay('publication_date')
-        ).values('affected_group', 'count', 'date')
+        ).values(
+            'affected_group',
+            date=TruncDay('publication_date'),
+        ).annotate(
+            count=Count('id', distinct=True)
+        ).order_by('affected_group', 'date')
 
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_PER_HUMANITRATION_SECTOR)
     def resolve_assessment_per_humanitarian_sector(root: AssessmentDashboardStat, info):
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "sector")
+                .values("sector", "date")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("sector", "date")
+            )
         return root.assessment_registry_qs.annotate(
             sector=models.Func(models.F('sectors'), function='unnest'),
-        ).values('sector').order_by('sector').annotate(
-            count=Count('id')
-        ).values('sector', 'count').annotate(
-            date=TruncDay('publication_date')
-        ).values('sector', 'count', 'date')
+        ).values(
+            'sector',
+            date=TruncDay('publication_date'),
+        ).annotate(
+            count=Count('id', distinct=True)
+        ).order_by('sector', 'date')
 
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_PER_PROTECTION_MANAGEMENT)
@@ -571,30 +624,38 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_AFFECTED_GROUP_AND_SECTOR)
     def resolve_assessment_per_affected_group_and_sector(root: AssessmentDashboardStat, info):
-        # TODO : Global filter and assessment filter need to implement
+        if root.aggregate_qs is not None:
+            return [
+                AssessmentPerAffectedGroupAndSectorCountByDateType(**data)
+                for data in get_aggregate_qs(root.aggregate_qs, "sector", "affected_group")
+                .values("sector", "affected_group")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("sector", "-affected_group")
+            ]
+        assessment_ids_sql, assessment_ids_params = root.assessment_registry_qs\
+            .order_by().values('id').query.sql_with_params()
         with django_db_connection.cursor() as cursor:
             query = f'''
                 SELECT
                     sector,
                     affected_group,
-                    Count(*) as count
+                    Count(DISTINCT id) as count
                 FROM (
                     select
                         -- Only select required fields
                         id,
                         sectors,
-                        affected_groups,
-                        project_id
+                        affected_groups
                 FROM assessment_registry_assessmentregistry
-                    -- Only process required rows
+                    -- Only process required rows (global and assessment filters)
+                    WHERE id IN ({assessment_ids_sql})
                 )as t
                 CROSS JOIN unnest(t.sectors) AS sector
                 CROSS JOIN unnest(t.affected_groups) AS affected_group
-                WHERE project_id = {info.context.active_project.id}
                 GROUP BY sector, affected_group
                 ORDER BY sector, affected_group DESC;
                 '''
-            cursor.execute(query, {})
+            cursor.execute(query, assessment_ids_params)
             return [
                 AssessmentPerAffectedGroupAndSectorCountByDateType(sector=data[0], affected_group=data[1], count=data[2])
                 for data in cursor.fetchall()
@@ -603,14 +664,20 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_AFFECTED_GROUP_AND_GEOAREA)
     def resolve_assessment_per_affected_group_and_geoarea(root: AssessmentDashboardStat, info):
-        return (
-            root.assessment_registry_qs.values("locations", date=TruncDay("publication_date"))
-            .annotate(
-                geo_area=models.F("locations"),
-                count=Count("id"),
-                affected_group=models.Func(models.F("affected_groups"), function="unnest"),
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "geo_area", "affected_group")
+                .filter(geo_area__admin_level__level=1)
+                .values("geo_area", "affected_group", "date")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("-count")[:10]
             )
-            .filter(locations__admin_level__level=1)
+        return (
+            # NOTE: Filter is used before values so that the same locations join is used
+            root.assessment_registry_qs.filter(locations__admin_level__level=1)
+            .annotate(affected_group=models.Func(models.F("affected_groups"), function="unnest"))
+            .values("affected_group", geo_area=models.F("locations"), date=TruncDay("publication_date"))
+            .annotate(count=Count("id", distinct=True))
             .values("geo_area", "affected_group", "count", "date")
             .order_by("-count")[:10]
         )
@@ -618,14 +685,20 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_SECTOR_AND_GEOAREA)
     def resolve_assessment_per_sector_and_geoarea(root: AssessmentDashboardStat, info):
-        return (
-            root.assessment_registry_qs.values("locations")
-            .annotate(
-                geo_area=models.F("locations"),
-                count=Count("id"),
-                sector=models.Func(models.F("sectors"), function="unnest"),
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "geo_area", "sector")
+                .filter(geo_area__admin_level__level=1)
+                .values("geo_area", "sector")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("-count")[:10]
             )
-            .filter(locations__admin_level__level=1)
+        return (
+            # NOTE: Filter is used before values so that the same locations join is used
+            root.assessment_registry_qs.filter(locations__admin_level__level=1)
+            .annotate(sector=models.Func(models.F("sectors"), function="unnest"))
+            .values("sector", geo_area=models.F("locations"))
+            .annotate(count=Count("id", distinct=True))
             .values("geo_area", "sector", "count")
             .order_by("-count")[:10]
         )
@@ -647,11 +720,19 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.ASSESSMENT_PER_DATA_COLLECTION_TECHNIQUE)
     def resolve_assessment_per_datatechnique(root: AssessmentDashboardStat, info):
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "data_collection_technique")
+                .values("data_collection_technique", "date")
+                .annotate(count=Sum("assessment_count"))
+                .order_by("data_collection_technique", "date")
+            )
+        # NOTE: Count of assessments (same as the rollup)
         return (
-            root.methodology_attribute_qs.values(date=TruncDay("assessment_registry__publication_date"))
-            .annotate(count=Count("data_collection_technique"))
-            .values("data_collection_technique", "count", "date")
-            .order_by("data_collection_technique")
+            root.methodology_attribute_qs.filter(data_collection_technique__isnull=False)
+            .values("data_collection_technique", date=TruncDay("assessment_registry__publication_date"))
+            .annotate(count=Count("assessment_registry", distinct=True))
+            .order_by("data_collection_technique", "date")
         )
 
     @staticmethod
@@ -707,17 +788,32 @@ class AssessmentDashboardStatisticsType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.AssessmentDashboard.DATA_COLLECTION_TECHNIQUE_AND_GEOLOCATION)
     def resolve_assessment_by_data_collection_technique_and_geolocation(root: AssessmentDashboardStat, info):
+        if root.aggregate_qs is not None:
+            return (
+                get_aggregate_qs(root.aggregate_qs, "geo_area", "data_collection_technique")
+                .values(
+                    "data_collection_technique",
+                    "geo_area",
+                    region=models.F("geo_area__admin_level__region"),
+                    admin_level_id=models.F("geo_area__admin_level_id"),
+                )
+                .annotate(count=Sum("assessment_count"))
+                .order_by("geo_area", "data_collection_technique")
+            )
         return (
-            root.methodology_attribute_qs.filter(assessment_registry__locations__isnull=False)
+            root.methodology_attribute_qs.filter(
+                assessment_registry__locations__isnull=False,
+                data_collection_technique__isnull=False,
+            )
             .values(
                 "data_collection_technique",
                 geo_area=models.F("assessment_registry__locations"),
                 region=models.F("assessment_registry__locations__admin_level__region"),
                 admin_level_id=models.F("assessment_registry__locations__admin_level_id"),
             )
-            .annotate(count=Count("assessment_registry__locations"))
+            .annotate(count=Count("assessment_registry", distinct=True))
             .values('data_collection_technique', 'geo_area', 'region', 'admin_level_id', 'count')
-            .order_by("assessment_registry__locations")
+            .order_by("geo_area", "data_collection_technique")
         )
 
     @staticmethod
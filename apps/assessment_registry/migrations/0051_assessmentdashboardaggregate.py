@@ -0,0 +1,99 @@
+# Generated by Django 3.2.17 on 2026-10-18 14:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# NOTE: Copy of assessment_registry.tasks.get_update_assessment_dashboard_aggregate_sqls (for all projects/dates)
+# using literal table/column names, as the models can change later.
+BACKFILL_SQL = '''
+    INSERT INTO assessment_registry_assessmentdashboardaggregate (
+        project_id,
+        date,
+        geo_area_id,
+        sector,
+        affected_group,
+        data_collection_technique,
+        assessment_count
+    )
+    SELECT
+        project_id,
+        date,
+        geo_area_id,
+        sector,
+        affected_group,
+        data_collection_technique,
+        COUNT(DISTINCT assessment_id)
+    FROM (
+        SELECT
+            AR.id AS assessment_id,
+            AR.project_id AS project_id,
+            AR.publication_date AS date,
+            AR_L.geoarea_id AS geo_area_id,
+            AR_S.sector AS sector,
+            AR_AG.affected_group AS affected_group,
+            AR_M.data_collection_technique AS data_collection_technique
+        FROM assessment_registry_assessmentregistry AR
+            LEFT JOIN assessment_registry_assessmentregistry_locations AR_L ON
+                AR_L.assessmentregistry_id = AR.id
+            LEFT JOIN LATERAL unnest(AR.sectors) AS AR_S(sector) ON TRUE
+            LEFT JOIN LATERAL unnest(AR.affected_groups) AS AR_AG(affected_group) ON TRUE
+            LEFT JOIN (
+                SELECT DISTINCT
+                    assessment_registry_id,
+                    data_collection_technique
+                FROM assessment_registry_methodologyattribute
+                WHERE data_collection_technique IS NOT NULL
+            ) AR_M ON AR_M.assessment_registry_id = AR.id
+        WHERE AR.publication_date IS NOT NULL
+    ) AS assessment_data
+    GROUP BY project_id, date, GROUPING SETS (
+        (),
+        (geo_area_id),
+        (sector),
+        (affected_group),
+        (data_collection_technique),
+        (geo_area_id, sector),
+        (geo_area_id, affected_group),
+        (geo_area_id, data_collection_technique),
+        (sector, affected_group)
+    )
+    HAVING
+        NOT (GROUPING(geo_area_id) = 0 AND geo_area_id IS NULL) AND
+        NOT (GROUPING(sector) = 0 AND sector IS NULL) AND
+        NOT (GROUPING(affected_group) = 0 AND affected_group IS NULL) AND
+        NOT (GROUPING(data_collection_technique) = 0 AND data_collection_technique IS NULL)
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geo', '0044_geoareaclosure'),
+        ('project', '0003_auto_20230508_0608'),
+        ('assessment_registry', '0050_alter_scoreanalyticaldensity_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssessmentDashboardAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('sector', models.IntegerField(choices=[(1, 'Food Security'), (2, 'Health'), (3, 'Shelter'), (4, 'Wash'), (5, 'Protection'), (6, 'Nutrition'), (7, 'Livelihood'), (8, 'Education'), (9, 'Logistics'), (10, 'Inter/Cross Sector')], null=True)),
+                ('affected_group', models.IntegerField(choices=[(1, 'All'), (2, 'All/Affected'), (3, 'All/Not Affected'), (4, 'All/Affected/Not Displaced'), (5, 'All/Affected/Displaced'), (6, 'All/Affected/Displaced/In Transit'), (7, 'All/Affected/Displaced/Migrants'), (8, 'All/Affected/Displaced/IDPs'), (9, 'All/Affected/Displaced/Asylum Seeker'), (10, 'All/Affected/Displaced/Other of concerns'), (11, 'All/Affected/Displaced/Returnees'), (12, 'All/Affected/Displaced/Refugees'), (13, 'All/Affected/Displaced/Migrants/In transit'), (14, 'All/Affected/Displaced/Migrants/Permanents'), (15, 'All/Affected/Displaced/Migrants/Pendular'), (16, 'All/Affected/Not Displaced/Not Host'), (17, 'All/Affected/Not Displaced/Host')], null=True)),
+                ('data_collection_technique', models.IntegerField(choices=[(1, 'Secondary Data Review'), (2, 'Key Informant Interview'), (3, 'Direct Observation'), (4, 'Community Group Discussion'), (5, 'Focus Group Discussion'), (6, 'Household Interview'), (7, 'Individual Interview'), (8, 'Satellite Imagery')], null=True)),
+                ('assessment_count', models.IntegerField()),
+                ('geo_area', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='geo.geoarea')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='project.project')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='assessmentdashboardaggregate',
+            index=models.Index(fields=['project', 'date'], name='assessment__project_8995e3_idx'),
+        ),
+        migrations.RunSQL(
+            BACKFILL_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -867,3 +867,29 @@ class SummarySubDimensionIssue(UserResource):
     text = models.TextField(blank=True)
     order = models.IntegerField()
     lead_preview_text_ref = models.JSONField(default=None, blank=True, null=True)
+
+
+class AssessmentDashboardAggregate(models.Model):
+    """
+    Daily (publication date) rollup of assessments used by the assessment dashboard.
+    Each row belongs to one grouping set of the dimensions, NULL dimension means it is not part of the set.
+    Refreshed for the affected project/dates when an assessment (or its methodology/locations) is changed
+    and fully rebuilt daily.
+    """
+    DIMENSIONS = ('geo_area', 'sector', 'affected_group', 'data_collection_technique')
+
+    project = models.ForeignKey('project.Project', on_delete=models.CASCADE)
+    date = models.DateField()
+    geo_area = models.ForeignKey(GeoArea, on_delete=models.CASCADE, null=True)
+    sector = models.IntegerField(choices=AssessmentRegistry.SectorType.choices, null=True)
+    affected_group = models.IntegerField(choices=AssessmentRegistry.AffectedGroupType.choices, null=True)
+    data_collection_technique = models.IntegerField(
+        choices=MethodologyAttribute.CollectionTechniqueType.choices,
+        null=True,
+    )
+    assessment_count = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'date']),
+        ]
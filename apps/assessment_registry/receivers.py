@@ -0,0 +1,54 @@
+from django.db import models
+from django.dispatch import receiver
+
+from .models import AssessmentRegistry, MethodologyAttribute
+from .tasks import update_assessment_dashboard_aggregates
+
+
+# NOTE: Rollup is refreshed for the affected project/dates on every change (and fully rebuilt daily, see tasks)
+def update_assessment_registry_aggregates(assessment_registry_ids):
+    for project_id, publication_date in AssessmentRegistry.objects.filter(
+        pk__in=assessment_registry_ids,
+    ).values_list('project_id', 'publication_date').distinct():
+        update_assessment_dashboard_aggregates(project_id, [publication_date])
+
+
+@receiver(models.signals.pre_save, sender=AssessmentRegistry)
+def assessment_registry_pre_save(sender, instance, **kwargs):
+    # Previous project/date is also refreshed if they are changed
+    instance._old_aggregate_key = None
+    if instance.pk:
+        instance._old_aggregate_key = AssessmentRegistry.objects.filter(
+            pk=instance.pk,
+        ).values_list('project_id', 'publication_date').first()
+
+
+@receiver(models.signals.post_save, sender=AssessmentRegistry)
+def assessment_registry_post_save(sender, instance, **kwargs):
+    old_aggregate_key = getattr(instance, '_old_aggregate_key', None)
+    if old_aggregate_key and old_aggregate_key != (instance.project_id, instance.publication_date):
+        old_project_id, old_publication_date = old_aggregate_key
+        update_assessment_dashboard_aggregates(old_project_id, [old_publication_date])
+    update_assessment_dashboard_aggregates(instance.project_id, [instance.publication_date])
+
+
+@receiver(models.signals.post_delete, sender=AssessmentRegistry)
+def assessment_registry_post_delete(sender, instance, **kwargs):
+    update_assessment_dashboard_aggregates(instance.project_id, [instance.publication_date])
+
+
+@receiver(models.signals.post_save, sender=MethodologyAttribute)
+@receiver(models.signals.post_delete, sender=MethodologyAttribute)
+def methodology_attribute_post_save_delete(sender, instance, **kwargs):
+    update_assessment_registry_aggregates([instance.assessment_registry_id])
+
+
+@receiver(models.signals.m2m_changed, sender=AssessmentRegistry.locations.through)
+def assessment_registry_locations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        update_assessment_registry_aggregates([instance.pk])
+    elif pk_set:
+        # GeoArea.focus_location_assessment_reg is changed
+        update_assessment_registry_aggregates(pk_set)
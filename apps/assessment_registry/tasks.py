@@ -0,0 +1,135 @@
+import logging
+from typing import Iterable, Union
+
+from celery import shared_task
+from django.db import connection, transaction
+
+from utils.common import redis_lock
+from .models import (
+    AssessmentRegistry,
+    AssessmentDashboardAggregate,
+    MethodologyAttribute,
+)
+
+logger = logging.getLogger(__name__)
+
+# Combination of dimensions (AssessmentDashboardAggregate.DIMENSIONS) used by the dashboard
+AGGREGATE_GROUPING_SETS = (
+    (),
+    ('geo_area',),
+    ('sector',),
+    ('affected_group',),
+    ('data_collection_technique',),
+    ('geo_area', 'sector'),
+    ('geo_area', 'affected_group'),
+    ('geo_area', 'data_collection_technique'),
+    ('sector', 'affected_group'),
+)
+
+
+def _tb(model):
+    # Return database table name
+    return model._meta.db_table
+
+
+def _column(model, field):
+    return model._meta.get_field(field).column
+
+
+def get_update_assessment_dashboard_aggregate_sqls(project_id: Union[int, None], dates: Union[Iterable, None]):
+    """
+    Re-calculate the rollup for the given project and (publication) dates
+    NOTE: None is used for all projects/dates
+    """
+    params = dict(
+        project_id=project_id,
+        dates=list(dates) if dates is not None else None,
+    )
+    aggregate_filters = []
+    assessment_filters = ['AR.publication_date IS NOT NULL']
+    if project_id is not None:
+        aggregate_filters.append('project_id = %(project_id)s')
+        assessment_filters.append('AR.project_id = %(project_id)s')
+    if dates is not None:
+        aggregate_filters.append('date = ANY(%(dates)s)')
+        assessment_filters.append('AR.publication_date = ANY(%(dates)s)')
+
+    dimension_columns = {
+        dimension: _column(AssessmentDashboardAggregate, dimension)
+        for dimension in AssessmentDashboardAggregate.DIMENSIONS
+    }
+    locations_through = AssessmentRegistry.locations.through
+    grouping_sets_sql = ', '.join(
+        '({})'.format(', '.join(dimension_columns[dimension] for dimension in grouping_set))
+        for grouping_set in AGGREGATE_GROUPING_SETS
+    )
+    # Skip rows without value for the dimension (eg: assessment without locations)
+    having_sql = ' AND '.join(
+        f'NOT (GROUPING({column}) = 0 AND {column} IS NULL)'
+        for column in dimension_columns.values()
+    )
+
+    yield f'''
+        DELETE FROM {_tb(AssessmentDashboardAggregate)}
+        {'WHERE ' + ' AND '.join(aggregate_filters) if aggregate_filters else ''}
+    ''', params
+    yield f'''
+        INSERT INTO {_tb(AssessmentDashboardAggregate)} (
+            project_id,
+            date,
+            {', '.join(dimension_columns.values())},
+            assessment_count
+        )
+        SELECT
+            project_id,
+            date,
+            {', '.join(dimension_columns.values())},
+            COUNT(DISTINCT assessment_id)
+        FROM (
+            SELECT
+                AR.id AS assessment_id,
+                AR.project_id AS project_id,
+                AR.publication_date AS date,
+                AR_L.{_column(locations_through, 'geoarea')} AS {dimension_columns['geo_area']},
+                AR_S.sector AS {dimension_columns['sector']},
+                AR_AG.affected_group AS {dimension_columns['affected_group']},
+                AR_M.data_collection_technique AS {dimension_columns['data_collection_technique']}
+            FROM {_tb(AssessmentRegistry)} AR
+                LEFT JOIN {_tb(locations_through)} AR_L ON
+                    AR_L.{_column(locations_through, 'assessmentregistry')} = AR.id
+                LEFT JOIN LATERAL unnest(AR.sectors) AS AR_S(sector) ON TRUE
+                LEFT JOIN LATERAL unnest(AR.affected_groups) AS AR_AG(affected_group) ON TRUE
+                LEFT JOIN (
+                    SELECT DISTINCT
+                        {_column(MethodologyAttribute, 'assessment_registry')} AS assessment_registry_id,
+                        data_collection_technique
+                    FROM {_tb(MethodologyAttribute)}
+                    WHERE data_collection_technique IS NOT NULL
+                ) AR_M ON AR_M.assessment_registry_id = AR.id
+            WHERE {' AND '.join(assessment_filters)}
+        ) AS assessment_data
+        GROUP BY project_id, date, GROUPING SETS ({grouping_sets_sql})
+        HAVING {having_sql}
+    ''', params
+
+
+def update_assessment_dashboard_aggregates(project_id=None, dates=None):
+    """
+    Refresh AssessmentDashboardAggregate for the given project/dates (Everything if not provided)
+    """
+    if dates is not None:
+        dates = set(date for date in dates if date is not None)
+        if not dates:
+            return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sql, params in get_update_assessment_dashboard_aggregate_sqls(project_id, dates):
+                cursor.execute(sql, params)
+                logger.debug(f'Rows affected: {cursor.rowcount}')
+
+
+@shared_task
+@redis_lock('update_assessment_dashboard_aggregates')
+def update_assessment_dashboard_aggregates_task():
+    # Daily full rebuild, for changes that don't trigger the model signals (eg: bulk create/update)
+    return update_assessment_dashboard_aggregates()
@@ -1,3 +1,4 @@
+import json
 from datetime import date
 
 from utils.graphene.tests import GraphQLTestCase
@@ -13,6 +14,7 @@ from assessment_registry.factories import (
     SummaryIssueFactory,
 )
 from assessment_registry.models import (
+    AssessmentDashboardAggregate,
     AssessmentRegistry,
     MethodologyAttribute,
     AdditionalDocument,
@@ -372,3 +374,119 @@ class AssessmentDashboardQuerySchema(GraphQLTestCase):
         self.assertEqual(content['medianQualityScoreByAnalyticalDensityDate'][0]['date'], str(date.today()))
         self.assertEqual(content['medianQualityScoreByAnalyticalDensityDate'][1]['finalScore'], 0.0)
         self.assertEqual(content['medianQualityScoreByGeoArea'][0]['finalScore'], 8.75)
+
+    def test_assessment_dashboard_aggregates(self):
+        query = """
+            query MyQuery($filter: AssessmentDashboardFilterInputType!, $id: ID!) {
+                project(id: $id) {
+                    assessmentDashboardStatistics(filter: $filter) {
+                        totalAssessment
+                        totalCollectionTechnique
+                        collectionTechniqueCount {
+                            count
+                            dataCollectionTechnique
+                        }
+                        assessmentPerAffectedGroup {
+                            count
+                            date
+                            affectedGroup
+                        }
+                        assessmentPerHumanitarianSector {
+                            count
+                            date
+                            sector
+                        }
+                        assessmentPerAffectedGroupAndSector {
+                            count
+                            sector
+                            affectedGroup
+                        }
+                        assessmentPerAffectedGroupAndGeoarea {
+                            count
+                            date
+                            affectedGroup
+                            geoArea {
+                                id
+                            }
+                        }
+                        assessmentPerSectorAndGeoarea {
+                            count
+                            sector
+                            geoArea {
+                                id
+                            }
+                        }
+                        assessmentPerDatatechnique {
+                            count
+                            date
+                            dataCollectionTechnique
+                        }
+                        assessmentByDataCollectionTechniqueAndGeolocation {
+                            count
+                            geoArea
+                            region
+                            adminLevelId
+                            dataCollectionTechnique
+                        }
+                    }
+                }
+            }
+        """
+        self.create_assessment_registry()
+        aggregate_qs = AssessmentDashboardAggregate.objects.filter(project=self.project1)
+        assert aggregate_qs.filter(
+            geo_area__isnull=True,
+            sector__isnull=True,
+            affected_group__isnull=True,
+            data_collection_technique__isnull=True,
+        ).get().assessment_count == 1
+        assert set(
+            aggregate_qs.filter(
+                geo_area__isnull=True,
+                sector__isnull=False,
+                affected_group__isnull=True,
+                data_collection_technique__isnull=True,
+            ).values_list('sector', flat=True)
+        ) == {
+            AssessmentRegistry.SectorType.HEALTH,
+            AssessmentRegistry.SectorType.SHELTER,
+            AssessmentRegistry.SectorType.WASH,
+        }
+        # 2 geo areas x 2 techniques
+        assert aggregate_qs.filter(
+            geo_area__isnull=False,
+            sector__isnull=True,
+            affected_group__isnull=True,
+            data_collection_technique__isnull=False,
+        ).count() == 4
+
+        def _query_check(filter):
+            return self.query_check(
+                query,
+                variables={"filter": filter, "id": self.project1.id},
+            )["data"]["project"]["assessmentDashboardStatistics"]
+
+        self.force_login(self.member_user)
+        filter = {"dateFrom": "2019-01-01", "dateTo": "2023-01-01"}
+        content = _query_check(filter)
+        # Same result using raw data (assessment filters are not supported by the aggregates)
+        raw_content = _query_check({
+            **filter,
+            "assessment": {
+                "sectors": [self.genum(AssessmentRegistry.SectorType.HEALTH)],
+            },
+        })
+        # NOTE: Top ten by count lists can have same count items in any order
+        for key in ['assessmentPerAffectedGroupAndGeoarea', 'assessmentPerSectorAndGeoarea']:
+            for _content in [content, raw_content]:
+                _content[key] = sorted(_content[key], key=lambda item: json.dumps(item, sort_keys=True))
+        assert content == raw_content
+        assert content["totalAssessment"] == 1
+        assert content["totalCollectionTechnique"] == 2
+        assert [item["sector"] for item in content["assessmentPerHumanitarianSector"]] == [
+            "HEALTH", "SHELTER", "WASH",
+        ]
+
+        # Aggregates are updated when the assessment is deleted
+        AssessmentRegistry.objects.filter(project=self.project1).delete()
+        assert not aggregate_qs.exists()
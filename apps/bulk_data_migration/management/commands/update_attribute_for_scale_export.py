@@ -1,12 +1,10 @@
 from django.core.management.base import BaseCommand
 
-from entry.models import Attribute
-from entry.utils import update_entry_attribute
+from entry.utils import update_attributes
 
 
 class Command(BaseCommand):
     help = 'Update attributes to export scales'
 
     def handle(self, *args, **options):
-        for each in Attribute.objects.filter(widget__widget_id__in=['scaleWidget', 'conditionalWidget']):
-            update_entry_attribute(each)
+        update_attributes(widget__widget_id__in=['scaleWidget', 'conditionalWidget'])
@@ -12,7 +12,7 @@ from django.db.models import (
 )
 
 from entry.models import Attribute, ExportData
-from entry.utils import update_entry_attribute
+from entry.utils import update_entry_attributes, ATTRIBUTES_UPDATE_CHUNK_SIZE
 from entry.widgets.store import widget_store
 from entry.widgets import conditional_widget
 from lead.models import Lead
@@ -77,9 +77,15 @@ class Command(BaseCommand):
         if total_to_process == 0:
             # Nothing to do here
             return
-        for index, attr in enumerate(attribute_qs.iterator(), start=1):
-            print(f'  - {index}/{total_to_process}', end='\r')
-            update_entry_attribute(attr)
+        attribute_qs = attribute_qs.select_related('widget').order_by('pk')
+        chunk = []
+        for index, attr in enumerate(attribute_qs.iterator(chunk_size=ATTRIBUTES_UPDATE_CHUNK_SIZE), start=1):
+            chunk.append(attr)
+            if len(chunk) >= ATTRIBUTES_UPDATE_CHUNK_SIZE or index == total_to_process:
+                print(f'  - {index}/{total_to_process}', end='\r')
+                update_entry_attributes(chunk)
+                chunk = []
+        update_entry_attributes(chunk)
         print(f' - Updated {total_to_process}')
 
     def handle(self, *args, **options):
@@ -8,13 +8,14 @@ from utils.files import generate_json_file_for_upload
 
 class SnapshotQuery:
     class DeepExplore:
+        # NOTE: Closed years are not regenerated unless their data changes,
+        # so time-relative fields (eg: totalEntriesAddedLastWeek) are only included in GLOBAL_FULL
         YEARLY = """
             query MyQuery($filter: ExploreDeepFilterInputType!) {
               deepExploreStats(filter: $filter) {
                 totalActiveUsers
                 totalAuthors
                 totalEntries
-                totalEntriesAddedLastWeek
                 totalLeads
                 totalProjects
                 totalPublishers
@@ -0,0 +1,68 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from lead.models import Lead
+from deduplication.tasks.indexing import get_lead_text
+from deduplication.utils import get_minhash, get_minhashes
+
+
+class Command(BaseCommand):
+    help = 'Compare per-token (get_minhash) and batched (get_minhashes) MinHash calculation'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            help='Use texts of the leads of this project',
+        )
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=200,
+            help='Number of texts to use',
+        )
+        parser.add_argument(
+            '--words',
+            type=int,
+            default=2000,
+            help='Number of words per generated text (Used if no project is provided)',
+        )
+
+    def get_texts(self, project_id, count, words_count):
+        if project_id:
+            leads_qs = Lead.objects.filter(project=project_id).select_related('leadpreview')[:count]
+            return [
+                text
+                for text in map(get_lead_text, leads_qs)
+                if text
+            ]
+        words = [
+            ''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 10)))
+            for _ in range(words_count * 2)
+        ]
+        return [
+            ' '.join(random.choices(words, k=words_count))
+            for _ in range(count)
+        ]
+
+    def handle(self, *_, **options):
+        texts = self.get_texts(options['project'], options['count'], options['words'])
+        self.stdout.write(f'Using {len(texts)} texts')
+
+        start = time.time()
+        minhashes = [get_minhash(text) for text in texts]
+        per_token_time = time.time() - start
+        self.stdout.write(f'Per token: {per_token_time:.3f}s')
+
+        start = time.time()
+        batch_minhashes = get_minhashes(texts)
+        batch_time = time.time() - start
+        self.stdout.write(f'Batched: {batch_time:.3f}s')
+
+        if minhashes != batch_minhashes:
+            self.stdout.write(self.style.ERROR('Batched minhashes are different from per token minhashes'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Same minhashes, speedup: {per_token_time / (batch_time or 1e-9):.2f}x'))
@@ -0,0 +1,73 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:00
+
+import pickle
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def migrate_pickled_indices(apps, schema_editor):
+    LSHIndex = apps.get_model('deduplication', 'LSHIndex')
+    LSHIndexBandKey = apps.get_model('deduplication', 'LSHIndexBandKey')
+    Lead = apps.get_model('lead', 'Lead')
+    for index_obj in LSHIndex.objects.filter(index_pickle__isnull=False).iterator():
+        if index_obj.pickle_version not in pickle.compatible_formats:
+            continue
+        index = pickle.loads(bytes(index_obj.index_pickle))
+        lead_ids = list(index.keys.keys())
+        existing_lead_ids = set(Lead.objects.filter(id__in=lead_ids).values_list('id', flat=True))
+        LSHIndexBandKey.objects.bulk_create(
+            [
+                LSHIndexBandKey(
+                    index=index_obj,
+                    lead_id=lead_id,
+                    band=band,
+                    key=key,
+                )
+                for lead_id in lead_ids
+                if lead_id in existing_lead_ids
+                for band, key in enumerate(index.keys.get(lead_id))
+            ],
+            batch_size=5000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lead', '0054_auto_20231218_0552'),
+        ('deduplication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LSHIndexBandKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('key', models.BinaryField()),
+                ('index', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='band_keys', to='deduplication.lshindex')),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='lead.lead')),
+            ],
+            options={
+                'unique_together': {('index', 'lead', 'band')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='lshindexbandkey',
+            index=models.Index(fields=['index', 'band', 'key'], name='deduplication_band_key_idx'),
+        ),
+        migrations.RunPython(
+            migrate_pickled_indices,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.RemoveField(
+            model_name='lshindex',
+            name='index_pickle',
+        ),
+        migrations.RemoveField(
+            model_name='lshindex',
+            name='pickle_version',
+        ),
+    ]
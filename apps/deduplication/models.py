@@ -1,7 +1,9 @@
-import pickle
-from django.db import models
-
 import logging
+from typing import List
+
+from django.db import models
+from django.utils.functional import cached_property
+from datasketch import LeanMinHash, MinHashLSH
 
 from apps.user_resource.models import UserResourceCreated
 from project.models import Project
@@ -44,67 +46,104 @@ class LSHIndex(UserResourceCreated):
         on_delete=models.CASCADE,
         unique=True,
     )
-    pickle_version = models.CharField(max_length=10, null=True)
-    index_pickle = models.BinaryField(null=True)
-    """
-    A NOTE ON index_pickle - @bewakes, Feb 02 2023
+    has_errored = models.BooleanField(default=False)
 
-    The index needs to persist that's why it is pickled and stored in db.
-    Another alternative would be to store it in other storages like s3 but I
-    think using db is lot cleaner.
+    class Meta:
+        verbose_name_plural = "LSH Indices"
+
+    @cached_property
+    def index(self) -> 'LSHIndexStore':
+        return LSHIndexStore(self)
 
-    One concern is what if the index gets larger. Postgres column can handle
-    columns upto 2 GB. The index indeed increases linearly in size with ~700
-    Bytes per document. But the number of leads in a project in DEEP is maximum
-    ~8300 till date, which will make the index size around 7MB which is not
-    that much even if we have around 20K leads per project.
 
-    We can also use redis as storage, but we will eventually need to persist
-    data somewhere and having both will add complexity.
+class LSHIndexBandKey(models.Model):
     """
-    has_errored = models.BooleanField(default=False)
+    MinHash LSH band key of a lead in an index
+    """
+    index = models.ForeignKey(LSHIndex, on_delete=models.CASCADE, related_name='band_keys')
+    lead = models.ForeignKey('lead.Lead', on_delete=models.CASCADE)
+    band = models.PositiveSmallIntegerField()
+    key = models.BinaryField()
 
     class Meta:
-        verbose_name_plural = "LSH Indices"
+        unique_together = ('index', 'lead', 'band')
+        indexes = [
+            models.Index(fields=['index', 'band', 'key'], name='deduplication_band_key_idx'),
+        ]
 
-    def load_index(self):
-        """This sets the attribute index if pickle is present"""
-        if (
-            hasattr(self, "index_pickle") and
-            self.index_pickle is not None and
-            self.pickle_version is not None
-        ):
-            supported_formats = pickle.compatible_formats
-            if self.pickle_version not in supported_formats:
-                logger.warn(
-                    "Pickle versions not compatible, setting index to None"
-                )
-                self._index = None
-            else:
-                self._index = pickle.loads(self.index_pickle)
-        else:
-            self._index = None
-        self._index_loaded = True
+
+class LSHIndexStore:
+    """
+    datasketch.MinHashLSH like index backed by LSHIndexBandKey rows
+
+    Each lead is stored as one row per band, so insert, query and remove only
+    touch O(bands) rows instead of (de)serializing the whole index, and
+    concurrent workers can index leads of the same project safely.
+    """
+
+    def __init__(self, index_obj: LSHIndex):
+        self.index_obj = index_obj
+        # Used only to get the optimal bands for the threshold (same as the pickled index used to)
+        lsh = MinHashLSH(threshold=LSHIndex.THRESHOLD, num_perm=LSHIndex.NUM_PERM)
+        self.num_perm = lsh.h
+        self.hashranges = lsh.hashranges
 
     @property
-    def index(self):
-        if not self._index_loaded or (
-            self._index is None and self.index_pickle is not None
-        ):
-            self.load_index()
-        return self._index
-
-    @index.setter
-    def index(self, value):
-        self._index = value
-        self.index_pickle = pickle.dumps(value)
-
-    def __init__(self, *args, **kwargs):
-        self._index_loaded = False
-        super().__init__(*args, **kwargs)
-
-    def save(self, *args, **kwargs):
-        # Set self._index_loaded = False so that next time it is accessed, it
-        # is reloaded
-        self._index_loaded = False
-        super().save(*args, **kwargs)
+    def band_keys_qs(self):
+        return LSHIndexBandKey.objects.filter(index=self.index_obj)
+
+    @property
+    def keys(self):
+        return self.band_keys_qs.order_by().values_list('lead_id', flat=True).distinct()
+
+    def get_band_keys(self, minhash: LeanMinHash):
+        if len(minhash) != self.num_perm:
+            raise ValueError('Expecting minhash with length %d, got %d' % (self.num_perm, len(minhash)))
+        # Same as MinHashLSH._byteswap
+        return [
+            bytes(minhash.hashvalues[start:end].byteswap().data)
+            for start, end in self.hashranges
+        ]
+
+    def insert(self, lead_id: int, minhash: LeanMinHash):
+        """
+        Same as MinHashLSH.insert, raises ValueError if lead is already indexed
+        """
+        if lead_id in self:
+            raise ValueError('The given key already exists')
+        self.insert_band_keys(lead_id, self.get_band_keys(minhash))
+
+    def insert_band_keys(self, lead_id: int, band_keys: List[bytes]):
+        LSHIndexBandKey.objects.bulk_create(
+            [
+                LSHIndexBandKey(
+                    index=self.index_obj,
+                    lead_id=lead_id,
+                    band=band,
+                    key=key,
+                )
+                for band, key in enumerate(band_keys)
+            ],
+            # Another worker may have indexed the lead already
+            ignore_conflicts=True,
+        )
+
+    def query(self, minhash: LeanMinHash) -> List[int]:
+        """
+        Same as MinHashLSH.query, returns ids of leads sharing at least a band with the minhash
+        """
+        band_filter = models.Q()
+        for band, key in enumerate(self.get_band_keys(minhash)):
+            band_filter |= models.Q(band=band, key=key)
+        return list(
+            self.band_keys_qs.filter(band_filter).order_by().values_list('lead_id', flat=True).distinct()
+        )
+
+    def remove(self, lead_id: int):
+        self.band_keys_qs.filter(lead_id=lead_id).delete()
+
+    def is_empty(self):
+        return not self.band_keys_qs.exists()
+
+    def __contains__(self, lead_id: int):
+        return self.band_keys_qs.filter(lead_id=lead_id).exists()
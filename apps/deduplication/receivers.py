@@ -1,3 +1,5 @@
+from typing import List
+
 from django.db import transaction, models
 from django.dispatch import receiver
 
@@ -5,20 +7,18 @@ from deduplication.models import LSHIndex
 from lead.models import Lead, LeadDuplicates
 
 
-@receiver(models.signals.post_delete, sender=LSHIndex)
+@receiver(models.signals.pre_delete, sender=LSHIndex)
 def set_leads_as_unindexed(sender, instance, **kwargs):
+    # NOTE: Band keys are deleted with the index, so collect indexed leads before
+    lead_ids = list(instance.index.keys)
     # set leads is_indexed False
     transaction.on_commit(
-        lambda: clear_duplicates(instance)
+        lambda: clear_duplicates(lead_ids)
     )
 
 
 @transaction.atomic
-def clear_duplicates(index_obj: LSHIndex):
-    index = index_obj.index
-    if index is None:
-        return
-    lead_ids = list(index.keys)
+def clear_duplicates(lead_ids: List[int]):
     Lead.objects.filter(id__in=lead_ids).update(
         is_indexed=False,
         duplicate_leads_count=0,
@@ -1,21 +1,22 @@
-import pickle
+from typing import Optional
+
 from django.db import transaction
 from django.db.models import F
 from django.utils import timezone
 from celery import shared_task
 from celery.utils.log import get_task_logger
-from datasketch import LeanMinHash, MinHashLSH
+from datasketch import LeanMinHash
 
 from utils.common import batched
 from lead.models import Lead
 from project.models import Project
-from deduplication.models import LSHIndex
-from deduplication.utils import get_minhash, insert_to_index
+from deduplication.models import LSHIndex, LSHIndexStore
+from deduplication.utils import get_minhash, get_minhashes, insert_to_index
 
 logger = get_task_logger(__name__)
 
 
-def find_and_set_duplicate_leads(index: MinHashLSH, lead: Lead, minhash: LeanMinHash):
+def find_and_set_duplicate_leads(index: LSHIndexStore, lead: Lead, minhash: LeanMinHash):
     duplicate_lead_ids = index.query(minhash)
     duplicate_leads_qs = Lead.objects.filter(pk__in=duplicate_lead_ids)
     duplicate_leads_count = duplicate_leads_qs.count()
@@ -27,11 +28,16 @@ def find_and_set_duplicate_leads(index: MinHashLSH, lead: Lead, minhash: LeanMin
     lead.save(update_fields=['duplicate_leads_count'])
 
 
-def process_and_index_lead(lead: Lead, index: MinHashLSH):
-    text = lead.leadpreview.text_extract if hasattr(lead, 'leadpreview') else lead.text
-    if not text:
-        return index
-    minhash = get_minhash(text)
+def get_lead_text(lead: Lead):
+    return lead.leadpreview.text_extract if hasattr(lead, 'leadpreview') else lead.text
+
+
+def process_and_index_lead(lead: Lead, index: LSHIndexStore, minhash: Optional[LeanMinHash] = None):
+    if minhash is None:
+        text = get_lead_text(lead)
+        if not text:
+            return index
+        minhash = get_minhash(text)
     find_and_set_duplicate_leads(index, lead, minhash)
 
     insert_to_index(index, lead.id, minhash)
@@ -49,17 +55,18 @@ def process_and_index_leads(
     leads_qs = Lead.objects.filter(
         project=project,
         is_indexed=False,
-    )
-    index: MinHashLSH = index_obj.index
+    ).select_related('leadpreview')
+    index = index_obj.index
     try:
         batches = batched(leads_qs, batch_size=200)
         for batch in batches:
+            leads_text = [(lead, get_lead_text(lead)) for lead in batch]
+            leads_text = [(lead, text) for lead, text in leads_text if text]
+            # Calculate minhashes for the whole batch at once
+            minhashes = get_minhashes([text for _, text in leads_text])
             with transaction.atomic():
-                for lead in batch:
-                    process_and_index_lead(lead, index)
-                # Update the index
-                index_obj.index = index
-                index_obj.save()
+                for (lead, _), minhash in zip(leads_text, minhashes):
+                    process_and_index_lead(lead, index, minhash=minhash)
     except Exception:
         logger.error(
             f"Error creating index for project {project.title}({project.id})",
@@ -93,22 +100,12 @@ def create_indices():
 
 
 def get_index_object_for_project(project: Project) -> LSHIndex:
-    index_obj, created = LSHIndex.objects.get_or_create(
+    index_obj, _ = LSHIndex.objects.get_or_create(
         project=project,
         defaults={
             "name": project.title,
-            "pickle_version": pickle.format_version,
         },
     )
-
-    if created:
-        # MinHashLSH object will not be initialized during the creation, create it
-        index = MinHashLSH(
-            threshold=LSHIndex.THRESHOLD,
-            num_perm=LSHIndex.NUM_PERM,
-        )
-        index_obj.index = index
-        index_obj.save()
     return index_obj
 
 
@@ -119,7 +116,7 @@ def index_lead_and_calculate_duplicates(lead_id: int):
         logger.error(f"Cannot index inexistent lead(id={lead_id})")
         return
 
-    text = lead.leadpreview.text_extract if hasattr(lead, 'leadpreview') else lead.text
+    text = get_lead_text(lead)
     if not text:
         return
 
@@ -129,10 +126,7 @@ def index_lead_and_calculate_duplicates(lead_id: int):
         logger.warning(f"LSHIndex object has errored. object id {index_obj.id}")
         return
 
-    index = process_and_index_lead(lead, index_obj.index)
-    index_obj.index = index
-
-    index_obj.save(update_fields=['index_pickle'])
+    process_and_index_lead(lead, index_obj.index)
 
 
 @shared_task
@@ -146,10 +140,4 @@ def remove_lead_from_index(lead_id: int):
     if index_obj.has_errored:
         logger.warning(f"Attempt to remove lead from errored index for project {lead.project.id}")
         return
-    index = index_obj.index
-    if index is None:
-        logger.warning(f"Attempt to remove lead from inexistent index for project {lead.project.id}")
-        return
-    index.remove(lead.id)
-    index_obj.index = index
-    index_obj.save(update_fields=['index_pickle'])
+    index_obj.index.remove(lead.id)
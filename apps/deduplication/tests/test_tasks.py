@@ -7,8 +7,9 @@ from project.factories import ProjectFactory
 from lead.factories import LeadPreviewFactory, LeadFactory
 from lead.receivers import update_index_and_duplicates
 from lead.models import Lead, LeadDuplicates
-from deduplication.models import LSHIndex
+from deduplication.models import LSHIndex, LSHIndexBandKey
 from deduplication.factories import LSHIndexFactory
+from deduplication.utils import get_minhash, get_minhashes
 from deduplication.tasks.indexing import (
     process_and_index_lead,
     get_index_object_for_project,
@@ -194,3 +195,33 @@ class TestTasks(TestCase):
             lead_.refresh_from_db()
             lead = Lead.objects.get(id=lead_.id)
             assert lead.duplicate_leads_count == original_count - 1
+
+    def test_index_store(self):
+        project = ProjectFactory.create()
+        lead1, lead2, lead3 = LeadFactory.create_batch(3, project=project)
+        common_text = "This is a common text between two leads. The purpose is to mark them as duplicates"
+        index = get_index_object_for_project(project).index
+        index.insert(lead1.id, get_minhash(common_text))
+        index.insert(lead2.id, get_minhash(common_text))
+        index.insert(lead3.id, get_minhash("Some other totally different content for the third lead"))
+        # Each lead is stored as one row per band
+        assert LSHIndexBandKey.objects.filter(lead=lead1).count() == len(index.hashranges)
+        with pytest.raises(ValueError):
+            index.insert(lead1.id, get_minhash(common_text))
+
+        assert set(index.query(get_minhash(common_text))) == {lead1.id, lead2.id}
+        assert set(index.keys) == {lead1.id, lead2.id, lead3.id}
+
+        index.remove(lead1.id)
+        assert lead1.id not in index
+        assert set(index.query(get_minhash(common_text))) == {lead2.id}
+
+    def test_get_minhashes(self):
+        texts = [
+            "This is a common text between two leads. The purpose is to mark them as duplicates",
+            "",
+            "Some other totally different content",
+            "This is a common text between two leads.",
+        ]
+        with patch('deduplication.utils.MINHASH_BATCH_TOKENS_SIZE', 5):
+            assert get_minhashes(texts) == [get_minhash(text) for text in texts]
@@ -1,23 +1,89 @@
 import re
+from functools import lru_cache
+from typing import List
+
+import numpy as np
 from datasketch import MinHash, LeanMinHash
+from datasketch.hashfunc import sha1_hash32
+from datasketch.minhash import _mersenne_prime, _max_hash
 
 from deduplication.models import LSHIndex
 
+# Max number of tokens hashed against the permutations at once (tokens x NUM_PERM uint64 matrix)
+MINHASH_BATCH_TOKENS_SIZE = 10000
+
 
 def preprocess_text(txt: str):
     # Remove punctuations and make lowercase
     return re.sub(r"[!\"#\$%&\'\(\)\*\+,-\./:;<=>\?@\[\\\]\^_`{\|}~]", "", txt).lower()
 
 
+def get_tokens(txt: str):
+    return set(preprocess_text(txt).split())
+
+
 def get_minhash(txt: str) -> LeanMinHash:
-    processed = preprocess_text(txt)
-    items = set(processed.split())
+    items = get_tokens(txt)
     h = MinHash(num_perm=LSHIndex.NUM_PERM)
     for item in items:
         h.update(item.encode("utf8"))
     return LeanMinHash(h)
 
 
+@lru_cache(maxsize=None)
+def get_minhash_permutations():
+    # Same permutations (and seed) used by datasketch.MinHash
+    return MinHash(num_perm=LSHIndex.NUM_PERM).permutations
+
+
+def get_minhashes(texts: List[str]) -> List[LeanMinHash]:
+    """
+    Batched version of get_minhash
+    Token hashes of all the texts are permuted together using numpy in chunks,
+    the result is same as get_minhash for each text.
+    """
+    a, b = get_minhash_permutations()
+    seed = MinHash(num_perm=LSHIndex.NUM_PERM).seed
+
+    texts_tokens_hash = [
+        [sha1_hash32(token.encode("utf8")) for token in get_tokens(txt)]
+        for txt in texts
+    ]
+    # Tokens of each text are contiguous in tokens_hash
+    tokens_count = np.array([len(tokens_hash) for tokens_hash in texts_tokens_hash], dtype=np.int64)
+    texts_end = np.cumsum(tokens_count)
+    texts_start = texts_end - tokens_count
+    tokens_hash = np.fromiter(
+        (token_hash for tokens_hash in texts_tokens_hash for token_hash in tokens_hash),
+        dtype=np.uint64,
+        count=int(tokens_count.sum()),
+    )
+    non_empty_texts = np.flatnonzero(tokens_count)
+
+    hashvalues = np.full((len(texts), len(a)), _max_hash, dtype=np.uint64)
+    for start in range(0, len(tokens_hash), MINHASH_BATCH_TOKENS_SIZE):
+        end = min(start + MINHASH_BATCH_TOKENS_SIZE, len(tokens_hash))
+        # Same as MinHash.update, but for many tokens at once (uint64 overflow included)
+        permuted_hash = np.bitwise_and(
+            (tokens_hash[start:end, np.newaxis] * a + b) % _mersenne_prime,
+            _max_hash,
+        )
+        # Reduce permuted hashes of each text present in this chunk
+        chunk_texts = non_empty_texts[
+            (texts_start[non_empty_texts] < end) & (texts_end[non_empty_texts] > start)
+        ]
+        segments_start = np.maximum(texts_start[chunk_texts], start) - start
+        hashvalues[chunk_texts] = np.minimum(
+            hashvalues[chunk_texts],
+            np.minimum.reduceat(permuted_hash, segments_start, axis=0),
+        )
+
+    return [
+        LeanMinHash(seed=seed, hashvalues=text_hashvalues)
+        for text_hashvalues in hashvalues
+    ]
+
+
 def insert_to_index(index, lead_id, lead_hash: LeanMinHash):
     try:
         index.insert(lead_id, lead_hash)
@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand
 from deep.caches import CacheKey
 from deep_explore.tasks import (
     update_deep_explore_entries_count_by_geo_aggreagate,
+    update_deep_explore_project_daily_aggregates,
     generate_public_deep_explore_snapshot,
 )
 from geo.models import GeoArea
@@ -44,6 +45,8 @@ class Command(BaseCommand):
         # Update explore data
         with ShowRunTime(self, 'Geo Entries Aggregate Update'):
             update_deep_explore_entries_count_by_geo_aggreagate()
+        with ShowRunTime(self, 'Project Daily Aggregates Update'):
+            update_deep_explore_project_daily_aggregates()
 
         # Update public snapshots
         with ShowRunTime(self, 'DeepExplore Public Snapshot Update'):
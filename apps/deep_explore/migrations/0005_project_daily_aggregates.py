@@ -0,0 +1,79 @@
+# Generated by Django 3.2.17 on 2026-10-18 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('project', '0002_projectchangelog'),
+        ('organization', '0012_organization_popularity'),
+        ('analysis_framework', '0042_widgetattributerefresh'),
+        ('deep_explore', '0004_auto_20230227_0912'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aggregatetracker',
+            name='type',
+            field=models.IntegerField(choices=[(1, 'Entries Count By Geo Area'), (2, 'Project Daily Aggregates')], unique=True),
+        ),
+        migrations.CreateModel(
+            name='LeadsCountByProjectAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('leads_count', models.IntegerField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='project.project')),
+            ],
+            options={
+                'ordering': ('date',),
+                'unique_together': {('project', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='EntriesCountByProjectAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('entries_count', models.IntegerField()),
+                ('analysis_framework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='analysis_framework.analysisframework')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='project.project')),
+            ],
+            options={
+                'ordering': ('date',),
+                'unique_together': {('project', 'analysis_framework', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LeadsCountByOrganizationAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.SmallIntegerField(choices=[(1, 'Author'), (2, 'Publisher')])),
+                ('date', models.DateField()),
+                ('leads_count', models.IntegerField()),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='organization.organization')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='project.project')),
+            ],
+            options={
+                'ordering': ('date',),
+                'unique_together': {('project', 'organization', 'type', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ActiveUsersByProjectAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='project.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('date',),
+                'unique_together': {('project', 'user', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.17 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deep_explore', '0005_project_daily_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publicexploresnapshot',
+            name='data_hash',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='publicexploresnapshot',
+            name='generated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='publicexploresnapshot',
+            name='generation_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
 from django.core.exceptions import ValidationError
 
+from user.models import User
 from project.models import Project
 from geo.models import GeoArea
+from organization.models import Organization
+from analysis_framework.models import AnalysisFramework
 
 
 class AggregateTracker(models.Model):
@@ -11,6 +14,7 @@ class AggregateTracker(models.Model):
     """
     class Type(models.IntegerChoices):
         ENTRIES_COUNT_BY_GEO_AREA = 1
+        PROJECT_DAILY_AGGREGATES = 2
 
     type = models.IntegerField(choices=Type.choices, unique=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -35,6 +39,65 @@ class EntriesCountByGeoAreaAggregate(models.Model):
         unique_together = ('project', 'geo_area', 'date')
 
 
+class LeadsCountByProjectAggregate(models.Model):
+    """
+    Used as cache to calculate project - lead stats
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    date = models.DateField()
+    leads_count = models.IntegerField()
+
+    class Meta:
+        ordering = ('date',)
+        unique_together = ('project', 'date')
+
+
+class EntriesCountByProjectAggregate(models.Model):
+    """
+    Used as cache to calculate project/framework - entry stats
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    analysis_framework = models.ForeignKey(AnalysisFramework, on_delete=models.CASCADE)
+    date = models.DateField()
+    entries_count = models.IntegerField()
+
+    class Meta:
+        ordering = ('date',)
+        unique_together = ('project', 'analysis_framework', 'date')
+
+
+class LeadsCountByOrganizationAggregate(models.Model):
+    """
+    Used as cache to calculate project/organization (authors/publishers) - lead stats
+    """
+    class Type(models.IntegerChoices):
+        AUTHOR = 1, 'Author'
+        PUBLISHER = 2, 'Publisher'
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    type = models.SmallIntegerField(choices=Type.choices)
+    date = models.DateField()
+    leads_count = models.IntegerField()
+
+    class Meta:
+        ordering = ('date',)
+        unique_together = ('project', 'organization', 'type', 'date')
+
+
+class ActiveUsersByProjectAggregate(models.Model):
+    """
+    Used as cache to calculate project - active user (lead/entry created/modified by) stats
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+
+    class Meta:
+        ordering = ('date',)
+        unique_together = ('project', 'user', 'date')
+
+
 class PublicExploreSnapshot(models.Model):
     """
     Used to store snapshot used by public dashboard
@@ -55,6 +118,11 @@ class PublicExploreSnapshot(models.Model):
     file = models.FileField(upload_to='deep-explore/public-snapshot/', max_length=255)
     # Empty for global
     download_file = models.FileField(upload_to='deep-explore/public-excel-export/', max_length=255, blank=True)
+    # Content hash of the data used to generate the snapshot files (Used to skip unchanged snapshots)
+    data_hash = models.CharField(max_length=32, blank=True)
+    generated_at = models.DateTimeField(null=True, blank=True)
+    # Time taken to generate the snapshot files (seconds)
+    generation_time = models.FloatField(null=True, blank=True)
 
     class Meta:
         ordering = ('type', 'year',)
@@ -20,10 +20,16 @@ from organization.models import Organization
 from geo.models import Region
 from user.models import User
 from project.models import Project, ProjectMembership
-from lead.models import Lead
 from entry.models import Entry
 from analysis_framework.models import AnalysisFramework
-from deep_explore.models import EntriesCountByGeoAreaAggregate, PublicExploreSnapshot
+from deep_explore.models import (
+    EntriesCountByGeoAreaAggregate,
+    LeadsCountByProjectAggregate,
+    EntriesCountByProjectAggregate,
+    LeadsCountByOrganizationAggregate,
+    ActiveUsersByProjectAggregate,
+    PublicExploreSnapshot,
+)
 
 from .filter_set import ExploreProjectFilterDataInputType, ExploreProjectFilterSet
 from .enums import PublicExploreSnapshotTypeEnum, PublicExploreSnapshotGlobalTypeEnum
@@ -72,11 +78,26 @@ def count_by_date_queryset_generator(qs: models.QuerySet, trunc_func: Callable):
     ).order_by('date')
 
 
+def count_by_date_aggregate_list_generator(qs: models.QuerySet, trunc_func: Callable, count_field: str) -> List[dict]:
+    # Used by ExploreCountByDateListType (For daily aggregates)
+    return [
+        {
+            'date': data['trunc_date'],
+            'count': data['count'],
+        }
+        for data in qs.order_by().values(
+            trunc_date=trunc_func('date')
+        ).annotate(
+            count=models.Sum(count_field)
+        ).order_by('trunc_date')
+    ]
+
+
 def get_top_ten_organizations_list(
     organization_queryset: models.QuerySet,
-    leads_qs: models.QuerySet,
+    leads_count_by_organization_aggregate_qs: models.QuerySet,
     project_qs: models.QuerySet,
-    lead_field: models.QuerySet,
+    _type: LeadsCountByOrganizationAggregate.Type,
 ) -> List[dict]:
     return [
         {
@@ -84,20 +105,21 @@ def get_top_ten_organizations_list(
             'id': data.pop('org_id'),
             'title': data.pop('org_title'),
         }
-        for data in leads_qs.filter(
-            **{f'{lead_field}__in': organization_queryset},
+        for data in leads_count_by_organization_aggregate_qs.filter(
+            type=_type,
+            organization__in=organization_queryset,
             project__in=project_qs,
         ).annotate(
             org_id=models.functions.Coalesce(
-                models.F(f'{lead_field}__parent'),
-                models.F(f'{lead_field}__id')
+                models.F('organization__parent'),
+                models.F('organization__id')
             ),
             org_title=models.functions.Coalesce(
-                models.F(f'{lead_field}__parent__title'),
-                models.F(f'{lead_field}__title')
+                models.F('organization__parent__title'),
+                models.F('organization__title')
             ),
         ).order_by().values('org_id', 'org_title').annotate(
-            leads_count=models.Count('id', distinct=True),
+            leads_count=models.Sum('leads_count'),
             projects_count=models.Count('project', distinct=True),
         ).order_by('-leads_count', '-projects_count').values(
             'org_id',
@@ -111,7 +133,7 @@ def get_top_ten_organizations_list(
 def get_top_ten_frameworks_list(
     analysis_framework_qs: models.QuerySet,
     projects_qs: models.QuerySet,
-    entries_qs: models.QuerySet,
+    entries_count_aggregate_qs: models.QuerySet,
 ) -> List[dict]:
     # Calcuate projects/entries count
     projects_count_by_af = {
@@ -124,10 +146,10 @@ def get_top_ten_frameworks_list(
     }
     entries_count_by_af = {
         af: count
-        for af, count in entries_qs.filter(
+        for af, count in entries_count_aggregate_qs.filter(
             analysis_framework__in=analysis_framework_qs
         ).order_by().values('analysis_framework').annotate(
-            count=models.Count('id'),
+            count=models.Sum('entries_count'),
         ).values_list('analysis_framework', 'count')
     }
     # Sort AF id using projects/entries count
@@ -155,8 +177,8 @@ def get_top_ten_frameworks_list(
 
 def get_top_ten_projects_by_leads_and_entries_list(
     projects_qs: models.QuerySet,
-    leads_qs: models.QuerySet,
-    entries_qs: models.QuerySet,
+    leads_count_aggregate_qs: models.QuerySet,
+    entries_count_aggregate_qs: models.QuerySet,
     order_by_entry: bool = True,  # Order by entry if True else order by lead
 ) -> List[dict]:
     def _order_by_entry(x):
@@ -170,18 +192,18 @@ def get_top_ten_projects_by_leads_and_entries_list(
     # Calcuate projects/entries count
     leads_count_by_project = {
         af: count
-        for af, count in leads_qs.filter(
+        for af, count in leads_count_aggregate_qs.filter(
             project__in=projects_qs,
         ).order_by().values('project').annotate(
-            count=models.Count('id'),
+            count=models.Sum('leads_count'),
         ).values_list('project', 'count')
     }
     entries_count_by_project = {
         af: count
-        for af, count in entries_qs.filter(
+        for af, count in entries_count_aggregate_qs.filter(
             project__in=projects_qs,
         ).order_by().values('project').annotate(
-            count=models.Count('id'),
+            count=models.Sum('entries_count'),
         ).values_list('project', 'count')
     }
     # Sort Project id using projects/entries count
@@ -263,8 +285,11 @@ class ExploreDashboardStatRoot():
     cache_key: str
     analysis_framework_qs: models.QuerySet
     entries_count_by_geo_area_aggregate_qs: models.QuerySet
-    entries_qs: models.QuerySet
-    leads_qs: models.QuerySet
+    # Daily aggregates (See deep_explore.tasks.update_deep_explore_project_daily_aggregates)
+    leads_count_aggregate_qs: models.QuerySet
+    entries_count_aggregate_qs: models.QuerySet
+    leads_count_by_organization_aggregate_qs: models.QuerySet
+    active_users_aggregate_qs: models.QuerySet
     organization_qs: models.QuerySet
     registered_users: models.QuerySet
     projects_qs: models.QuerySet
@@ -314,12 +339,12 @@ class ExploreDashboardStatType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOTAL_LEADS_COUNT)
     def resolve_total_leads(root: ExploreDashboardStatRoot, *_) -> int:
-        return root.leads_qs.count()
+        return root.leads_count_aggregate_qs.aggregate(count=models.Sum('leads_count'))['count'] or 0
 
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOTAL_ENTRIES_COUNT)
     def resolve_total_entries(root: ExploreDashboardStatRoot, *_) -> int:
-        return root.entries_qs.count()
+        return root.entries_count_aggregate_qs.aggregate(count=models.Sum('entries_count'))['count'] or 0
 
     @staticmethod
     @CacheHelper.gql_cache(CacheKey.ExploreDeep.TOTAL_ENTRIES_ADDED_LAST_WEEK_COUNT, timeout=NODE_CACHE_TIMEOUT)
@@ -331,39 +356,51 @@ class ExploreDashboardStatType(graphene.ObjectType):
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOTAL_ACTIVE_USERS_COUNT)
     def resolve_total_active_users(root: ExploreDashboardStatRoot, *_) -> int:
-        created_by_qs = root.leads_qs.values('created_by').union(
-            root.entries_qs.values('created_by'),
-            # Modified By
-            root.leads_qs.values('modified_by'),
-            root.entries_qs.values('modified_by'),
-        )
-        return User.objects.filter(id__in=created_by_qs).values('id').distinct().count()
+        return root.active_users_aggregate_qs.values('user').distinct().count()
 
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOTAL_AUTHORS_COUNT)
     def resolve_total_authors(root: ExploreDashboardStatRoot, *_) -> int:
-        return root.leads_qs.values('authors').distinct().count()
+        return root.leads_count_by_organization_aggregate_qs.filter(
+            type=LeadsCountByOrganizationAggregate.Type.AUTHOR,
+        ).values('organization').distinct().count()
 
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOTAL_PUBLISHERS_COUNT)
     def resolve_total_publishers(root: ExploreDashboardStatRoot, *_) -> int:
-        return root.leads_qs.values('source').distinct().count()
+        return root.leads_count_by_organization_aggregate_qs.filter(
+            type=LeadsCountByOrganizationAggregate.Type.PUBLISHER,
+        ).values('organization').distinct().count()
 
     # --- Array data ----
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOP_TEN_AUTHORS_LIST)
     def resolve_top_ten_authors(root: ExploreDashboardStatRoot, *_):
-        return get_top_ten_organizations_list(root.organization_qs, root.leads_qs, root.projects_qs, 'authors')
+        return get_top_ten_organizations_list(
+            root.organization_qs,
+            root.leads_count_by_organization_aggregate_qs,
+            root.projects_qs,
+            LeadsCountByOrganizationAggregate.Type.AUTHOR,
+        )
 
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOP_TEN_PUBLISHERS_LIST)
     def resolve_top_ten_publishers(root: ExploreDashboardStatRoot, *_):
-        return get_top_ten_organizations_list(root.organization_qs, root.leads_qs, root.projects_qs, 'source')
+        return get_top_ten_organizations_list(
+            root.organization_qs,
+            root.leads_count_by_organization_aggregate_qs,
+            root.projects_qs,
+            LeadsCountByOrganizationAggregate.Type.PUBLISHER,
+        )
 
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOP_TEN_FRAMEWORKS_LIST)
     def resolve_top_ten_frameworks(root: ExploreDashboardStatRoot, *_):
-        return get_top_ten_frameworks_list(root.analysis_framework_qs, root.projects_qs, root.entries_qs)
+        return get_top_ten_frameworks_list(
+            root.analysis_framework_qs,
+            root.projects_qs,
+            root.entries_count_aggregate_qs,
+        )
 
     @staticmethod
     @node_cache(CacheKey.ExploreDeep.TOP_TEN_PROJECTS_BY_USERS_LIST)
@@ -391,8 +428,8 @@ class ExploreDashboardStatType(graphene.ObjectType):
     def resolve_top_ten_projects_by_entries(root: ExploreDashboardStatRoot, *_):
         return get_top_ten_projects_by_leads_and_entries_list(
             root.projects_qs,
-            root.leads_qs,
-            root.entries_qs,
+            root.leads_count_aggregate_qs,
+            root.entries_count_aggregate_qs,
             order_by_entry=True,
         )
 
@@ -401,27 +438,27 @@ class ExploreDashboardStatType(graphene.ObjectType):
     def resolve_top_ten_projects_by_leads(root: ExploreDashboardStatRoot, *_):
         return get_top_ten_projects_by_leads_and_entries_list(
             root.projects_qs,
-            root.leads_qs,
-            root.entries_qs,
+            root.leads_count_aggregate_qs,
+            root.entries_count_aggregate_qs,
             order_by_entry=False,
         )
 
     # --- Time-series data ----
     @staticmethod
     def resolve_leads_count_by_month(root: ExploreDashboardStatRoot, *_):
-        return count_by_date_queryset_generator(root.leads_qs, TruncMonth)
+        return count_by_date_aggregate_list_generator(root.leads_count_aggregate_qs, TruncMonth, 'leads_count')
 
     @staticmethod
     def resolve_leads_count_by_day(root: ExploreDashboardStatRoot, *_):
-        return count_by_date_queryset_generator(root.leads_qs, TruncDay)
+        return count_by_date_aggregate_list_generator(root.leads_count_aggregate_qs, TruncDay, 'leads_count')
 
     @staticmethod
     def resolve_entries_count_by_month(root: ExploreDashboardStatRoot, *_):
-        return count_by_date_queryset_generator(root.entries_qs, TruncDay)
+        return count_by_date_aggregate_list_generator(root.entries_count_aggregate_qs, TruncMonth, 'entries_count')
 
     @staticmethod
     def resolve_entries_count_by_day(root: ExploreDashboardStatRoot, *_):
-        return count_by_date_queryset_generator(root.entries_qs, TruncDay)
+        return count_by_date_aggregate_list_generator(root.entries_count_aggregate_qs, TruncDay, 'entries_count')
 
     @staticmethod
     def resolve_entries_count_by_region(root: ExploreDashboardStatRoot, *_):
@@ -474,8 +511,14 @@ class ExploreDashboardStatType(graphene.ObjectType):
         registered_users = User.objects.filter(**get_global_filters(_filter, date_field='date_joined'))
 
         # With ref_projects_qs as filter
-        entries_qs = Entry.objects.filter(**get_global_filters(_filter), project__in=ref_projects_qs)
-        leads_qs = Lead.objects.filter(**get_global_filters(_filter), project__in=ref_projects_qs)
+        aggregate_filters = dict(
+            **get_global_filters(_filter, date_field='date'),
+            project__in=ref_projects_qs,
+        )
+        leads_count_aggregate_qs = LeadsCountByProjectAggregate.objects.filter(**aggregate_filters)
+        entries_count_aggregate_qs = EntriesCountByProjectAggregate.objects.filter(**aggregate_filters)
+        leads_count_by_organization_aggregate_qs = LeadsCountByOrganizationAggregate.objects.filter(**aggregate_filters)
+        active_users_aggregate_qs = ActiveUsersByProjectAggregate.objects.filter(**aggregate_filters)
         entries_count_by_geo_area_aggregate_qs = EntriesCountByGeoAreaAggregate.objects\
             .filter(
                 **get_global_filters(_filter, date_field='date'),
@@ -491,9 +534,11 @@ class ExploreDashboardStatType(graphene.ObjectType):
             analysis_framework_qs=analysis_framework_qs,
             organization_qs=organization_qs,
             registered_users=registered_users,
-            entries_qs=entries_qs,
-            leads_qs=leads_qs,
             entries_count_by_geo_area_aggregate_qs=entries_count_by_geo_area_aggregate_qs,
+            leads_count_aggregate_qs=leads_count_aggregate_qs,
+            entries_count_aggregate_qs=entries_count_aggregate_qs,
+            leads_count_by_organization_aggregate_qs=leads_count_by_organization_aggregate_qs,
+            active_users_aggregate_qs=active_users_aggregate_qs,
         )
 
 
@@ -1,4 +1,5 @@
 import logging
+import hashlib
 import datetime
 import time
 import pytz
@@ -7,6 +8,7 @@ from celery import shared_task
 from dateutil.relativedelta import relativedelta
 
 from django.db import connection, models, transaction
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.test import override_settings
 from djangorestframework_camel_case.util import underscoreize
@@ -14,16 +16,23 @@ from djangorestframework_camel_case.util import underscoreize
 from commons.schema_snapshots import generate_query_snapshot, SnapshotQuery
 from utils.common import redis_lock
 from entry.models import Entry, Attribute
-from project.models import Project
+from lead.models import Lead
+from project.models import Project, ProjectMembership, ProjectOrganization
 from geo.models import GeoArea
 from analysis_framework.models import Widget
+from export.models import Export
 from export.tasks.tasks_projects import generate_projects_stats
 
 from .models import (
     AggregateTracker,
     EntriesCountByGeoAreaAggregate,
+    LeadsCountByProjectAggregate,
+    EntriesCountByProjectAggregate,
+    LeadsCountByOrganizationAggregate,
+    ActiveUsersByProjectAggregate,
     PublicExploreSnapshot,
 )
+from .schema import ExploreDashboardStatType, ExploreDeepFilterInputType, get_global_filters
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +162,287 @@ def update_deep_explore_entries_count_by_geo_aggreagate(start_over=False):
         tracker.save()
 
 
-def generate_public_deep_explore_snapshot():
+def get_upsert_aggregate_sql(model, qs, columns, unique_columns):
+    """
+    Generate INSERT SQL for model using qs (values with agg_<column> as alias for each column)
+    Existing rows (using unique_columns) are updated.
+    """
+    select_sql, params = qs.query.sql_with_params()
+    update_columns = [column for column in columns if column not in unique_columns]
+    if update_columns:
+        on_conflict_sql = 'DO UPDATE SET ' + ', '.join(
+            f'{column} = EXCLUDED.{column}'
+            for column in update_columns
+        )
+    else:
+        on_conflict_sql = 'DO NOTHING'
+    return f"""
+        INSERT INTO "{_tb(model)}" ({', '.join(columns)})
+        (
+            SELECT {', '.join(f'agg_{column}' for column in columns)}
+            FROM ({select_sql}) AS aggregate_data
+        )
+        ON CONFLICT ({', '.join(unique_columns)})
+        {on_conflict_sql};
+    """, params
+
+
+def get_update_project_daily_aggregates_sqls(from_date, until_date):
+    """
+    Daily (UTC) aggregates of leads/entries created within [from_date, until_date)
+    """
+    def _date_filter(qs):
+        return qs.filter(
+            created_at__gte=from_date,
+            created_at__lt=until_date,
+        ).order_by()
+
+    agg_date = TruncDate('created_at', tzinfo=pytz.UTC)
+    leads_qs = _date_filter(Lead.objects.all())
+    entries_qs = _date_filter(Entry.objects.all())
+
+    yield get_upsert_aggregate_sql(
+        LeadsCountByProjectAggregate,
+        leads_qs.values(
+            agg_project_id=models.F('project'),
+            agg_date=agg_date,
+        ).annotate(agg_leads_count=models.Count('id')),
+        ('project_id', 'date', 'leads_count'),
+        ('project_id', 'date'),
+    )
+    yield get_upsert_aggregate_sql(
+        EntriesCountByProjectAggregate,
+        entries_qs.values(
+            agg_project_id=models.F('project'),
+            agg_analysis_framework_id=models.F('analysis_framework'),
+            agg_date=agg_date,
+        ).annotate(agg_entries_count=models.Count('id')),
+        ('project_id', 'analysis_framework_id', 'date', 'entries_count'),
+        ('project_id', 'analysis_framework_id', 'date'),
+    )
+    for _type, organization_field in [
+        (LeadsCountByOrganizationAggregate.Type.AUTHOR, 'authors'),
+        (LeadsCountByOrganizationAggregate.Type.PUBLISHER, 'source'),
+    ]:
+        yield get_upsert_aggregate_sql(
+            LeadsCountByOrganizationAggregate,
+            leads_qs.filter(**{f'{organization_field}__isnull': False}).values(
+                agg_project_id=models.F('project'),
+                agg_organization_id=models.F(organization_field),
+                agg_type=models.Value(_type, output_field=models.SmallIntegerField()),
+                agg_date=agg_date,
+            ).annotate(agg_leads_count=models.Count('id', distinct=True)),
+            ('project_id', 'organization_id', 'type', 'date', 'leads_count'),
+            ('project_id', 'organization_id', 'type', 'date'),
+        )
+    active_users_qs_list = [
+        qs.filter(**{f'{user_field}__isnull': False}).values(
+            agg_project_id=models.F('project'),
+            agg_user_id=models.F(user_field),
+            agg_date=agg_date,
+        )
+        for qs in [leads_qs, entries_qs]
+        for user_field in ['created_by', 'modified_by']
+    ]
+    yield get_upsert_aggregate_sql(
+        ActiveUsersByProjectAggregate,
+        active_users_qs_list[0].union(*active_users_qs_list[1:]),
+        ('project_id', 'user_id', 'date'),
+        ('project_id', 'user_id', 'date'),
+    )
+
+
+def update_deep_explore_project_daily_aggregates(start_over=False):
+    tracker = AggregateTracker.latest(AggregateTracker.Type.PROJECT_DAILY_AGGREGATES)
+    if start_over:
+        # Clean all previous data
+        tracker.value = None
+        # Truncate tables and sequences
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'TRUNCATE TABLE {} RESTART IDENTITY;'.format(
+                        ', '.join(
+                            _tb(model)
+                            for model in [
+                                LeadsCountByProjectAggregate,
+                                EntriesCountByProjectAggregate,
+                                LeadsCountByOrganizationAggregate,
+                                ActiveUsersByProjectAggregate,
+                            ]
+                        )
+                    )
+                )
+            tracker.save()
+        logger.warning("Removed all previous data.")
+
+    if tracker.value:
+        # Use tracker data if available
+        from_date = DateHelper.py_date(tracker.value)
+    else:
+        # Look at lead/entry data
+        from_date = min(
+            [
+                date
+                for date in [
+                    Lead.objects.aggregate(date=models.Min('created_at__date'))['date'],
+                    Entry.objects.aggregate(date=models.Min('created_at__date'))['date'],
+                ]
+                if date is not None
+            ],
+            default=None,
+        )
+    until_date = timezone.now().date()  # NOTE: Stats will not include this date
+
+    params = dict(
+        from_date=DateHelper.str(from_date),
+        until_date=DateHelper.str(until_date),
+    )
+    if from_date is None or from_date >= until_date:
+        logger.info(f'Nothing to do here...{params}')
+        return
+
+    with transaction.atomic():
+        start_time = time.time()
+        with connection.cursor() as cursor:
+            for sql, sql_params in get_update_project_daily_aggregates_sqls(from_date, until_date):
+                cursor.execute(sql, sql_params)
+                logger.info(f'Rows affected: {cursor.rowcount}')
+        logger.info(f"Successfull. Runtime: {time.time() - start_time} seconds")
+        tracker.value = until_date
+        logger.info(f"Saving date {tracker.value} as last tracker")
+        tracker.save()
+
+
+def get_queryset_data_hash(qs: models.QuerySet) -> str:
+    """
+    Content hash (md5) of the rows of the queryset, calculated in the database
+    """
+    sql, params = qs.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+                SELECT md5(COALESCE(string_agg(data::text, ',' ORDER BY data::text), ''))
+                FROM ({sql}) AS data
+            """,
+            params,
+        )
+        return cursor.fetchone()[0]
+
+
+def get_public_deep_explore_snapshot_data_hash(
+    gql_query: str,
+    date_from: datetime.datetime,
+    date_to: datetime.datetime,
+) -> str:
+    """
+    Content hash of the data used by the public snapshot (dashboard aggregates + projects stats)
+    NOTE: gql_query is also included so that snapshots are regenerated when the query changes.
+    """
+    # Same input object (dict + attributes, with parsed values) as used by the graphql resolver
+    _filter = ExploreDeepFilterInputType._meta.container(dict(
+        date_from=date_from,
+        date_to=date_to,
+    ))
+    root = ExploreDashboardStatType.custom_resolver(None, _filter)
+    projects_qs = root.projects_qs
+    projects_filter = dict(
+        **get_global_filters(_filter),
+        project__in=projects_qs,
+    )
+    querysets = [
+        # Dashboard
+        root.leads_count_aggregate_qs.values_list('project', 'date', 'leads_count'),
+        root.entries_count_aggregate_qs.values_list('project', 'analysis_framework', 'date', 'entries_count'),
+        root.leads_count_by_organization_aggregate_qs.values_list(
+            'project', 'organization', 'type', 'date', 'leads_count',
+        ),
+        root.active_users_aggregate_qs.values_list('project', 'user', 'date'),
+        root.entries_count_by_geo_area_aggregate_qs.values_list('project', 'geo_area', 'date', 'entries_count'),
+        root.organization_qs.values_list('id', 'parent', 'modified_at'),
+        root.analysis_framework_qs.values_list('id', 'modified_at'),
+        root.registered_users.values_list('id'),
+        # Projects (+ projects stats download file)
+        projects_qs.values_list('id', 'modified_at', 'analysis_framework__title'),
+        ProjectMembership.objects.filter(project__in=projects_qs).values_list(
+            'project', 'member', 'role', 'member__first_name', 'member__last_name',
+        ),
+        ProjectOrganization.objects.filter(project__in=projects_qs).values_list(
+            'project', 'organization', 'organization_type',
+            'organization__modified_at', 'organization__parent', 'organization__parent__modified_at',
+        ),
+        Project.regions.through.objects.filter(project__in=projects_qs).values_list(
+            'project', 'region', 'region__modified_at',
+        ),
+        Export.objects.filter(project__in=projects_qs).values_list('project', 'id'),
+        Entry.objects.filter(project__in=projects_qs).values('project').annotate(
+            last_entry_created_at=models.Max('created_at'),
+        ).values_list('project', 'last_entry_created_at'),
+        Lead.objects.filter(**projects_filter).values('project').annotate(
+            count=models.Count('id'),
+        ).values_list('project', 'count'),
+        Entry.objects.filter(**projects_filter).values('project').annotate(
+            count=models.Count('id'),
+        ).values_list('project', 'count'),
+    ]
+    return hashlib.md5(
+        '\n'.join([
+            gql_query,
+            *[get_queryset_data_hash(qs) for qs in querysets],
+        ]).encode('utf-8')
+    ).hexdigest()
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    },
+)
+def save_public_deep_explore_snapshot(
+    snapshot: PublicExploreSnapshot,
+    query_name: str,
+    filters: dict,
+    snapshot_filename: str,
+    generate_download_file: bool = True,
+    data_hash: str = '',
+):
+    start_time = time.time()
+    file_content, errors = generate_query_snapshot(getattr(SnapshotQuery.DeepExplore, query_name), {'filter': filters})
+    if file_content is None:
+        logger.error(f'Failed to generate: {errors}', exc_info=True)
+        return
+    # Delete current file
+    snapshot.file.delete()
+    # Save new file
+    snapshot.file.save(f'{snapshot_filename}.json', file_content)
+    if generate_download_file:  # Skip for Global snapshots
+        # Generate
+        download_file = generate_projects_stats(
+            # CamelCase to snake_case
+            underscoreize(filters),
+            None,
+        )
+        # Delete current file
+        snapshot.download_file.delete()
+        # Save new file
+        snapshot.download_file.save(f'{snapshot_filename}.csv', download_file)
+    snapshot.data_hash = data_hash
+    snapshot.generated_at = timezone.now()
+    snapshot.generation_time = time.time() - start_time
+    snapshot.save()
+    logger.info(f'Generated {snapshot_filename}. Runtime: {snapshot.generation_time} seconds')
+    return True
+
+
+def generate_public_deep_explore_snapshot(parallel=False):
+    """
+    Generate public snapshots (global + yearly).
+    Yearly snapshots of closed years are skipped if the data used by them hasn't changed.
+    parallel: Generate each snapshot using a separate celery task
+    """
     def get_or_create(_type: PublicExploreSnapshot.Type, start_date: datetime.date, end_date: datetime.date, **kwargs):
         snapshot = PublicExploreSnapshot.objects.get_or_create(
             type=_type,
@@ -166,6 +455,7 @@ def generate_public_deep_explore_snapshot():
         # For already existing
         snapshot.start_date = start_date
         snapshot.end_date = end_date
+        snapshot.save(update_fields=('start_date', 'end_date',))
         return snapshot
 
     def _get_date_filter(min_date: datetime.date, max_date: datetime.date) -> dict:
@@ -174,90 +464,75 @@ def generate_public_deep_explore_snapshot():
             'dateTo': max_date.isoformat(),
         }
 
-    def _get_date_meta(min_year, max_year) -> Tuple[Tuple[datetime.date, datetime.date], dict]:
+    def _get_date_meta(min_year, max_year) -> Tuple[Tuple[datetime.datetime, datetime.datetime], dict]:
         min_date = datetime.datetime(year=min_year, month=1, day=1, tzinfo=pytz.UTC)
         max_date = datetime.datetime(year=max_year, month=1, day=1, tzinfo=pytz.UTC) - relativedelta(days=1)
-        return (
-            min_date.date(),
-            max_date.date(),
-        ), _get_date_filter(min_date, max_date)
-
-    @override_settings(
-        CACHES={
-            'default': {
-                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-                'LOCATION': 'unique-snowflake',
-            }
-        },
-    )
-    def _save_snapshot(
-        gql_query,
-        filters,
-        snapshot_filename,
-        snapshot,
-        generate_download_file=True,
-    ):
-        file_content, errors = generate_query_snapshot(gql_query, {'filter': filters})
-        if file_content is None:
-            logger.error(f'Failed to generate: {errors}', exc_info=True)
-            return
-        # Delete current file
-        snapshot.file.delete()
-        # Save new file
-        snapshot.file.save(f'{snapshot_filename}.json', file_content)
-        if generate_download_file:  # Skip for Global snapshots
-            # Generate
-            download_file = generate_projects_stats(
-                # CamelCase to snake_case
-                underscoreize(filters),
-                None,
-            )
-            # Delete current file
-            snapshot.download_file.delete()
-            # Save new file
-            snapshot.download_file.save(f'{snapshot_filename}.csv', download_file)
-        snapshot.save()
+        return (min_date, max_date), _get_date_filter(min_date, max_date)
 
+    snapshots_params = []
     # Global year range
     data_min_date = Project.objects.aggregate(min_created_at=models.Min('created_at'))['min_created_at']
+    if data_min_date is None:
+        logger.info('Nothing to do here...')
+        return
     data_max_date = timezone.now() - relativedelta(days=1)
     date_range, date_filter = (data_min_date, data_max_date), _get_date_filter(data_min_date, data_max_date)
     # Global - Time series
-    _save_snapshot(
-        SnapshotQuery.DeepExplore.GLOBAL_TIME_SERIES,
-        date_filter,
-        'Global-time-series-snapshot',
-        get_or_create(
+    snapshots_params.append(dict(
+        snapshot=get_or_create(
             PublicExploreSnapshot.Type.GLOBAL,
             *date_range,
             global_type=PublicExploreSnapshot.GlobalType.TIME_SERIES,
         ),
+        query_name='GLOBAL_TIME_SERIES',
+        filters=date_filter,
+        snapshot_filename='Global-time-series-snapshot',
         generate_download_file=False,
-    )
+    ))
     # Global - Full
-    _save_snapshot(
-        SnapshotQuery.DeepExplore.GLOBAL_FULL,
-        date_filter,
-        'Global-full-snapshot',
-        get_or_create(
+    snapshots_params.append(dict(
+        snapshot=get_or_create(
             PublicExploreSnapshot.Type.GLOBAL,
             *date_range,
             global_type=PublicExploreSnapshot.GlobalType.FULL,
         ),
-    )
+        query_name='GLOBAL_FULL',
+        filters=date_filter,
+        snapshot_filename='Global-full-snapshot',
+    ))
     # By year
+    current_year = timezone.now().year
     for year in range(data_min_date.year, data_max_date.year + 1):
-        date_range, date_filter = _get_date_meta(year, year + 1)
-        _save_snapshot(
-            SnapshotQuery.DeepExplore.YEARLY,
-            date_filter,
-            f'{year}-snapshot',
-            get_or_create(
-                PublicExploreSnapshot.Type.YEARLY_SNAPSHOT,
-                *date_range,
-                year=year,
-            ),
+        (min_date, max_date), date_filter = _get_date_meta(year, year + 1)
+        snapshot = get_or_create(
+            PublicExploreSnapshot.Type.YEARLY_SNAPSHOT,
+            min_date.date(),
+            max_date.date(),
+            year=year,
         )
+        data_hash = get_public_deep_explore_snapshot_data_hash(SnapshotQuery.DeepExplore.YEARLY, min_date, max_date)
+        if (
+            year < current_year and
+            snapshot.data_hash == data_hash and
+            snapshot.file and
+            snapshot.download_file
+        ):
+            logger.info(f'Skipping {year} snapshot: No changes since {snapshot.generated_at}')
+            continue
+        snapshots_params.append(dict(
+            snapshot=snapshot,
+            query_name='YEARLY',
+            filters=date_filter,
+            snapshot_filename=f'{year}-snapshot',
+            data_hash=data_hash,
+        ))
+
+    for params in snapshots_params:
+        if parallel:
+            snapshot = params.pop('snapshot')
+            generate_public_deep_explore_snapshot_task.delay(snapshot_id=snapshot.pk, **params)
+        else:
+            save_public_deep_explore_snapshot(**params)
 
 
 @shared_task
@@ -271,7 +546,29 @@ def update_deep_explore_entries_count_by_geo_aggreagate_task():
     return update_deep_explore_entries_count_by_geo_aggreagate(start_over=start_over)
 
 
+@shared_task
+@redis_lock('update_deep_explore_project_daily_aggregates')
+def update_deep_explore_project_daily_aggregates_task():
+    # Weekly clean-up old data and calculate from start (Same as entries count by geo aggregate)
+    start_over = False
+    if timezone.now().weekday() == 6:  # Every sunday
+        start_over = True
+    update_deep_explore_project_daily_aggregates(start_over=start_over)
+    # Public snapshots are generated using the aggregates, so update them after.
+    transaction.on_commit(update_public_deep_explore_snapshot.delay)
+
+
 @shared_task
 @redis_lock('update_public_deep_explore_snapshot')
 def update_public_deep_explore_snapshot():
-    return generate_public_deep_explore_snapshot()
+    return generate_public_deep_explore_snapshot(parallel=True)
+
+
+@shared_task
+@redis_lock('generate_public_deep_explore_snapshot_{snapshot_id}')
+def generate_public_deep_explore_snapshot_task(snapshot_id, **kwargs):
+    snapshot = PublicExploreSnapshot.objects.filter(pk=snapshot_id).first()
+    if snapshot is None:
+        logger.warning(f'Public snapshot not found: {snapshot_id}')
+        return
+    return save_public_deep_explore_snapshot(snapshot, **kwargs)
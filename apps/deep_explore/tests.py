@@ -1,4 +1,9 @@
-from utils.graphene.tests import GraphQLSnapShotTestCase
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from utils.graphene.tests import GraphQLSnapShotTestCase, GraphQLTestCase
 
 from organization.factories import OrganizationFactory
 from user.factories import UserFactory
@@ -6,6 +11,16 @@ from analysis_framework.factories import AnalysisFrameworkFactory
 from project.factories import ProjectFactory
 from lead.factories import LeadFactory
 from entry.factories import EntryFactory
+from deep_explore.models import (
+    AggregateTracker,
+    LeadsCountByProjectAggregate,
+    ActiveUsersByProjectAggregate,
+    PublicExploreSnapshot,
+)
+from deep_explore.tasks import (
+    update_deep_explore_project_daily_aggregates,
+    generate_public_deep_explore_snapshot,
+)
 
 
 class TestDeepExploreStats(GraphQLSnapShotTestCase):
@@ -153,6 +168,9 @@ class TestDeepExploreStats(GraphQLSnapShotTestCase):
         self.update_obj(EntryFactory.create(project=project_7, created_by=user2, lead=lead_5), created_at="2020-11-11")
         self.update_obj(EntryFactory.create(project=project_8, created_by=user, lead=lead_7), created_at="2020-09-11")
 
+        # Lead/Entry stats are served from the project daily aggregates
+        update_deep_explore_project_daily_aggregates()
+
         def _query_check(filter=None, **kwargs):
             return self.query_check(
                 query,
@@ -169,10 +187,157 @@ class TestDeepExploreStats(GraphQLSnapShotTestCase):
         self.force_login(user)
         content = _query_check(filter)['data']['deepExploreStats']
         self.assertIsNotNone(content, content)
-        self.assertEqual(content['totalActiveUsers'], 3)
-        self.assertEqual(content['totalAuthors'], 3)
+        self.assertEqual(content['totalActiveUsers'], 2)
+        self.assertEqual(content['totalAuthors'], 2)  # Leads without authors are not counted
         self.assertEqual(content['totalEntries'], 4)
-        self.assertEqual(content['totalLeads'], 4)
+        self.assertEqual(content['totalLeads'], 5)
         self.assertEqual(content['totalProjects'], 4)
         self.assertEqual(content['totalPublishers'], 2)
         self.assertEqual(content['totalRegisteredUsers'], 3)
+
+
+class TestDeepExploreProjectDailyAggregates(GraphQLTestCase):
+    QUERY = """
+        query MyQuery($filter: ExploreDeepFilterInputType!) {
+            deepExploreStats(filter: $filter) {
+                totalActiveUsers
+                totalAuthors
+                totalEntries
+                totalLeads
+                totalPublishers
+                entriesCountByMonth {
+                    date
+                    count
+                }
+                topTenProjectsByEntries {
+                    id
+                    entriesCount
+                    leadsCount
+                }
+            }
+        }
+    """
+
+    def test_project_daily_aggregates(self):
+        user1, user2, user3 = UserFactory.create_batch(3)
+        organization1, organization2 = OrganizationFactory.create_batch(2)
+        analysis_framework = AnalysisFrameworkFactory.create()
+        project1, project2 = [
+            self.update_obj(ProjectFactory.create(analysis_framework=analysis_framework), created_at='2020-10-01')
+            for _ in range(2)
+        ]
+
+        lead1 = self.update_obj(
+            LeadFactory.create(project=project1, source=organization1, created_by=user1),
+            created_at='2020-10-11',
+        )
+        lead1.authors.add(organization1, organization2)
+        lead2 = self.update_obj(
+            LeadFactory.create(project=project2, source=organization1, created_by=user2),
+            created_at='2020-11-11',
+        )
+        lead2.authors.add(organization2)
+        # Not in the date range
+        lead3 = self.update_obj(
+            LeadFactory.create(project=project2, source=organization2, created_by=user3),
+            created_at='2022-10-11',
+        )
+        for project, lead, created_by, created_at in [
+            (project1, lead1, user1, '2020-10-11'),
+            (project1, lead1, user2, '2020-10-12'),
+            (project1, lead1, user2, '2020-11-12'),
+            (project2, lead2, None, '2020-11-11'),
+            # Not in the date range
+            (project2, lead3, user3, '2022-10-11'),
+        ]:
+            self.update_obj(
+                EntryFactory.create(
+                    project=project,
+                    lead=lead,
+                    analysis_framework=analysis_framework,
+                    created_by=created_by,
+                ),
+                created_at=created_at,
+            )
+
+        update_deep_explore_project_daily_aggregates()
+        assert AggregateTracker.latest(AggregateTracker.Type.PROJECT_DAILY_AGGREGATES).value is not None
+        assert LeadsCountByProjectAggregate.objects.count() == 3
+        # Already processed dates are skipped
+        update_deep_explore_project_daily_aggregates()
+        assert LeadsCountByProjectAggregate.objects.count() == 3
+        assert set(ActiveUsersByProjectAggregate.objects.values_list('user', flat=True)) == {
+            user1.pk, user2.pk, user3.pk,
+        }
+
+        self.force_login(user1)
+        content = self.query_check(
+            self.QUERY,
+            variables={
+                'filter': {
+                    'dateFrom': '2020-10-01T00:00:00+00:00',
+                    'dateTo': '2021-11-11T00:00:00+00:00',
+                },
+            },
+        )['data']['deepExploreStats']
+        assert content['totalLeads'] == 2
+        assert content['totalEntries'] == 4
+        assert content['totalAuthors'] == 2
+        assert content['totalPublishers'] == 1
+        assert content['totalActiveUsers'] == 2
+        assert content['entriesCountByMonth'] == [
+            dict(date='2020-10-01', count=2),
+            dict(date='2020-11-01', count=2),
+        ]
+        assert content['topTenProjectsByEntries'] == [
+            dict(id=str(project1.pk), entriesCount=3, leadsCount=1),
+            dict(id=str(project2.pk), entriesCount=1, leadsCount=1),
+        ]
+
+
+class TestPublicDeepExploreSnapshot(GraphQLTestCase):
+    @mock.patch('deep_explore.tasks.generate_projects_stats')
+    @mock.patch('deep_explore.tasks.generate_query_snapshot')
+    def test_public_snapshot_generation(self, generate_query_snapshot_mock, generate_projects_stats_mock):
+        generate_query_snapshot_mock.side_effect = lambda *_: (ContentFile(b'{}'), None)
+        generate_projects_stats_mock.side_effect = lambda *_: ContentFile(b'')
+        user = UserFactory.create()
+        project = self.update_obj(ProjectFactory.create(), created_at='2020-10-11')
+        current_year = timezone.now().year
+
+        def _generated_at():
+            return dict(
+                PublicExploreSnapshot.objects.filter(
+                    type=PublicExploreSnapshot.Type.YEARLY_SNAPSHOT,
+                ).values_list('year', 'generated_at')
+            )
+
+        generate_public_deep_explore_snapshot()
+        # Global (2) + Yearly (2020...current_year)
+        assert generate_query_snapshot_mock.call_count == 2 + current_year - 2020 + 1
+        assert not PublicExploreSnapshot.objects.filter(generated_at__isnull=True).exists()
+        assert not PublicExploreSnapshot.objects.filter(generation_time__isnull=True).exists()
+        generated_at = _generated_at()
+
+        # Closed years without any changes are skipped
+        generate_query_snapshot_mock.reset_mock()
+        generate_public_deep_explore_snapshot()
+        assert generate_query_snapshot_mock.call_count == 2 + 1
+        new_generated_at = _generated_at()
+        assert new_generated_at[2020] == generated_at[2020]
+        assert new_generated_at[current_year] != generated_at[current_year]
+
+        # Closed year with changes are regenerated
+        project.add_member(user)
+        generate_query_snapshot_mock.reset_mock()
+        generate_public_deep_explore_snapshot()
+        assert generate_query_snapshot_mock.call_count == 2 + 1 + 1
+        assert _generated_at()[2020] != generated_at[2020]
+
+        # Closed year with changes in the data rendered by the download file (eg: owner's name) are regenerated
+        generated_at = _generated_at()
+        self.update_obj(user, first_name='New', last_name='Name')
+        generate_query_snapshot_mock.reset_mock()
+        generate_public_deep_explore_snapshot()
+        assert generate_query_snapshot_mock.call_count == 2 + 1 + 1
+        assert _generated_at()[2020] != generated_at[2020]
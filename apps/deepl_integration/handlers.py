@@ -1,9 +1,10 @@
 import os
 import json
-import copy
 import requests
 import logging
 from typing import Dict, List, Type
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
 from urllib.parse import urlparse
 
@@ -13,12 +14,14 @@ from django.utils.encoding import DjangoUnicodeDecodeError
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.db import transaction, models
+from django.db.models.functions import Lower
 from rest_framework import serializers
 
 from deep.token import DeepTokenGenerator
 from deep.deepl import DeeplServiceEndpoint
 from utils.common import UidBase64Helper, get_full_media_url
 from utils.request import RequestHelper
+from utils.files import copy_storage_file
 from deep.exceptions import DeepBaseException
 
 from assisted_tagging.models import (
@@ -28,6 +31,7 @@ from assisted_tagging.models import (
     AssistedTaggingModelPredictionTag,
     AssistedTaggingPrediction,
 )
+from unified_connector.fetcher import SourceFetch, fetch_sources
 from unified_connector.models import (
     ConnectorLead,
     ConnectorLeadPreviewAttachment,
@@ -50,7 +54,6 @@ from analysis.models import (
     AnalyticalStatementGeoEntry,
 )
 from geo.models import GeoArea
-from geo.filter_set import GeoAreaGqlFilterSet
 
 from .models import DeeplTrackBaseModel
 
@@ -72,6 +75,98 @@ def generate_file_url_for_new_deepl_server(file):
     )
 
 
+# Preview attachments downloaded/uploaded at once
+PREVIEW_ATTACHMENT_MAX_WORKERS = 8
+
+
+def ingest_preview_attachments(
+    attachment_model: Type[models.Model],
+    attachment_types,
+    attachment_base_path: str,
+    images_uri: List[dict],
+    table_uri: List[dict],
+    **attachment_attrs,
+) -> List[models.Model]:
+    """
+    Download extracted images/tables and upload them to the storage concurrently.
+    Returns unsaved attachments (to be bulk created by the caller)
+    - attachment_types: Enum with IMAGE and XLSX types of the attachment_model
+    """
+    def _get_file_name(url):
+        return os.path.join(
+            attachment_base_path,
+            os.path.basename(urlparse(url).path),
+        )
+
+    # [(attachment, [(file field name, url), ...]), ...]
+    attachments_files = [
+        (
+            attachment_model(
+                **attachment_attrs,
+                page_number=image_uri['page_number'],
+                type=attachment_types.IMAGE,
+            ),
+            [('file', image)],
+        )
+        for image_uri in images_uri
+        for image in image_uri['images']
+    ] + [
+        (
+            attachment_model(
+                **attachment_attrs,
+                page_number=table['page_number'],
+                type=attachment_types.XLSX,
+            ),
+            [('file_preview', table['image_link']), ('file', table['content_link'])],
+        )
+        for table in table_uri
+    ]
+
+    session = requests.Session()
+    # Keep a connection per worker
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=PREVIEW_ATTACHMENT_MAX_WORKERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    def _ingest(args):
+        attachment, field_name, url = args
+        try:
+            file = RequestHelper(url=url, ignore_error=True, session=session).get_file()
+            if not file:
+                return False
+            getattr(attachment, field_name).save(_get_file_name(url), file, save=False)
+            return True
+        except Exception:
+            logger.error(f'Failed to ingest preview attachment: {url}', exc_info=True)
+            return False
+
+    with session, ThreadPoolExecutor(max_workers=PREVIEW_ATTACHMENT_MAX_WORKERS) as executor:
+        ingested = iter(
+            executor.map(
+                _ingest,
+                [
+                    (attachment, field_name, url)
+                    for attachment, files in attachments_files
+                    for field_name, url in files
+                ],
+            )
+        )
+        # NOTE: Results are in the same order as the jobs
+        attachments_ingested = [
+            (attachment, all([next(ingested) for _ in files]))
+            for attachment, files in attachments_files
+        ]
+
+    new_attachments = []
+    for attachment, is_ingested in attachments_ingested:
+        if not is_ingested:
+            continue
+        if attachment.type == attachment_types.IMAGE:
+            attachment.file_preview = attachment.file
+        new_attachments.append(attachment)
+    return new_attachments
+
+
 def custom_error_handler(exception, url=None):
     if isinstance(exception, requests.exceptions.ConnectionError):
         raise serializers.ValidationError(f'ConnectionError on provided file: {url}')
@@ -353,8 +448,6 @@ class AssistedTaggingDraftEntryHandler(BaseHandler):
 
 
 class AutoAssistedTaggingDraftEntryHandler(BaseHandler):
-    # TODO: Fix N+1 issues here. Try to do bulk_update for each models.
-    # Or do this Async
     model = Lead
     callback_url_name = 'auto-assisted_tagging_draft_entry_prediction_callback'
 
@@ -471,11 +564,31 @@ class AutoAssistedTaggingDraftEntryHandler(BaseHandler):
             sync_tags_with_deepl_task.delay()
         return current_tags_map
 
+    @staticmethod
+    def _get_geo_areas_map(project, titles):
+        """
+        Returns {lowercase title: [geo_area_id, ...]} for the project geo areas matching the titles (case insensitive)
+        NOTE: Only one geo area is used per title (Same as GeoAreaGqlFilterSet titles filter with distinct('title'))
+        """
+        if not titles:
+            return {}
+        geo_areas_map = defaultdict(dict)
+        geo_areas_qs = GeoArea.get_for_project(project)\
+            .annotate(title_lower=Lower('title'))\
+            .filter(title_lower__in={title.lower() for title in titles})\
+            .order_by('title', 'id')
+        for geo_area_id, title, title_lower in geo_areas_qs.values_list('id', 'title', 'title_lower'):
+            geo_areas_map[title_lower].setdefault(title, geo_area_id)
+        return {
+            title_lower: list(title_geo_areas.values())
+            for title_lower, title_geo_areas in geo_areas_map.items()
+        }
+
     @classmethod
-    def _process_model_preds(cls, model_version, current_tags_map, draft_entry, model_prediction):
+    def _get_model_preds(cls, model_version, current_tags_map, draft_entry, model_prediction):
         prediction_status = model_prediction['prediction_status']
         if not prediction_status:  # If False  no tags are provided
-            return
+            return []
 
         tags = model_prediction.get('classification', {})  # NLP TagId
         values = model_prediction.get('values', [])  # Raw value
@@ -511,7 +624,7 @@ class AutoAssistedTaggingDraftEntryHandler(BaseHandler):
                     is_selected=True,
                 )
             )
-        AssistedTaggingPrediction.objects.bulk_create(new_predictions)
+        return new_predictions
 
     @classmethod
     @transaction.atomic
@@ -522,13 +635,17 @@ class AutoAssistedTaggingDraftEntryHandler(BaseHandler):
         draft_entry_qs = DraftEntry.objects.filter(lead=lead, type=DraftEntry.Type.AUTO)
         if draft_entry_qs.exists():
             raise serializers.ValidationError('Draft entries already exit')
-        for model_preds in data['blocks']:
-            if not model_preds['relevant']:
-                continue
-            classification = model_preds['classification']
+        relevant_blocks = [
+            model_preds
+            for model_preds in data['blocks']
+            if model_preds['relevant']
+        ]
+        if relevant_blocks:
+            # Resolve tags, model version and geo areas once for the whole document
             current_tags_map = cls._get_or_create_tags_map([
                 tag
-                for category_tag, tags in classification.items()
+                for model_preds in relevant_blocks
+                for category_tag, tags in model_preds['classification'].items()
                 for tag in [
                     category_tag,
                     *tags.keys(),
@@ -537,25 +654,47 @@ class AutoAssistedTaggingDraftEntryHandler(BaseHandler):
             models_version_map = cls._get_or_create_models_version([
                 data['classification_model_info']
             ])
-            draft = DraftEntry.objects.create(
-                page=model_preds['page'],
-                text_order=model_preds['textOrder'],
-                project=lead.project,
-                lead=lead,
-                excerpt=model_preds['text'],
-                prediction_status=DraftEntry.PredictionStatus.DONE,
-                type=DraftEntry.Type.AUTO
-            )
-            if model_preds['geolocations']:
-                geo_areas_qs = GeoAreaGqlFilterSet(
-                    data={'titles': [geo['entity'] for geo in model_preds['geolocations']]},
-                    queryset=GeoArea.get_for_project(lead.project)
-                ).qs.distinct('title')
-                draft.related_geoareas.set(geo_areas_qs)
             model_version = models_version_map[
                 (data['classification_model_info']['name'], data['classification_model_info']['version'])
             ]
-            cls._process_model_preds(model_version, current_tags_map, draft, model_preds)
+            # Let's only use 10 max per block (Same as GeoAreaGqlFilterSet titles filter)
+            blocks_geo_titles = [
+                set([geo['entity'] for geo in model_preds['geolocations']][:10])
+                for model_preds in relevant_blocks
+            ]
+            geo_areas_map = cls._get_geo_areas_map(
+                lead.project,
+                set().union(*blocks_geo_titles),
+            )
+
+            drafts = DraftEntry.objects.bulk_create([
+                DraftEntry(
+                    page=model_preds['page'],
+                    text_order=model_preds['textOrder'],
+                    project=lead.project,
+                    lead=lead,
+                    excerpt=model_preds['text'],
+                    prediction_status=DraftEntry.PredictionStatus.DONE,
+                    type=DraftEntry.Type.AUTO
+                )
+                for model_preds in relevant_blocks
+            ])
+
+            DraftEntryGeoArea = DraftEntry.related_geoareas.through
+            DraftEntryGeoArea.objects.bulk_create([
+                DraftEntryGeoArea(draftentry_id=draft.pk, geoarea_id=geo_area_id)
+                for draft, geo_titles in zip(drafts, blocks_geo_titles)
+                for geo_area_id in set(
+                    geo_area_id
+                    for title in geo_titles
+                    for geo_area_id in geo_areas_map.get(title.lower(), [])
+                )
+            ])
+            AssistedTaggingPrediction.objects.bulk_create([
+                prediction
+                for draft, model_preds in zip(drafts, relevant_blocks)
+                for prediction in cls._get_model_preds(model_version, current_tags_map, draft, model_preds)
+            ])
         lead.auto_entry_extraction_status = Lead.AutoExtractionStatus.SUCCESS
         lead.save(update_fields=('auto_entry_extraction_status',))
         return lead
@@ -652,59 +791,30 @@ class LeadExtractionHandler(BaseHandler):
             page_count=page_count,
             text_extraction_id=text_extraction_id,
         )
-        # Save extracted images as LeadPreviewAttachment instances
-        # TODO: The logic is same for unified_connector leads as well. Maybe have a single func?
-
-        attachment_base_path = f'{lead.pk}'
-        for image_uri in images_uri:
-            for image in image_uri['images']:
-                image_obj = RequestHelper(url=image, ignore_error=True).get_file()
-                if image_obj:
-                    lead_attachment = LeadPreviewAttachment(lead=lead)
-                    lead_attachment.file.save(
-                        os.path.join(
-                            attachment_base_path,
-                            os.path.basename(
-                                urlparse(image).path
-                            )
-                        ),
-                        image_obj,
-                    )
-                    lead_attachment.page_number = image_uri['page_number']
-                    lead_attachment.type = LeadPreviewAttachment.AttachmentFileType.IMAGE
-                    lead_attachment.file_preview = lead_attachment.file
-                    lead_attachment.save()
-
-        for table in table_uri:
-            table_img = RequestHelper(url=table['image_link'], ignore_error=True).get_file()
-            table_attachment = RequestHelper(url=table['content_link'], ignore_error=True).get_file()
-            if table_img:
-                lead_attachment = LeadPreviewAttachment(lead=lead)
-                lead_attachment.file_preview.save(
-                    os.path.join(
-                        attachment_base_path,
-                        os.path.basename(
-                            urlparse(table['image_link']).path
-                        )
-                    ),
-                    table_img,
-                )
-                lead_attachment.page_number = table['page_number']
-                lead_attachment.type = LeadPreviewAttachment.AttachmentFileType.XLSX
-                lead_attachment.file.save(
-                    os.path.join(
-                        attachment_base_path,
-                        os.path.basename(
-                            urlparse(table['content_link']).path
-                        )
-                    ),
-                    table_attachment,
-                )
-                lead_attachment.save()
-
+        # Extracted images/tables are saved as LeadPreviewAttachment instances in the background
+        if images_uri or table_uri:
+            from lead.tasks import ingest_lead_preview_attachments
+            transaction.on_commit(
+                lambda: ingest_lead_preview_attachments.delay(lead.pk, images_uri, table_uri)
+            )
         lead.update_extraction_status(Lead.ExtractionStatus.SUCCESS)
         return lead
 
+    @staticmethod
+    def save_preview_attachments(lead: Lead, images_uri: List[dict], table_uri: List[dict]):
+        new_attachments = ingest_preview_attachments(
+            LeadPreviewAttachment,
+            LeadPreviewAttachment.AttachmentFileType,
+            f'{lead.pk}',
+            images_uri,
+            table_uri,
+            lead=lead,
+        )
+        with transaction.atomic():
+            LeadPreviewAttachment.objects.filter(lead=lead).delete()
+            LeadPreviewAttachment.objects.bulk_create(new_attachments)
+        return len(new_attachments)
+
     @staticmethod
     @transaction.atomic
     def save_lead_data_using_connector_lead(
@@ -723,20 +833,35 @@ class LeadExtractionHandler(BaseHandler):
             page_count=connector_lead.page_count,
             text_extraction_id=connector_lead.text_extraction_id,
         )
-        # Save extracted images as LeadPreviewAttachment instances
-        # TODO: The logic is same for unified_connector leads as well. Maybe have a single func?
-        for connector_lead_attachment in connector_lead.preview_images.all():
-            lead_attachment = LeadPreviewAttachment(lead=lead)
-            lead_attachment.order = connector_lead_attachment.order
-            lead_attachment.file.save(
-                connector_lead_attachment.file.name,
+        # Copy connector lead attachments as LeadPreviewAttachment instances (within the storage)
+        file_field = LeadPreviewAttachment._meta.get_field('file')
+        file_preview_field = LeadPreviewAttachment._meta.get_field('file_preview')
+
+        def _copy_attachment(connector_lead_attachment):
+            lead_attachment = LeadPreviewAttachment(
+                lead=lead,
+                order=connector_lead_attachment.order,
+                page_number=connector_lead_attachment.page_number,
+                type=connector_lead_attachment.type,
+            )
+            lead_attachment.file = copy_storage_file(
                 connector_lead_attachment.file,
+                file_field.generate_filename(lead_attachment, connector_lead_attachment.file.name),
             )
-            lead_attachment.file_preview.save(
-                connector_lead_attachment.file_preview.name,
-                connector_lead_attachment.file_preview
+            if connector_lead_attachment.file_preview.name == connector_lead_attachment.file.name:
+                # Same file is used as preview for images
+                lead_attachment.file_preview = lead_attachment.file.name
+            else:
+                lead_attachment.file_preview = copy_storage_file(
+                    connector_lead_attachment.file_preview,
+                    file_preview_field.generate_filename(lead_attachment, connector_lead_attachment.file_preview.name),
+                )
+            return lead_attachment
+
+        with ThreadPoolExecutor(max_workers=PREVIEW_ATTACHMENT_MAX_WORKERS) as executor:
+            LeadPreviewAttachment.objects.bulk_create(
+                list(executor.map(_copy_attachment, connector_lead.preview_images.all()))
             )
-            lead_attachment.save()
         lead.update_extraction_status(Lead.ExtractionStatus.SUCCESS)
         return True
 
@@ -760,68 +885,42 @@ class UnifiedConnectorLeadHandler(BaseHandler):
         connector_lead.page_count = page_count
         connector_lead.text_extraction_id = text_extraction_id
 
-        attachment_base_path = f'{connector_lead.pk}'
-        for image_uri in images_uri:
-            for image in image_uri['images']:
-                image_obj = RequestHelper(url=image, ignore_error=True).get_file()
-                if image_obj:
-                    connector_lead_attachment = ConnectorLeadPreviewAttachment(connector_lead=connector_lead)
-                    connector_lead_attachment.file.save(
-                        os.path.join(
-                            attachment_base_path,
-                            os.path.basename(
-                                urlparse(image).path
-                            )
-                        ),
-                        image_obj,
-                    )
-                    connector_lead_attachment.page_number = image_uri['page_number']
-                    connector_lead_attachment.type = ConnectorLeadPreviewAttachment.ConnectorAttachmentFileType.IMAGE
-                    connector_lead_attachment.file_preview = connector_lead_attachment.file
-                    connector_lead_attachment.save()
-
-        for table in table_uri:
-            table_img = RequestHelper(url=table['image_link'], ignore_error=True).get_file()
-            table_attachment = RequestHelper(url=table['content_link'], ignore_error=True).get_file()
-            if table_img:
-                connector_lead_attachment = ConnectorLeadPreviewAttachment(connector_lead=connector_lead)
-                connector_lead_attachment.file_preview.save(
-                    os.path.join(
-                        attachment_base_path,
-                        os.path.basename(
-                            urlparse(table['image_link']).path
-                        )
-                    ),
-                    table_img,
-                )
-                connector_lead_attachment.page_number = table['page_number']
-                connector_lead_attachment.type = ConnectorLeadPreviewAttachment.ConnectorAttachmentFileType.XLSX
-                connector_lead_attachment.file.save(
-                    os.path.join(
-                        attachment_base_path,
-                        os.path.basename(
-                            urlparse(table['content_link']).path
-                        )
-                    ),
-                    table_attachment,
-                )
-                connector_lead_attachment.save()
+        # Extracted images/tables are saved as ConnectorLeadPreviewAttachment instances in the background
+        if images_uri or table_uri:
+            from unified_connector.tasks import ingest_connector_lead_preview_attachments
+            transaction.on_commit(
+                lambda: ingest_connector_lead_preview_attachments.delay(connector_lead.pk, images_uri, table_uri)
+            )
 
         connector_lead.update_extraction_status(ConnectorLead.ExtractionStatus.SUCCESS, commit=False)
         connector_lead.save()
         return connector_lead
 
+    @staticmethod
+    def save_preview_attachments(connector_lead: ConnectorLead, images_uri: List[Dict], table_uri: List[Dict]):
+        new_attachments = ingest_preview_attachments(
+            ConnectorLeadPreviewAttachment,
+            ConnectorLeadPreviewAttachment.ConnectorAttachmentFileType,
+            f'{connector_lead.pk}',
+            images_uri,
+            table_uri,
+            connector_lead=connector_lead,
+        )
+        with transaction.atomic():
+            ConnectorLeadPreviewAttachment.objects.filter(connector_lead=connector_lead).delete()
+            ConnectorLeadPreviewAttachment.objects.bulk_create(new_attachments)
+        return len(new_attachments)
+
     @classmethod
-    def _process_unified_source(cls, source):
-        params = copy.deepcopy(source.params)
-        source_fetcher = source.source_fetcher()
-        leads, _ = source_fetcher.get_leads(params, source.created_by)
+    def _process_unified_source(cls, source_fetch: SourceFetch):
+        source = source_fetch.source
+        if source_fetch.error is not None:
+            raise source_fetch.error
+        leads, _ = source_fetch.source_fetcher.get_leads_from_data(
+            source_fetch.leads_data, source_fetch.total_count, source.created_by,
+        )
 
-        current_source_leads_id = set(source.source_leads.values_list('connector_lead_id', flat=True))
-        for connector_lead in leads:
-            connector_lead, _ = ConnectorLead.get_or_create_from_lead(connector_lead)
-            if connector_lead.id not in current_source_leads_id:
-                source.add_lead(connector_lead)
+        source.add_leads(ConnectorLead.get_or_create_from_leads(leads))
 
     @classmethod
     def _send_trigger_request_to_extraction(cls, connector_leads: List[ConnectorLead]):
@@ -884,32 +983,50 @@ class UnifiedConnectorLeadHandler(BaseHandler):
         return processed
 
     @classmethod
-    def process_unified_connector_source(cls, source):
-        source.status = ConnectorSource.Status.PROCESSING
-        source.start_date = timezone.now()
-        source.save(update_fields=('status', 'start_date'))
-        update_fields = ['status', 'last_fetched_at', 'end_date']
+    def process_unified_connector_sources(cls, sources: List[ConnectorSource]):
+        """
+        Sources are fetched concurrently (See unified_connector.fetcher) and then processed one by one.
+        """
+        sources = list(sources)
+        if not sources:
+            return
+        ConnectorSource.objects.filter(pk__in=[source.pk for source in sources]).update(
+            status=ConnectorSource.Status.PROCESSING,
+            start_date=timezone.now(),
+        )
+        for source_fetch in fetch_sources(sources):
+            cls._process_unified_connector_source_fetch(source_fetch)
+
+    @classmethod
+    def _process_unified_connector_source_fetch(cls, source_fetch: SourceFetch):
+        source = source_fetch.source
+        update_fields = ['status', 'last_fetched_at', 'start_date', 'end_date']
         try:
-            # Fetch leads
-            cls._process_unified_source(source)
+            # Save fetched leads
+            cls._process_unified_source(source_fetch)
             source.status = ConnectorSource.Status.SUCCESS
             source.generate_stats(commit=False)
             update_fields.append('stats')
         except Exception:
             source.status = ConnectorSource.Status.FAILURE
             logger.error(f'Failed to process source: {source}', exc_info=True)
+        # NOTE: start_date, end_date are used to track source's fetch time
+        source.start_date = source_fetch.start_date or timezone.now()
         source.last_fetched_at = timezone.now()
         source.end_date = timezone.now()
         source.save(update_fields=update_fields)
 
+    @classmethod
+    def process_unified_connector_source(cls, source):
+        cls.process_unified_connector_sources([source])
+
     @classmethod
     def process_unified_connector(cls, unified_connector_id):
         unified_connector = UnifiedConnector.objects.get(pk=unified_connector_id)
         if not unified_connector.is_active:
             logger.warning(f'Skippping processing for inactive connector (pk:{unified_connector.pk}) {unified_connector}')
             return
-        for source in unified_connector.sources.all():
-            cls.process_unified_connector_source(source)
+        cls.process_unified_connector_sources(unified_connector.sources.all())
         # Send trigger to extractor
         cls.send_trigger_request_to_extractor(
             ConnectorLead.objects.filter(connectorsourcelead__source__unified_connector=unified_connector)
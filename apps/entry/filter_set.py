@@ -7,6 +7,7 @@ import django_filters
 from django.db import models
 from django.contrib.auth.models import User
 from django.contrib.postgres.aggregates.general import ArrayAgg
+from django.db.models.functions import Cast, Concat
 from graphene_django.filter.filterset import GrapheneFilterSetMixin
 from graphene_django.filter.utils import get_filtering_args_from_filterset
 
@@ -286,12 +287,6 @@ def get_filtered_entries_using_af_filter(
 ):
     queries = copy.deepcopy(queries)
 
-    region_max_level = 0
-    if project:
-        region_max_level = project.regions\
-            .annotate(adminlevel_count=models.Count('adminlevel'))\
-            .aggregate(max_level=models.Max('adminlevel_count'))['max_level'] or 0
-
     if isinstance(queries, list):
         queries = {
             q['filter_key']: q
@@ -305,6 +300,9 @@ def get_filtered_entries_using_af_filter(
         }
         new_query_structure = True
 
+    # Conditions using Entry.filter_index (LIST filters)
+    filter_index_conditions = []
+    filter_index_and_tokens = []
     # NOTE: lets not use `.distinct()` in this function as it is used by a subquery in `lead/models.py`.
     for _filter in filters:
         # For each filter, see if there is a query for that filter
@@ -422,33 +420,57 @@ def get_filtered_entries_using_af_filter(
                 value_list = value_list.split(',')
 
             if value_list:
+                # NOTE: Using Entry.filter_index (GIN indexed) instead of joining FilterData for each filter
                 # Fetch sub-regions if required
-                if region_max_level and include_sub_regions and _filter.widget_type == Widget.WidgetType.GEO:
+                if project and include_sub_regions and _filter.widget_type == Widget.WidgetType.GEO:
                     # XXX: simple values('id') doesn't work. Better way?
-                    value_list = GeoArea.\
-                        get_sub_childrens(value_list, level=region_max_level)\
+                    filter_index_tokens = GeoArea.\
+                        get_sub_childrens(value_list)\
                         .filter(admin_level__region__project=project)\
                         .order_by().values('admin_level__region__project')\
-                        .annotate(ids=ArrayAgg('id'))\
+                        .annotate(
+                            ids=ArrayAgg(
+                                Concat(
+                                    models.Value(Entry.get_filter_index_token(_filter.pk, '')),
+                                    Cast('id', models.TextField()),
+                                    output_field=models.TextField(),
+                                )
+                            )
+                        )\
                         .values('ids')
+                else:
+                    filter_index_tokens = [
+                        Entry.get_filter_index_token(_filter.pk, value)
+                        for value in value_list
+                    ]
+                    if use_and_operator and not use_exclude:
+                        # Merged for all filters
+                        filter_index_and_tokens.extend(filter_index_tokens)
+                        continue
 
                 query_filter = models.Q(
-                    filterdata__filter=_filter,
                     # This will use <OR> filter
-                    filterdata__values__overlap=value_list,
+                    filter_index__overlap=filter_index_tokens,
                 )
                 if use_and_operator:
                     query_filter = models.Q(
-                        filterdata__filter=_filter,
                         # This will use <AND> filter
-                        filterdata__values__contains=value_list,
+                        filter_index__contains=filter_index_tokens,
                     )
                 # Use filter to exclude entries
                 if use_exclude:
-                    entries = entries.exclude(query_filter)
+                    filter_index_conditions.append(~query_filter)
                 # Use filter to include entries
                 else:
-                    entries = entries.filter(query_filter)
+                    filter_index_conditions.append(query_filter)
+
+    if filter_index_and_tokens:
+        filter_index_conditions.append(models.Q(filter_index__contains=filter_index_and_tokens))
+    if filter_index_conditions:
+        # Single predicate for all the LIST filters
+        entries = entries.filter(
+            reduce(lambda acc, item: acc & item, filter_index_conditions)
+        )
 
     return entries.order_by('-lead__created_by', 'lead', 'created_by')
 
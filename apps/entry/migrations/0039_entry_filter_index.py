@@ -0,0 +1,33 @@
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entry', '0038_auto_20240709_0417'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='filter_index',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.RunSQL(
+            sql='''
+                UPDATE entry_entry entry
+                SET filter_index = COALESCE((
+                    SELECT array_agg(filter_data.filter_id || ':' || filter_value)
+                    FROM entry_filterdata filter_data, unnest(filter_data."values") filter_value
+                    WHERE filter_data.entry_id = entry.id
+                ), '{}')
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['filter_index'], name='entry_entry_filter__820cf9_gin'),
+        ),
+    ]
@@ -2,7 +2,8 @@ import os
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.aggregates.general import ArrayAgg
 from django.contrib.postgres.fields import ArrayField
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, connection
 
 from deep.middleware import get_current_user
 from unified_connector.models import ConnectorLeadPreviewAttachment
@@ -108,6 +109,8 @@ class Entry(UserResource, ProjectEntityMixin):
     # NOTE: verified_by is related to review comment
     verified_by = models.ManyToManyField(User, blank=True)
     draft_entry = models.ForeignKey(DraftEntry, on_delete=models.SET_NULL, null=True, blank=True)
+    # Denormalized FilterData.values of LIST filters: <filter_id>:<value> (See update_filter_index)
+    filter_index = ArrayField(models.TextField(), default=list, blank=True, editable=False)
 
     # NOTE: control is like final verified action
     def control(self, user, controlled=True):
@@ -156,7 +159,38 @@ class Entry(UserResource, ProjectEntityMixin):
 
     def save(self, *args, **kwargs):
         self.excerpt_modified = self.excerpt != self.dropped_excerpt
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if not adding and (update_fields is None or 'filter_index' in update_fields):
+            # NOTE: filter_index is generated from FilterData, re-generate in case a stale value was saved
+            Entry.update_filter_index([self.pk])
+
+    @staticmethod
+    def get_filter_index_token(filter_id, value):
+        return f'{filter_id}:{value}'
+
+    @classmethod
+    def update_filter_index(cls, entry_ids):
+        """
+        Re-generate filter_index of the entries using their FilterData
+        """
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'''
+                UPDATE {cls._meta.db_table} entry
+                SET filter_index = COALESCE((
+                    SELECT array_agg(filter_data.filter_id || ':' || filter_value)
+                    FROM {FilterData._meta.db_table} filter_data, unnest(filter_data."values") filter_value
+                    WHERE filter_data.entry_id = entry.id
+                ), '{{}}')
+                WHERE entry.id = ANY(%s)
+                ''',
+                [entry_ids],
+            )
 
     def get_image_url(self):
         if hasattr(self, 'image_url'):
@@ -232,6 +266,9 @@ class Entry(UserResource, ProjectEntityMixin):
     class Meta(UserResource.Meta):
         verbose_name_plural = 'entries'
         ordering = ['order', '-created_at']
+        indexes = [
+            GinIndex(fields=['filter_index']),
+        ]
 
 
 class Attribute(models.Model):
@@ -297,6 +334,10 @@ class FilterData(models.Model):
     to_number = models.IntegerField(default=None, blank=True, null=True)
     text = models.TextField(default=None, blank=True, null=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        Entry.update_filter_index([self.entry_id])
+
     @staticmethod
     def get_for(user):
         """
@@ -9,6 +9,7 @@ from utils.graphene.mutation import (
 from deep.permissions import ProjectPermissions as PP
 
 from .models import Entry
+from .utils import defer_entry_attributes_update
 from .schema import EntryType
 from .serializers import (
     EntryGqSerializer as EntrySerializer,
@@ -75,6 +76,12 @@ class BulkEntry(EntryMutationMixin, PsBulkGrapheneMutation):
     serializer_class = EntrySerializer
     permissions = [PP.Permission.CREATE_ENTRY]
 
+    @classmethod
+    def perform_mutate(cls, root, info, **kwargs):
+        # Attributes of all the entries are processed at once
+        with defer_entry_attributes_update():
+            return super().perform_mutate(root, info, **kwargs)
+
 
 class Mutation():
     entry_create = CreateEntry.Field()
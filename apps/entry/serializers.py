@@ -39,7 +39,7 @@ from .models import (
     LeadEntryGroup,
     EntryGroupLabel,
 )
-from .utils import base64_to_deep_image
+from .utils import base64_to_deep_image, defer_entry_attributes_update
 
 logger = logging.getLogger(__name__)
 
@@ -220,7 +220,7 @@ class EntrySerializer(RemoveNullFieldsMixin,
 
     class Meta:
         model = Entry
-        fields = '__all__'
+        exclude = ('filter_index',)
 
     def get_project_labels(self, entry):
         # Should be provided from view
@@ -699,6 +699,11 @@ class EntryGqSerializer(ProjectPropertySerializerMixin, TempClientIdMixin, UserR
 
         return data
 
+    def save(self, **kwargs):
+        # Attributes are processed at once after save
+        with defer_entry_attributes_update():
+            return super().save(**kwargs)
+
     def update(self, instance, validated_data):
         # once altered, unverify the entry if its controlled
         if instance and instance.controlled:
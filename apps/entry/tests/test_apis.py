@@ -21,6 +21,7 @@ from entry.models import (
 
 from gallery.models import File
 from tabular.models import Sheet, Field
+from tabular.columnar import ColumnData
 
 
 class EntryTests(TestCase):
@@ -56,7 +57,7 @@ class EntryTests(TestCase):
                 'sheet': sheet,
                 'title': 'Abrakadabra',
                 'type': Field.STRING,
-                'data': series,
+                'column_data': ColumnData.from_json(series).to_bytes(),
                 'cache': {
                     'status': Field.CACHE_SUCCESS,
                     'series': cache_series,
@@ -3,7 +3,13 @@ from django.utils import timezone
 from lead.models import LeadPreviewAttachment
 from utils.graphene.tests import GraphQLSnapShotTestCase
 
-from entry.models import Entry
+from analysis_framework.models import Filter
+from entry.models import Entry, FilterData, ExportData
+from entry.filter_set import get_filtered_entries_using_af_filter
+from entry.widgets import (
+    number_widget as number_widget_module,
+    multiselect_widget as multiselect_widget_module,
+)
 
 from user.factories import UserFactory
 from entry.factories import EntryFactory, EntryAttributeFactory
@@ -489,3 +495,96 @@ class TestEntryMutation(GraphQLSnapShotTestCase):
         self.assertMatchSnapshot(response, 'success')
 
     # TODO: Add test for other entry attributes id as well
+
+    def test_entry_bulk_attributes_filter_export_data(self):
+        """
+        This test makes sure filter/export data are generated for attributes saved in bulk
+        """
+        number_widget = WidgetFactory.create(analysis_framework=self.af, widget_id=number_widget_module.WIDGET_ID)
+        entry = EntryFactory.create(project=self.project, lead=self.lead, analysis_framework=self.af)
+        attribute = EntryAttributeFactory.create(entry=entry, widget=number_widget, data={'value': 10})
+        minput = dict(
+            items=[
+                dict(
+                    id=entry.pk,
+                    attributes=[
+                        dict(id=attribute.pk, widget=number_widget.pk, data={'value': 20}, widgetVersion=1),
+                    ],
+                    lead=self.lead.pk,
+                ),
+                *[
+                    dict(
+                        attributes=[
+                            dict(widget=number_widget.pk, data={'value': value}, widgetVersion=1),
+                        ],
+                        order=1,
+                        lead=self.lead.pk,
+                        excerpt='This is a text',
+                        entryType=self.genum(Entry.TagType.EXCERPT),
+                    )
+                    for value in [30, 40]
+                ],
+            ],
+        )
+        self.force_login(self.member_user)
+        self.query_check(self.BULK_ENTRY_QUERY, variables={'projectId': self.project.id, **minput})
+
+        entries_qs = Entry.objects.filter(project=self.project)
+        self.assertEqual(
+            set(
+                FilterData.objects.filter(entry__in=entries_qs, filter__widget_key=number_widget.key)
+                .values_list('entry__attribute__data__value', 'number')
+            ),
+            {(20, 20), (30, 30), (40, 40)},
+        )
+        self.assertEqual(
+            sorted(
+                ExportData.objects.filter(entry__in=entries_qs, exportable__widget_key=number_widget.key)
+                .values_list('data__excel__value', flat=True)
+            ),
+            ['20', '30', '40'],
+        )
+
+    def test_entry_filter_index(self):
+        multiselect_widget = WidgetFactory.create(
+            analysis_framework=self.af,
+            widget_id=multiselect_widget_module.WIDGET_ID,
+        )
+        filter = Filter.objects.get(analysis_framework=self.af, widget_key=multiselect_widget.key)
+        entry1, entry2, entry3 = EntryFactory.create_batch(
+            3, project=self.project, lead=self.lead, analysis_framework=self.af,
+        )
+        for entry, value in [
+            (entry1, ['a', 'b']),
+            (entry2, ['b', 'c']),
+            (entry3, []),
+        ]:
+            EntryAttributeFactory.create(entry=entry, widget=multiselect_widget, data={'value': value})
+
+        entry1.refresh_from_db()
+        self.assertEqual(sorted(entry1.filter_index), [f'{filter.pk}:a', f'{filter.pk}:b'])
+        # filter_index is not overwritten by stale instance
+        entry3.excerpt = 'Updated excerpt'
+        entry3.save()
+        EntryAttributeFactory.create(entry=entry3, widget=multiselect_widget, data={'value': ['c']})
+        entry3.save()
+        entry3.refresh_from_db()
+        self.assertEqual(entry3.filter_index, [f'{filter.pk}:c'])
+
+        def _filter_entries(**query):
+            return set(
+                get_filtered_entries_using_af_filter(
+                    Entry.objects.filter(project=self.project),
+                    Filter.qs_with_widget_type().filter(analysis_framework=self.af),
+                    [dict(filter_key=filter.key, **query)],
+                    new_query_structure=True,
+                ).values_list('id', flat=True)
+            )
+
+        self.assertEqual(_filter_entries(value_list=['a', 'c']), {entry1.pk, entry2.pk, entry3.pk})
+        self.assertEqual(_filter_entries(value_list=['b', 'c'], use_and_operator=True), {entry2.pk})
+        self.assertEqual(_filter_entries(value_list=['a'], use_exclude=True), {entry2.pk, entry3.pk})
+        self.assertEqual(
+            _filter_entries(value_list=['b', 'c'], use_exclude=True, use_and_operator=True),
+            {entry1.pk, entry3.pk},
+        )
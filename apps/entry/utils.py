@@ -1,50 +1,161 @@
-from entry.models import Attribute
+import logging
+import threading
+from contextlib import contextmanager
+
+from analysis_framework.models import Filter, Exportable
+from entry.models import Entry, Attribute, FilterData, ExportData
 from gallery.models import File
 from utils.image import decode_base64_if_possible
 
-from .widgets.utils import set_filter_data, set_export_data
 from .widgets.store import widget_store
 
+logger = logging.getLogger(__name__)
 
-def update_entry_attribute(attribute):
-    entry = attribute.entry
-    widget = attribute.widget
-    data = attribute.data or {}
-    if not entry or not widget:
+
+# Attributes saved within defer_entry_attributes_update (per thread)
+_deferred_attributes = threading.local()
+
+ATTRIBUTES_UPDATE_CHUNK_SIZE = 500
+FILTER_DATA_FIELDS = ('number', 'values', 'from_number', 'to_number', 'text')
+
+
+def _bulk_upsert_entry_data(model, related_field, data_by_key, fields):
+    """
+    data_by_key: {(entry_id, <related_field>_id): {field: value}}
+    Update existing rows and create missing ones (Same as update_or_create for each key)
+    """
+    if not data_by_key:
         return
+    related_field_id = f'{related_field}_id'
+    existing_rows = model.objects.filter(**{
+        'entry__in': set(entry_id for entry_id, _ in data_by_key.keys()),
+        f'{related_field}__in': set(related_id for _, related_id in data_by_key.keys()),
+    })
+    to_update = []
+    keys_with_rows = set()
+    for row in existing_rows:
+        key = (row.entry_id, getattr(row, related_field_id))
+        data = data_by_key.get(key)
+        if data is None:
+            continue
+        for field, value in data.items():
+            setattr(row, field, value)
+        keys_with_rows.add(key)
+        to_update.append(row)
+    model.objects.bulk_update(to_update, fields, batch_size=ATTRIBUTES_UPDATE_CHUNK_SIZE)
+    model.objects.bulk_create([
+        model(**{
+            'entry_id': entry_id,
+            related_field_id: related_id,
+            **data,
+        })
+        for (entry_id, related_id), data in data_by_key.items()
+        if (entry_id, related_id) not in keys_with_rows
+    ], batch_size=ATTRIBUTES_UPDATE_CHUNK_SIZE)
 
-    widget_module = widget_store.get(widget.widget_id)
-    if widget_module:
+
+def update_entry_attributes(attributes):
+    """
+    Generate FilterData and ExportData for the attributes in batch.
+    Attribute's entry and widget should be preloaded (Eg: select_related)
+    """
+    attributes = [
+        attribute for attribute in attributes
+        if attribute.entry_id and attribute.widget_id
+    ]
+    if not attributes:
+        return
+
+    af_ids = set(attribute.widget.analysis_framework_id for attribute in attributes)
+    filters_map = {}
+    # NOTE: Using default ordering to select first filter as before
+    for filter in Filter.objects.filter(analysis_framework__in=af_ids):
+        filters_map.setdefault((filter.analysis_framework_id, filter.widget_key, filter.key), filter)
+    exportables_map = {
+        (exportable.analysis_framework_id, exportable.widget_key): exportable
+        for exportable in Exportable.objects.filter(analysis_framework__in=af_ids)
+    }
+
+    filter_data_by_key = {}
+    export_data_by_key = {}
+    for attribute in attributes:
+        entry_id = attribute.entry_id
+        widget = attribute.widget
+        widget_module = widget_store.get(widget.widget_id)
+        if not widget_module:
+            continue
         update_info = widget_module.update_attribute(
             widget,
-            data,
+            attribute.data or {},
             widget.properties or {},
         )
 
-        filter_data_list = update_info.get('filter_data')
+        for filter_data in update_info.get('filter_data') or []:
+            filter_data = {**filter_data}
+            key = filter_data.pop('key', None) or widget.key
+            filter = filters_map.get((widget.analysis_framework_id, widget.key, key))
+            if filter is None:
+                logger.warning(f'Filter not found for widget: {widget.pk} key: {key}')
+                continue
+            filter_data_by_key[(entry_id, filter.pk)] = {
+                field: filter_data.get(field)
+                for field in FILTER_DATA_FIELDS
+            }
+
         export_data = update_info.get('export_data')
+        if export_data:
+            exportable = exportables_map.get((widget.analysis_framework_id, widget.key))
+            if exportable is None:
+                logger.warning(f'Exportable not found for widget: {widget.pk}')
+                continue
+            export_data_by_key[(entry_id, exportable.pk)] = {
+                'data': export_data['data'],
+            }
 
-        if filter_data_list:
-            for filter_data in filter_data_list:
-                set_filter_data(
-                    entry,
-                    widget,
-                    **filter_data,
-                )
+    _bulk_upsert_entry_data(FilterData, 'filter', filter_data_by_key, FILTER_DATA_FIELDS)
+    _bulk_upsert_entry_data(ExportData, 'exportable', export_data_by_key, ('data',))
+    # NOTE: bulk_create/bulk_update doesn't use FilterData.save
+    Entry.update_filter_index(set(entry_id for entry_id, _ in filter_data_by_key.keys()))
 
-        if export_data:
-            set_export_data(
-                entry,
-                widget,
-                **export_data,
-            )
+
+@contextmanager
+def defer_entry_attributes_update():
+    """
+    Attributes saved within this block are processed at the end in batch (See update_entry_attributes)
+    """
+    if getattr(_deferred_attributes, 'attributes', None) is not None:
+        # Already deferred by outer block
+        yield
+        return
+    _deferred_attributes.attributes = {}
+    try:
+        yield
+        attributes = _deferred_attributes.attributes.values()
+    finally:
+        _deferred_attributes.attributes = None
+    update_entry_attributes(attributes)
+
+
+def update_entry_attribute(attribute):
+    deferred_attributes = getattr(_deferred_attributes, 'attributes', None)
+    if deferred_attributes is not None:
+        # Latest save of the attribute is used
+        deferred_attributes.pop(attribute.pk, None)
+        deferred_attributes[attribute.pk] = attribute
+        return
+    update_entry_attributes([attribute])
 
 
 def update_attributes(**attr_filters):
-    attributes = Attribute.objects.filter(**attr_filters)
+    attributes = Attribute.objects.filter(**attr_filters).select_related('widget').order_by('pk')
 
-    for attribute in attributes:
-        update_entry_attribute(attribute)
+    chunk = []
+    for attribute in attributes.iterator(chunk_size=ATTRIBUTES_UPDATE_CHUNK_SIZE):
+        chunk.append(attribute)
+        if len(chunk) >= ATTRIBUTES_UPDATE_CHUNK_SIZE:
+            update_entry_attributes(chunk)
+            chunk = []
+    update_entry_attributes(chunk)
 
 
 def base64_to_deep_image(image, lead, user):
@@ -1,5 +1,5 @@
 import logging
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models
 
 from deep.permalinks import Permalink
@@ -26,6 +26,9 @@ def get_hyperlink(url, text):
 
 
 class ExcelExporter:
+    # Number of entries fetched at once with streaming
+    STREAMING_CHUNK_SIZE = 500
+
     class ColumnsData:
         TITLES = {
             **{
@@ -47,11 +50,15 @@ class ExcelExporter:
         columns=None,
         decoupled=True,
         is_preview=False,
+        streaming=False,
     ):
         self.project = project
         self.export_object = export_object
         self.is_preview = is_preview
-        self.wb = WorkBook()
+        # NOTE: With streaming, rows are written to a write-only workbook (backed by temp files)
+        # and entries are fetched in chunks using server-side cursor, so memory usage stays flat.
+        self.streaming = streaming
+        self.wb = WorkBook(write_only=streaming)
         # XXX: Limit memory usage? (Or use redis?)
         self.geoarea_data_cache = {}
 
@@ -126,6 +133,11 @@ class ExcelExporter:
 
         # Keep track of tabular fields
         self.tabular_fields = {}
+        # Tabular sheets and their columns values (Used for streaming, as write-only sheets are append only)
+        self.tabular_worksheets = {}
+        self.tabular_sheets_columns = {}
+        # (entry_id, exportable_id) -> ExportData of current entries chunk (Used for streaming)
+        self.export_data_map = None
 
         self.region_data = {}
         # mapping of original name vs truncated name
@@ -221,13 +233,20 @@ class ExcelExporter:
                     self.load_exportable_titles(data, regions)
                 )
 
+        # NOTE: Column widths are defined before any rows are added (Required for write-only sheets)
+        if self.decoupled and self.split:
+            self.split.auto_fit_columns(column_titles)
+        self.group.auto_fit_columns(column_titles)
+
         if self.decoupled and self.split:
             self.split.append([column_titles])
         self.group.append([column_titles])
 
-        if self.decoupled and self.split:
-            self.split.auto_fit_cells_in_row(1)
-        self.group.auto_fit_cells_in_row(1)
+        if self.streaming:
+            # Write-only sheets apply column types when rows are appended
+            self.group.set_col_types(self.col_types)
+            if self.split:
+                self.split.set_col_types(self.col_types)
 
         self.regions = regions
         return self
@@ -437,8 +456,9 @@ class ExcelExporter:
 
         if worksheet_title not in self.wb.wb.sheetnames:
             tabular_sheet = self.wb.create_sheet(worksheet_title).ws
+            self.tabular_worksheets[worksheet_title] = tabular_sheet
         else:
-            tabular_sheet = self.wb.wb.get_sheet_by_name(worksheet_title)
+            tabular_sheet = self.tabular_worksheets[worksheet_title]
 
         # Get fields data
         worksheet_data = self.tabular_sheets.get(worksheet_title, {})
@@ -457,15 +477,22 @@ class ExcelExporter:
 
             self.tabular_sheets[worksheet_title] = worksheet_data
 
-            # Insert field title to sheet in first row
-            tabular_sheet['{}1'.format(sheet_col_name)].value =\
-                field.title
-
-            # Add field values to corresponding column
-            for i, x in enumerate(field.actual_data):
-                tabular_sheet[
-                    '{}{}'.format(sheet_col_name, 2 + i)
-                ].value = x.get('processed_value') or x['value']
+            if self.streaming:
+                # Write-only sheets can't be written by cell, columns are added at the end
+                self.tabular_sheets_columns.setdefault(worksheet_title, {})[col_number] = [
+                    field.title,
+                    *field.column.get_display_values(start=field.sheet.data_row_index),
+                ]
+            else:
+                # Insert field title to sheet in first row
+                tabular_sheet['{}1'.format(sheet_col_name)].value =\
+                    field.title
+
+                # Add field values to corresponding column
+                for i, value in enumerate(field.column.get_display_values(start=field.sheet.data_row_index)):
+                    tabular_sheet[
+                        '{}{}'.format(sheet_col_name, 2 + i)
+                    ].value = value
         else:
             sheet_col_name = excel_column_name(col_number)
 
@@ -491,8 +518,58 @@ class ExcelExporter:
 
         return ''
 
+    def iterate_entries_in_chunks(self, entries):
+        """
+        Iterate entries using server-side cursor for ids and fetch each chunk with it's prefetches
+        NOTE: Django (3.2) ignores prefetch_related with .iterator()
+        """
+        exportables_id = [
+            exportable.pk
+            for exportable in self.exportables
+            if not isinstance(exportable, str)
+        ]
+
+        def _get_chunk_entries(entries_id):
+            entries_map = {
+                entry.pk: entry
+                for entry in entries.filter(id__in=entries_id)
+            }
+            self.export_data_map = {}
+            for export_data in ExportData.objects.filter(
+                entry__in=entries_id,
+                exportable__in=exportables_id,
+                data__excel__isnull=False,
+            ).order_by('id'):
+                # Same as .first() for each entry/exportable
+                self.export_data_map.setdefault((export_data.entry_id, export_data.exportable_id), export_data)
+            return [entries_map[_id] for _id in entries_id if _id in entries_map]
+
+        entries_id = []
+        for entry_id in entries.values_list('id', flat=True).iterator(chunk_size=self.STREAMING_CHUNK_SIZE):
+            entries_id.append(entry_id)
+            if len(entries_id) >= self.STREAMING_CHUNK_SIZE:
+                yield from _get_chunk_entries(entries_id)
+                entries_id = []
+        if entries_id:
+            yield from _get_chunk_entries(entries_id)
+        self.export_data_map = None
+
+    def get_export_data(self, entry, exportable):
+        if self.export_data_map is not None:
+            return self.export_data_map.get((entry.pk, exportable.pk))
+        return ExportData.objects.filter(
+            exportable=exportable,
+            entry=entry,
+            data__excel__isnull=False,
+        ).first()
+
     def add_entries(self, entries):
-        iterable_entries = entries[:Export.PREVIEW_ENTRY_SIZE] if self.is_preview else entries
+        if self.is_preview:
+            iterable_entries = entries[:Export.PREVIEW_ENTRY_SIZE]
+        elif self.streaming:
+            iterable_entries = self.iterate_entries_in_chunks(entries)
+        else:
+            iterable_entries = entries
         for i, entry in enumerate(iterable_entries):
             # Export each entry
             # Start building rows and export data for each exportable
@@ -528,11 +605,7 @@ class ExcelExporter:
                     # And write some value based on type and data
                     # or empty strings if no data.
                     data = exportable.data.get('excel')
-                    export_data = ExportData.objects.filter(
-                        exportable=exportable,
-                        entry=entry,
-                        data__excel__isnull=False,
-                    ).first()
+                    export_data = self.get_export_data(entry, exportable)
 
                     if export_data and type(export_data.data.get('excel', {})) == list:
                         export_data = export_data.data.get('excel', [])
@@ -585,16 +658,33 @@ class ExcelExporter:
                 ]]
             )
 
+    def add_tabular_sheets_columns(self):
+        for worksheet_title, columns in self.tabular_sheets_columns.items():
+            tabular_sheet = self.tabular_worksheets[worksheet_title]
+            max_col_number = max(columns.keys())
+            max_row_number = max(len(values) for values in columns.values())
+            for row_index in range(max_row_number):
+                tabular_sheet.append([
+                    columns[col_number][row_index]
+                    if col_number in columns and row_index < len(columns[col_number]) else None
+                    for col_number in range(1, max_col_number + 1)
+                ])
+
     def export(self, leads_qs):
         """
         Export and return export data
         """
-        self.group.set_col_types(self.col_types)
-        if self.split:
-            self.split.set_col_types(self.col_types)
+        if not self.streaming:
+            self.group.set_col_types(self.col_types)
+            if self.split:
+                self.split.set_col_types(self.col_types)
+        else:
+            self.add_tabular_sheets_columns()
 
         # Add bibliography
         self.add_bibliography_sheet(leads_qs)
 
+        if self.streaming:
+            return File(self.wb.save())
         buffer = self.wb.save()
         return ContentFile(buffer)
@@ -1,78 +1,153 @@
-from utils.files import generate_json_file_for_upload
+import json
+from collections import defaultdict
+from tempfile import TemporaryFile
+
+from django.core.files.base import File
+from django.core.serializers.json import DjangoJSONEncoder
+
 from analysis_framework.models import Widget
+from entry.models import Attribute
 from export.models import Export
 
 
 class JsonExporter:
-    def __init__(self, is_preview=False):
+    """
+    Entries are fetched in chunks (keyset pagination) and written to a temporary file as they are processed,
+    so memory usage stays flat regardless of the number of entries.
+    - JSON: {"entries": [...], "widgets": [...]} (Same output as json.dumps with sort_keys=True, indent=2)
+    - Newline delimited JSON: One entry per line (widgets are not included)
+    """
+    # Number of entries fetched at once
+    CHUNK_SIZE = 500
+
+    def __init__(self, is_preview=False, newline_delimited=False):
         self.is_preview = is_preview
-        self.data = {}
+        self.newline_delimited = newline_delimited
+        self.widgets = []
+        self.file = TemporaryFile()
+
+    def _write(self, text):
+        self.file.write(text.encode('utf-8'))
+
+    @staticmethod
+    def _dumps(data, depth=0):
+        """
+        Dump data as if it was nested at given depth of the indented JSON document
+        """
+        return json.dumps(
+            data,
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+            indent=2,
+        ).replace('\n', '\n' + '  ' * depth)
 
     def load_exportables(self, exportables, analysis_framework):
-        # get all widget key name in list
-        widgets_key = Widget.objects.filter(analysis_framework=analysis_framework).values_list(
-            'key',
-            flat=True
-        )
+        widgets_map = {
+            widget.key: widget
+            for widget in Widget.objects.filter(analysis_framework=analysis_framework)
+        }
         # exclude widgets_key which are not in exportables table
-        self.exportables = exportables.filter(widget_key__in=widgets_key)
-        self.widget_ids = []
+        self.exportables = exportables.filter(widget_key__in=widgets_map.keys())
 
-        self.data['widgets'] = []
+        self.widgets = []
         for exportable in self.exportables:
-            widget = Widget.objects.get(
-                analysis_framework=exportable.analysis_framework,
-                key=exportable.widget_key,
-            )
-            self.widget_ids.append(widget.id)
-
+            widget = widgets_map[exportable.widget_key]
             data = {}
             data['id'] = widget.key
             data['widget_type'] = widget.widget_id
             data['title'] = widget.title
             data['properties'] = widget.properties
-            self.data['widgets'].append(data)
+            self.widgets.append(data)
 
         return self
 
+    @staticmethod
+    def _get_chunk_entries(chunk_entries):
+        entries_attributes = defaultdict(list)
+        for attribute in Attribute.objects.filter(
+            entry__in=[entry.pk for entry in chunk_entries],
+        ).values('entry_id', 'widget__key', 'data').order_by('id'):
+            entries_attributes[attribute['entry_id']].append({
+                'widget_id': attribute['widget__key'],
+                'data': attribute['data'],
+            })
+        return [
+            (entry, entries_attributes[entry.pk])
+            for entry in chunk_entries
+        ]
+
+    def iterate_entries_in_chunks(self, entries):
+        """
+        Iterate entries using server-side cursor for ids (keeping the queryset order)
+        and fetch each chunk with attributes (and widget key)
+        NOTE: Django (3.2) ignores prefetch_related with .iterator()
+        """
+        entries = entries\
+            .select_related('tabular_field')\
+            .prefetch_related('lead__source', 'lead__source__parent')
+        if self.is_preview:
+            yield from self._get_chunk_entries(list(entries[:Export.PREVIEW_ENTRY_SIZE]))
+            return
+
+        def _get_chunk_entries(entries_id):
+            entries_map = {
+                entry.pk: entry
+                for entry in entries.filter(id__in=entries_id)
+            }
+            return self._get_chunk_entries([entries_map[_id] for _id in entries_id if _id in entries_map])
+
+        entries_id = []
+        for entry_id in entries.values_list('id', flat=True).iterator(chunk_size=self.CHUNK_SIZE):
+            entries_id.append(entry_id)
+            if len(entries_id) >= self.CHUNK_SIZE:
+                yield from _get_chunk_entries(entries_id)
+                entries_id = []
+        if entries_id:
+            yield from _get_chunk_entries(entries_id)
+
+    def get_entry_data(self, entry, attributes):
+        lead = entry.lead
+        data = {}
+        data['id'] = entry.id
+        data['lead_id'] = lead.id
+        data['lead'] = lead.title
+        data['source'] = lead.get_source_display()
+        data['priority'] = lead.get_priority_display()
+        data['author'] = lead.get_authors_display()
+        data['date'] = lead.published_on
+        data['excerpt'] = entry.excerpt
+        data['image'] = entry.get_image_url()
+        data['attributes'] = attributes
+        data['data_series'] = {}
+        if entry.tabular_field:
+            data['data_series'] = {
+                'options': entry.tabular_field.options,
+                'data': entry.tabular_field.actual_data,
+            }
+        return data
+
     def add_entries(self, entries):
-        self.data['entries'] = []
+        if not self.newline_delimited:
+            self._write('{\n  "entries": [')
 
-        iterable_entries = entries[:Export.PREVIEW_ENTRY_SIZE] if self.is_preview else entries
-        for entry in iterable_entries:
-            lead = entry.lead
-            data = {}
-            data['id'] = entry.id
-            data['lead_id'] = lead.id
-            data['lead'] = lead.title
-            data['source'] = lead.get_source_display()
-            data['priority'] = lead.get_priority_display()
-            data['author'] = lead.get_authors_display()
-            data['date'] = lead.published_on
-            data['excerpt'] = entry.excerpt
-            data['image'] = entry.get_image_url()
-            data['attributes'] = []
-            data['data_series'] = {}
-
-            for attribute in entry.attribute_set.all():
-                attribute_data = {}
-                attribute_data['widget_id'] = attribute.widget.key
-                attribute_data['data'] = attribute.data
-                data['attributes'].append(attribute_data)
-            if entry.tabular_field:
-                data['data_series'] = {
-                    'options': entry.tabular_field.options,
-                    'data': entry.tabular_field.actual_data,
-                }
-            self.data['entries'].append(data)
+        is_empty = True
+        for entry, attributes in self.iterate_entries_in_chunks(entries):
+            data = self.get_entry_data(entry, attributes)
+            if self.newline_delimited:
+                self._write(json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True) + '\n')
+            else:
+                self._write(('\n' if is_empty else ',\n') + '    ' + self._dumps(data, depth=2))
+            is_empty = False
+
+        if not self.newline_delimited:
+            self._write(']' if is_empty else '\n  ]')
         return self
 
     def export(self):
         """
         Export and return export data
         """
-        return generate_json_file_for_upload(
-            self.data,
-            sort_keys=True,
-            indent=2,
-        )
+        if not self.newline_delimited:
+            self._write(',\n  "widgets": ' + self._dumps(self.widgets, depth=1) + '\n}')
+        self.file.seek(0)
+        return File(self.file)
@@ -249,6 +249,8 @@ class ReportExporter:
         self.geoarea_data_cache = {}
         self.assessment_data_cache = {}
         self.entry_widget_data_cache = {}
+        # (entry_id, exportable_id) -> report keys
+        self.report_keys_map = {}
 
         # Citation
         self.citation_style = citation_style or Export.CitationStyle.DEFAULT
@@ -667,6 +669,21 @@ class ReportExporter:
 
         self.doc.add_paragraph()
 
+    def load_report_keys(self, entries, exportables):
+        """
+        Bulk load report keys from ExportData for all entries/exportables
+        """
+        report_keys_qs = ExportData.objects.filter(
+            entry__in=entries,
+            exportable__in=exportables,
+            data__report__keys__isnull=False,
+        ).order_by('id').values_list('entry_id', 'exportable_id', 'data__report__keys')
+        self.report_keys_map = {}
+        for entry_id, exportable_id, keys in report_keys_qs.iterator():
+            # Same as .first() for each entry/exportable
+            self.report_keys_map.setdefault((entry_id, exportable_id), keys)
+        return self
+
     def _load_into_levels(
             self,
             entry,
@@ -810,6 +827,11 @@ class ReportExporter:
             ])
             exportables = exportables.filter(pk__in=ids).order_by(order)
 
+        iterable_entries = entries[:Export.PREVIEW_ENTRY_SIZE] if self.is_preview else entries
+        self.load_report_keys(iterable_entries, exportables)
+        # Evaluate once for all exportables
+        iterable_entries = list(iterable_entries)
+
         for exportable in exportables:
             levels = (
                 # Custom levels provided by client
@@ -821,21 +843,11 @@ class ReportExporter:
             level_entries_map = {}
             valid_levels = []
 
-            iterable_entries = entries[:Export.PREVIEW_ENTRY_SIZE] if self.is_preview else entries
             for entry in iterable_entries:
-                # TODO
-                # Set entry.report_data to all exportdata for all exportable
-                # for this entry for later use
-
-                export_data = ExportData.objects.filter(
-                    entry=entry,
-                    exportable=exportable,
-                    data__report__keys__isnull=False,
-                ).first()
-
-                if export_data:
+                report_keys = self.report_keys_map.get((entry.pk, exportable.pk))
+                if report_keys is not None:
                     self._load_into_levels(
-                        entry, export_data.data.get('report').get('keys'),
+                        entry, report_keys,
                         levels, level_entries_map, valid_levels,
                     )
                     categorized_entry_processed += 1
@@ -1,9 +1,12 @@
 from collections import OrderedDict
+from tempfile import TemporaryFile
+from zipfile import ZipFile, ZIP_DEFLATED
 
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
-from openpyxl.writer.excel import save_virtual_workbook
+from openpyxl.writer.excel import ExcelWriter, save_virtual_workbook
 
 from utils.common import (
     get_valid_xml_string,
@@ -22,17 +25,33 @@ def xstr(value):
 class WorkBook:
     """
     An xlsx workbook
+
+    With write_only, rows are streamed to temporary files as they are appended
+    and the workbook is saved to a temporary file instead of memory.
     """
-    def __init__(self):
-        self.wb = Workbook()
+    def __init__(self, write_only=False):
+        self.write_only = write_only
+        self.wb = Workbook(write_only=write_only)
 
     def get_active_sheet(self):
+        if self.write_only:
+            # Write-only workbooks don't have a default sheet
+            return self.create_sheet(None)
         return WorkSheet(self.wb.active)
 
     def create_sheet(self, title):
+        if self.write_only:
+            return WriteOnlyWorkSheet(self.wb.create_sheet(title))
         return WorkSheet(self.wb.create_sheet(title))
 
     def save(self):
+        if self.write_only:
+            # Same as save_virtual_workbook, but without reading the file back to memory (Closed by the caller)
+            tmp = TemporaryFile()
+            archive = ZipFile(tmp, 'w', ZIP_DEFLATED, allowZip64=True)
+            ExcelWriter(self.wb, archive).save()
+            tmp.seek(0)
+            return tmp
         return save_virtual_workbook(self.wb)
 
 
@@ -66,6 +85,11 @@ class WorkSheet:
             self.ws.column_dimensions[get_column_letter(cell.column)].width = max(len(str(cell.value)), 15)
         return self
 
+    def auto_fit_columns(self, values):
+        for index, value in enumerate(values, start=1):
+            self.ws.column_dimensions[get_column_letter(index)].width = max(len(str(value)), 15)
+        return self
+
     def append(self, rows):
         [self.ws.append(row) for row in rows]
         return self
@@ -88,6 +112,39 @@ class WorkSheet:
                 self._set_cell_type(cell, col_type)
 
 
+class WriteOnlyWorkSheet(WorkSheet):
+    """
+    A write-only worksheet inside a write-only workbook
+
+    Rows can't be read back once appended, so column widths (auto_fit_columns)
+    and column types need to be set before the rows they apply to are appended.
+    """
+    def __init__(self, ws):
+        super().__init__(ws)
+        self.col_types = {}
+        self.rows_count = 0
+
+    def _get_typed_cell(self, value, col_type):
+        cell = WriteOnlyCell(self.ws, value=value)
+        self._set_cell_type(cell, col_type)
+        return cell
+
+    def append(self, rows):
+        for row in rows:
+            self.rows_count += 1
+            # Same as WorkSheet.set_col_types, header row is left as it is
+            if self.col_types and self.rows_count > 1:
+                row = [
+                    self._get_typed_cell(value, self.col_types[index]) if index in self.col_types else value
+                    for index, value in enumerate(row)
+                ]
+            self.ws.append(row)
+        return self
+
+    def set_col_types(self, col_types):
+        self.col_types = col_types
+
+
 class RowsBuilder:
     """
     Rows builder to build rows that permute with new rows
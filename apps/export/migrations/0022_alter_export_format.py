@@ -0,0 +1,23 @@
+# Generated by Django 3.2.17 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('export', '0021_auto_20230105_1048'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='export',
+            name='format',
+            field=models.CharField(choices=[('csv', 'csv'), ('xlsx', 'xlsx'), ('docx', 'docx'), ('pdf', 'pdf'), ('json', 'json'), ('ndjson', 'ndjson')], max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='genericexport',
+            name='format',
+            field=models.CharField(choices=[('csv', 'csv'), ('xlsx', 'xlsx'), ('docx', 'docx'), ('pdf', 'pdf'), ('json', 'json'), ('ndjson', 'ndjson')], max_length=100),
+        ),
+    ]
@@ -15,6 +15,7 @@ from export.mime_types import (
     DOCX_MIME_TYPE,
     EXCEL_MIME_TYPE,
     JSON_MIME_TYPE,
+    NDJSON_MIME_TYPE,
     PDF_MIME_TYPE,
 )
 from analysis.models import Analysis
@@ -42,6 +43,7 @@ class ExportBaseModel(models.Model):
         DOCX = 'docx', 'docx'
         PDF = 'pdf', 'pdf'
         JSON = 'json', 'json'
+        NDJSON = 'ndjson', 'ndjson'
 
     # Mime types
     MIME_TYPE_MAP = {
@@ -50,6 +52,7 @@ class ExportBaseModel(models.Model):
         Format.DOCX: DOCX_MIME_TYPE,
         Format.PDF: PDF_MIME_TYPE,
         Format.JSON: JSON_MIME_TYPE,
+        Format.NDJSON: NDJSON_MIME_TYPE,
     }
     DEFAULT_MIME_TYPE = 'application/octet-stream'
 
@@ -178,6 +181,7 @@ class Export(ExportBaseModel):
         (DataType.ENTRIES, ExportType.REPORT, Format.DOCX): 'Entries General Export',
         (DataType.ENTRIES, ExportType.REPORT, Format.PDF): 'Entries General Export',
         (DataType.ENTRIES, ExportType.JSON, Format.JSON): 'Entries JSON Export',
+        (DataType.ENTRIES, ExportType.JSON, Format.NDJSON): 'Entries NDJSON Export',
         (DataType.ASSESSMENTS, ExportType.EXCEL, Format.XLSX): 'Assessments Excel Export',
         (DataType.ASSESSMENTS, ExportType.JSON, Format.JSON): 'Assessments JSON Export',
         (DataType.PLANNED_ASSESSMENTS, ExportType.EXCEL, Format.XLSX): 'Planned Assessments Excel Export',
@@ -47,9 +47,12 @@ def export_task(export_id, force=False):
         export.save(update_fields=('status', 'started_at',))
 
         file = EXPORTER_TYPE[export.type](export)
-
-        export.mime_type = Export.MIME_TYPE_MAP.get(export.format, Export.DEFAULT_MIME_TYPE)
-        export.file.save(get_export_filename(export), file)
+        try:
+            export.mime_type = Export.MIME_TYPE_MAP.get(export.format, Export.DEFAULT_MIME_TYPE)
+            export.file.save(get_export_filename(export), file)
+        finally:
+            # Streaming exporters return temporary files, clean them up once saved
+            file.close()
 
         # Update status to SUCCESS
         export.status = Export.Status.SUCCESS
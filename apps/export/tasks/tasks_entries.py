@@ -86,6 +86,8 @@ def export_entries(export):
             columns=columns,
             decoupled=decoupled,
             is_preview=is_preview,
+            # Preview exports are small, full exports are streamed to keep memory usage flat
+            streaming=not is_preview,
         )\
             .load_exportables(exportables, regions)\
             .add_entries(entries_qs)\
@@ -122,7 +124,10 @@ def export_entries(export):
         )
 
     elif export_type == Export.ExportType.JSON:
-        export_data = JsonExporter(is_preview=is_preview)\
+        export_data = JsonExporter(
+            is_preview=is_preview,
+            newline_delimited=export.format == Export.Format.NDJSON,
+        )\
             .load_exportables(exportables, project.analysis_framework)\
             .add_entries(entries_qs)\
             .export()
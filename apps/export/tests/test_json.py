@@ -0,0 +1,64 @@
+import json
+from unittest import mock
+
+from utils.graphene.tests import GraphQLTestCase
+
+from analysis_framework.models import Widget, Exportable
+from analysis_framework.factories import AnalysisFrameworkFactory, WidgetFactory
+from entry.models import Entry
+from entry.factories import EntryFactory, EntryAttributeFactory
+from lead.factories import LeadFactory
+from project.factories import ProjectFactory
+from export.entries.json_exporter import JsonExporter
+
+
+class JsonExporterTest(GraphQLTestCase):
+    def setUp(self):
+        super().setUp()
+        self.af = AnalysisFrameworkFactory.create()
+        project = ProjectFactory.create(analysis_framework=self.af)
+        lead = LeadFactory.create(project=project)
+        self.widgets = WidgetFactory.create_batch(2, analysis_framework=self.af, widget_id=Widget.WidgetType.NUMBER)
+        self.entries_value = {}
+        for value in range(5):
+            entry = EntryFactory.create(project=project, lead=lead, analysis_framework=self.af)
+            self.entries_value[entry.pk] = value
+            for widget in self.widgets:
+                EntryAttributeFactory.create(entry=entry, widget=widget, data={'value': value})
+        self.entries_qs = Entry.objects.filter(project=project)
+        self.exportables_qs = Exportable.objects.filter(analysis_framework=self.af)
+
+    def _export(self, **kwargs):
+        return JsonExporter(**kwargs)\
+            .load_exportables(self.exportables_qs, self.af)\
+            .add_entries(self.entries_qs)\
+            .export()\
+            .read()\
+            .decode('utf-8')
+
+    @mock.patch.object(JsonExporter, 'CHUNK_SIZE', 2)
+    def test_json_exporter(self):
+        content = self._export()
+        data = json.loads(content)
+        # Same format as the non-streaming output
+        assert content == json.dumps(data, sort_keys=True, indent=2)
+        # Same order as the entries queryset
+        assert [entry['id'] for entry in data['entries']] == list(self.entries_qs.values_list('id', flat=True))
+        for entry in data['entries']:
+            assert entry['attributes'] == [
+                dict(widget_id=widget.key, data={'value': self.entries_value[entry['id']]})
+                for widget in self.widgets
+            ]
+        assert set(widget['id'] for widget in data['widgets']) == set(
+            self.exportables_qs.values_list('widget_key', flat=True)
+        )
+
+        # One entry per line
+        lines = self._export(newline_delimited=True).splitlines()
+        assert [json.loads(line) for line in lines] == data['entries']
+
+        # No entries
+        self.entries_qs = self.entries_qs.none()
+        data = json.loads(self._export())
+        assert data['entries'] == []
+        assert self._export(newline_delimited=True) == ''
@@ -1,5 +1,21 @@
+from io import BytesIO
+from unittest import mock
+
 from django.test import TestCase
-from export.formats.xlsx import RowsBuilder
+from openpyxl import load_workbook
+
+from analysis_framework.models import Exportable
+from analysis_framework.factories import AnalysisFrameworkFactory
+from entry.models import Entry, ExportData
+from entry.factories import EntryFactory
+from export.models import Export
+from export.factories import ExportFactory
+from export.entries.excel_exporter import ExcelExporter
+from export.formats.xlsx import RowsBuilder, WorkBook
+from lead.models import Lead
+from lead.factories import LeadFactory
+from project.factories import ProjectFactory
+from user.factories import UserFactory
 
 
 class RowsBuilderTest(TestCase):
@@ -32,3 +48,106 @@ class RowsBuilderTest(TestCase):
 
         self.assertEqual(result, builder.rows)
         self.assertEqual(group_result, builder.group_rows)
+
+
+class WriteOnlyWorkBookTest(TestCase):
+    def _get_sheet_values(self, write_only):
+        wb = WorkBook(write_only=write_only)
+        sheet = wb.get_active_sheet().set_title('Entries')
+        headers = ['Date', 'Title', 'Count']
+        col_types = {0: 'date', 2: 'number'}
+        sheet.auto_fit_columns(headers)
+        sheet.append([headers])
+        if write_only:
+            sheet.set_col_types(col_types)
+        sheet.append([
+            ['10-01-2020', 'Entry 1', '12'],
+            ['', 'Entry 2', '5'],
+        ])
+        if not write_only:
+            sheet.set_col_types(col_types)
+        content = wb.save()
+        if write_only:
+            content = content.read()
+        return [
+            [cell.value for cell in row]
+            for row in load_workbook(BytesIO(content))['Entries'].iter_rows()
+        ]
+
+    def test_write_only_workbook(self):
+        self.assertEqual(
+            self._get_sheet_values(write_only=False),
+            self._get_sheet_values(write_only=True),
+        )
+
+
+class ExcelExporterTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        af = AnalysisFrameworkFactory.create()
+        self.project = ProjectFactory.create(analysis_framework=af)
+        self.export = ExportFactory.create(
+            project=self.project,
+            exported_by=UserFactory.create(),
+            format=Export.Format.XLSX,
+            type=Export.DataType.ENTRIES,
+            export_type=Export.ExportType.EXCEL,
+        )
+        exportable = Exportable.objects.create(
+            analysis_framework=af,
+            widget_key='matrix-1',
+            data={'excel': {'type': 'multiple', 'titles': ['Dimension', 'Subdimension']}},
+        )
+        lead1, lead2 = LeadFactory.create_batch(2, project=self.project)
+        for index, lead in enumerate([lead1, lead1, lead2]):
+            entry = EntryFactory.create(project=self.project, lead=lead, analysis_framework=af)
+            if index != 1:
+                # Multiple values are written as multiple rows in the split sheet
+                ExportData.objects.create(
+                    entry=entry,
+                    exportable=exportable,
+                    data={'excel': {'type': 'lists', 'values': [[f'D{index}', 'S1'], [f'D{index}', 'S2']]}},
+                )
+        self.entries_qs = Entry.objects.filter(project=self.project)
+        self.leads_qs = Lead.objects.filter(project=self.project)
+        self.exportables_qs = Exportable.objects.filter(analysis_framework=af)
+
+    def _get_sheets_values(self, streaming, decoupled):
+        file = ExcelExporter(
+            self.export,
+            self.entries_qs,
+            self.project,
+            Export.DateFormat.DEFAULT,
+            decoupled=decoupled,
+            streaming=streaming,
+        )\
+            .load_exportables(self.exportables_qs)\
+            .add_entries(self.entries_qs)\
+            .export(self.leads_qs)
+        wb = load_workbook(BytesIO(file.read()))
+        file.close()
+        return {
+            sheet.title: [
+                [cell.value for cell in row]
+                for row in sheet.iter_rows()
+            ]
+            for sheet in wb.worksheets
+        }
+
+    @mock.patch.object(ExcelExporter, 'STREAMING_CHUNK_SIZE', 2)
+    def test_streaming_export(self):
+        for decoupled in [True, False]:
+            sheets_values = self._get_sheets_values(streaming=False, decoupled=decoupled)
+            # Same output as the in-memory workbook
+            self.assertEqual(self._get_sheets_values(streaming=True, decoupled=decoupled), sheets_values)
+            if decoupled:
+                self.assertEqual(
+                    list(sheets_values.keys()),
+                    ['Split Entries', 'Grouped Entries', 'Entry Groups', 'Bibliography'],
+                )
+                # Header + 2 rows for each entry with export data + 1 row for the entry without
+                self.assertEqual(len(sheets_values['Split Entries']), 1 + 2 + 1 + 2)
+                self.assertEqual(len(sheets_values['Grouped Entries']), 1 + 3)
+            else:
+                self.assertEqual(list(sheets_values.keys()), ['Entries', 'Entry Groups', 'Bibliography'])
+                self.assertEqual(len(sheets_values['Entries']), 1 + 3)
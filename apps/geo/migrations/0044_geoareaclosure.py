@@ -0,0 +1,50 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geo', '0043_create-unaccent_extension'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeoAreaClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='geo.geoarea')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='geo.geoarea')),
+            ],
+            options={
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunSQL(
+            sql='''
+                WITH RECURSIVE ancestors AS (
+                    SELECT
+                        id as descendant_id,
+                        id as ancestor_id,
+                        parent_id,
+                        0 as depth
+                    FROM geo_geoarea
+                    UNION ALL
+                    SELECT
+                        ancestors.descendant_id,
+                        G.id,
+                        G.parent_id,
+                        ancestors.depth + 1
+                    FROM geo_geoarea AS G
+                        INNER JOIN ancestors ON G.id = ancestors.parent_id
+                    WHERE ancestors.depth < 20
+                )
+                INSERT INTO geo_geoareaclosure (descendant_id, ancestor_id, depth)
+                SELECT descendant_id, ancestor_id, MIN(depth)
+                FROM ancestors
+                GROUP BY descendant_id, ancestor_id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
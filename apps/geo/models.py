@@ -48,6 +48,9 @@ class Region(UserResource):
         ordering = ['title', 'code']
 
     def calc_cache(self, save=True):
+        GeoAreaClosure.rebuild(
+            GeoArea.objects.filter(admin_level__region=self).values_list('id', flat=True)
+        )
         self.geo_options = [
             {
                 'label': '{} / {}'.format(geo_area.admin_level.title, geo_area.title),
@@ -194,38 +197,22 @@ class AdminLevel(models.Model):
     def calc_cache(self, save=True):
         # Update geo parent_titles data
         with transaction.atomic():
+            GeoAreaClosure.rebuild(self.geoarea_set.values_list('id', flat=True))
             GEO_PARENT_DATA_CALC_SQL = f'''
                 WITH geo_parents_data as (
                   SELECT
-                    id,
-                    title,
-                    (
-                      WITH RECURSIVE parents AS (
-                       SELECT
-                        sub_g.id,
-                        sub_g.title,
-                        sub_g.parent_id,
-                        sub_g.admin_level_id,
-                        sub_adminlevel.level
-                       FROM {GeoArea._meta.db_table} sub_g
-                         INNER JOIN {AdminLevel._meta.db_table} AS sub_adminlevel
-                            ON sub_adminlevel.id = sub_g.admin_level_id
-                       WHERE sub_g.id = outer_g.parent_id
-                       UNION
-                       SELECT
-                        sub_parent_g.id,
-                        sub_parent_g.title,
-                        sub_parent_g.parent_id,
-                        sub_parent_g.admin_level_id,
-                        sub_parent_adminlevel.level
-                       FROM {GeoArea._meta.db_table} AS sub_parent_g
-                         INNER JOIN parents ON sub_parent_g.id = parents.parent_id
-                         INNER JOIN {AdminLevel._meta.db_table} AS sub_parent_adminlevel
-                            ON sub_parent_adminlevel.id = sub_parent_g.admin_level_id
-                      ) SELECT array_agg(title ORDER BY level) from parents
-                    ) as parent_titles
+                    outer_g.id,
+                    array_agg(parent_g.title ORDER BY parent_adminlevel.level)
+                      FILTER (WHERE parent_g.id IS NOT NULL) as parent_titles
                   FROM {GeoArea._meta.db_table} as outer_g
-                  WHERE admin_level_id = %(admin_level_id)s
+                    LEFT JOIN {GeoAreaClosure._meta.db_table} AS closure
+                      ON closure.descendant_id = outer_g.id AND closure.depth > 0
+                    LEFT JOIN {GeoArea._meta.db_table} AS parent_g
+                      ON parent_g.id = closure.ancestor_id
+                    LEFT JOIN {AdminLevel._meta.db_table} AS parent_adminlevel
+                      ON parent_adminlevel.id = parent_g.admin_level_id
+                  WHERE outer_g.admin_level_id = %(admin_level_id)s
+                  GROUP BY outer_g.id
                 )
                 UPDATE {GeoArea._meta.db_table} AS G
                 SET
@@ -351,9 +338,25 @@ class GeoArea(models.Model):
     # -- Used to store additional data
     cached_data = models.JSONField(default=None, blank=True, null=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Used to track parent change (See save)
+        self._initial_parent_id = self.__dict__.get('parent_id')
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if is_new or self.parent_id != self._initial_parent_id:
+            # Update ancestors of this and all sub-regions
+            GeoAreaClosure.rebuild([
+                self.pk,
+                *GeoAreaClosure.objects.filter(ancestor=self, depth__gt=0).values_list('descendant', flat=True),
+            ])
+        self._initial_parent_id = self.parent_id
+
     @classmethod
     def sync_centroid(cls):
         cls.objects.filter(
@@ -392,12 +395,20 @@ class GeoArea(models.Model):
         return geo_area
 
     @classmethod
-    def get_sub_childrens(cls, value: List[Union[str, int]], level=1):
+    def get_sub_childrens(cls, value: List[Union[str, int]], level=None):
+        """
+        Return geo areas with all their sub-regions (using GeoAreaClosure)
+        level: Limit number of levels (1 -> only given geo areas)
+        """
         if value:
-            filters = models.Q(id__in=list(value))
-            for i in range(level - 1):
-                filters |= models.Q(**{f"{'parent__' * i}parent__in": value})
-            return cls.objects.filter(filters)
+            value = list(value)
+            closure_qs = GeoAreaClosure.objects.filter(ancestor__in=value)
+            if level is not None:
+                closure_qs = closure_qs.filter(depth__lt=level)
+            return cls.objects.filter(
+                models.Q(id__in=value) |
+                models.Q(id__in=closure_qs.values('descendant'))
+            )
         return cls.objects.none()
 
     # Permissions are same as region
@@ -417,3 +428,69 @@ class GeoArea(models.Model):
 
     def get_label(self):
         return '{} / {}'.format(self.admin_level.title, self.title)
+
+
+class GeoAreaClosure(models.Model):
+    """
+    Materialized ancestor/descendant relations of GeoArea (Includes self with depth 0)
+
+    Updated when a GeoArea is created or it's parent is changed,
+    and re-generated by AdminLevel.calc_cache/Region.calc_cache
+    """
+    # Guard against cyclic parent relations
+    MAX_DEPTH = 20
+
+    ancestor = models.ForeignKey(GeoArea, on_delete=models.CASCADE, related_name='+')
+    descendant = models.ForeignKey(GeoArea, on_delete=models.CASCADE, related_name='+')
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+
+    def __str__(self):
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
+
+    @classmethod
+    def rebuild(cls, geo_area_ids):
+        """
+        Re-generate ancestors of the given geo areas
+        """
+        geo_area_ids = list(geo_area_ids)
+        if not geo_area_ids:
+            return
+        params = {
+            'geo_area_ids': geo_area_ids,
+            'max_depth': cls.MAX_DEPTH,
+        }
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {cls._meta.db_table} WHERE descendant_id = ANY(%(geo_area_ids)s)',
+                params,
+            )
+            cursor.execute(
+                f'''
+                WITH RECURSIVE ancestors AS (
+                    SELECT
+                        id as descendant_id,
+                        id as ancestor_id,
+                        parent_id,
+                        0 as depth
+                    FROM {GeoArea._meta.db_table}
+                    WHERE id = ANY(%(geo_area_ids)s)
+                    UNION ALL
+                    SELECT
+                        ancestors.descendant_id,
+                        G.id,
+                        G.parent_id,
+                        ancestors.depth + 1
+                    FROM {GeoArea._meta.db_table} AS G
+                        INNER JOIN ancestors ON G.id = ancestors.parent_id
+                    WHERE ancestors.depth < %(max_depth)s
+                )
+                INSERT INTO {cls._meta.db_table} (descendant_id, ancestor_id, depth)
+                SELECT descendant_id, ancestor_id, MIN(depth)
+                FROM ancestors
+                GROUP BY descendant_id, ancestor_id
+                ''',
+                params,
+            )
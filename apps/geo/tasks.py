@@ -2,15 +2,17 @@ from celery import shared_task
 from django.conf import settings
 from django.contrib.gis.gdal import DataSource
 from django.contrib.gis.geos import GEOSGeometry
-from django.db.models import Q
 from geo.models import Region, AdminLevel, GeoArea
 
 from redis_store import redis
 
 import os
+import itertools
+import multiprocessing
 import reversion
 import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import logging
 
@@ -26,69 +28,155 @@ def add(x, y):
     return x + y
 
 
-def _save_geo_area(admin_level, parent, feature):
-    name = None
-    code = None
+# Number of features simplified/saved at once
+GEO_AREA_CHUNK_SIZE = 1000
+# Geometries are simplified in parallel only for layers with more features than this
+GEO_AREA_PARALLEL_THRESHOLD = GEO_AREA_CHUNK_SIZE
+GEO_AREA_SIMPLIFY_MAX_WORKERS = None  # Defaults to number of CPUs
+# Used when parent props are not available for the feature (Existing parent is kept)
+_KEEP_PARENT = object()
 
-    if admin_level.name_prop:
-        name = feature.get(admin_level.name_prop)
-    if admin_level.code_prop:
-        code = feature.get(admin_level.code_prop)
 
-    name = name or ''
+def _simplify_geometry(wkt, tolerance):
+    # NOTE: Runs in worker process, return hex WKB (picklable)
+    return GEOSGeometry(wkt).simplify(
+        tolerance=tolerance,
+        preserve_topology=True,
+    ).hex
 
-    geo_area = GeoArea.objects.filter(
-        Q(code=None, title=name) | Q(code=code),
-        admin_level=admin_level,
-    ).first()
 
-    if not geo_area:
-        geo_area = GeoArea()
+def _get_simplify_executor(features_count):
+    if features_count <= GEO_AREA_PARALLEL_THRESHOLD:
+        return None
+    if multiprocessing.current_process().daemon:
+        # Daemonic processes (eg: celery prefork workers) are not allowed to have children.
+        # GEOS calls (ctypes) release the GIL, so threads are used instead.
+        return ThreadPoolExecutor(max_workers=GEO_AREA_SIMPLIFY_MAX_WORKERS)
+    return ProcessPoolExecutor(max_workers=GEO_AREA_SIMPLIFY_MAX_WORKERS)
 
-    geo_area.title = name
-    geo_area.code = code if code else ''
-    geo_area.admin_level = admin_level
 
-    geom = feature.geom
-    geom = GEOSGeometry(geom.wkt).simplify(
-        tolerance=admin_level.tolerance,
-        preserve_topology=True,
-    )
+def _get_str(value):
+    # Same as the value used for the database lookup
+    if value is not None:
+        return str(value)
 
-    # if geom.geom_type == 'Polygon':
-    #     geom = MultiPolygon(geom)
-    # elif geom.geom_type != 'MultiPolygon':
-    #     raise Exception('Invalid geometry type for geoarea')
 
-    geo_area.polygons = geom
+def _save_geo_areas(admin_level, parent, layer):
+    """
+    Create/Update geo areas of the admin level using the features of the layer
+    - Existing geo area with the same code is updated
+    - Parent is linked using parent_name_prop and/or parent_code_prop
+    Return ids of the saved geo areas
+    """
     feature_names = [
         f.decode('utf-8') if isinstance(f, bytes) else f
-        for f in feature.fields
+        for f in layer.fields
     ]
 
-    if parent:
-        if admin_level.parent_name_prop and \
-                admin_level.parent_name_prop in feature_names:
-            candidates = GeoArea.objects.filter(
-                admin_level=parent,
-                title=feature.get(admin_level.parent_name_prop)
-            )
+    # Existing geo areas by code (First one is used for duplicate codes)
+    geo_areas_by_code = {}
+    for pk, code, parent_id in GeoArea.objects.filter(
+        admin_level=admin_level,
+    ).order_by('-id').values_list('id', 'code', 'parent_id'):
+        geo_areas_by_code[code] = GeoArea(id=pk, code=code, parent_id=parent_id)
 
+    parent_geo_areas_by_title = {}
+    parent_geo_areas_by_title_code = {}
+    parent_geo_areas_by_code = {}
+    if parent:
+        for pk, title, code in GeoArea.objects.filter(
+            admin_level=parent,
+        ).order_by('-id').values_list('id', 'title', 'code'):
+            parent_geo_areas_by_title[title] = pk
+            parent_geo_areas_by_title_code[(title, code)] = pk
+            parent_geo_areas_by_code[code] = pk
+
+    def _get_parent_id(feature):
+        if not parent:
+            return _KEEP_PARENT
+        if admin_level.parent_name_prop and admin_level.parent_name_prop in feature_names:
+            title = _get_str(feature.get(admin_level.parent_name_prop))
             if admin_level.parent_code_prop:
-                candidates = candidates.filter(
-                    code=feature.get(admin_level.parent_code_prop)
+                return parent_geo_areas_by_title_code.get(
+                    (title, _get_str(feature.get(admin_level.parent_code_prop)))
                 )
-            geo_area.parent = candidates.first()
+            return parent_geo_areas_by_title.get(title)
+        if admin_level.parent_code_prop and admin_level.parent_code_prop in feature_names:
+            return parent_geo_areas_by_code.get(_get_str(feature.get(admin_level.parent_code_prop)))
+        return _KEEP_PARENT
+
+    def _get_feature_data(feature):
+        name = None
+        code = None
+        if admin_level.name_prop:
+            name = feature.get(admin_level.name_prop)
+        if admin_level.code_prop:
+            # NOTE: Shape files can have numeric codes, GeoArea.code (and the lookup) uses str
+            code = _get_str(feature.get(admin_level.code_prop))
+        return dict(
+            name=name or '',
+            code=code,
+            parent_id=_get_parent_id(feature),
+            wkt=feature.geom.wkt,
+        )
 
-        elif admin_level.parent_code_prop and \
-                admin_level.parent_code_prop in feature_names:
-            geo_area.parent = GeoArea.objects.filter(
-                admin_level=parent,
-                code=feature.get(admin_level.parent_code_prop)
-            ).first()
+    def _save_chunk(chunk, executor):
+        wkts = [data['wkt'] for data in chunk]
+        if executor is None:
+            geoms = [_simplify_geometry(wkt, admin_level.tolerance) for wkt in wkts]
+        else:
+            geoms = executor.map(
+                _simplify_geometry, wkts, itertools.repeat(admin_level.tolerance),
+                chunksize=100,  # NOTE: Used by ProcessPoolExecutor only
+            )
 
-    geo_area.save()
-    return geo_area
+        new_geo_areas = []
+        updated_geo_areas = {}
+        for data, geom in zip(chunk, geoms):
+            code = data['code']
+            geo_area = None
+            if code is not None:
+                geo_area = geo_areas_by_code.get(code)
+            if geo_area is None:
+                geo_area = GeoArea()
+                new_geo_areas.append(geo_area)
+            elif geo_area.pk is not None:
+                updated_geo_areas[geo_area.pk] = geo_area
+
+            geo_area.title = data['name']
+            geo_area.code = code if code else ''
+            geo_area.admin_level = admin_level
+            geo_area.polygons = GEOSGeometry(geom)
+            if data['parent_id'] is not _KEEP_PARENT:
+                geo_area.parent_id = data['parent_id']
+            geo_areas_by_code.setdefault(geo_area.code, geo_area)
+
+        GeoArea.objects.bulk_create(new_geo_areas)
+        GeoArea.objects.bulk_update(
+            updated_geo_areas.values(),
+            ('title', 'code', 'admin_level', 'polygons', 'parent'),
+        )
+        saved_geo_areas = [*new_geo_areas, *updated_geo_areas.values()]
+        for geo_area in saved_geo_areas:
+            # Free up memory, geo area is kept for lookup only
+            geo_area.polygons = None
+        return [geo_area.pk for geo_area in saved_geo_areas]
+
+    added_areas = []
+    executor = _get_simplify_executor(len(layer))
+    try:
+        chunk = []
+        for feature in layer:
+            chunk.append(_get_feature_data(feature))
+            if len(chunk) >= GEO_AREA_CHUNK_SIZE:
+                added_areas.extend(_save_chunk(chunk, executor))
+                chunk = []
+        if chunk:
+            added_areas.extend(_save_chunk(chunk, executor))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return added_areas
 
 
 def _generate_geo_areas(admin_level, parent):
@@ -128,14 +216,8 @@ def _generate_geo_areas(admin_level, parent):
         if data_source.layer_count == 1:
             layer = data_source[0]
 
-            added_areas = []
-            for feature in layer:
-                # Each feature is a geo area
-                geo_area = _save_geo_area(
-                    admin_level, parent,
-                    feature,
-                )
-                added_areas.append(geo_area.id)
+            # Each feature is a geo area
+            added_areas = _save_geo_areas(admin_level, parent, layer)
 
             # Delete all previous geo areas that have not been added
             GeoArea.objects.filter(
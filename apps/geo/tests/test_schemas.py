@@ -1,6 +1,6 @@
 from utils.graphene.tests import GraphQLTestCase
 
-from geo.models import AdminLevel
+from geo.models import AdminLevel, GeoArea, GeoAreaClosure
 
 from project.factories import ProjectFactory
 from user.factories import UserFactory
@@ -197,3 +197,42 @@ class TestGeoSchema(GraphQLTestCase):
                 (region_2_ad_2_geo_area_01, [])
             ]
         ])
+
+    def test_geo_area_closure(self):
+        region = RegionFactory.create()
+        admin_level1 = AdminLevelFactory.create(region=region, level=1)
+        admin_level2 = AdminLevelFactory.create(region=region, level=2)
+        admin_level3 = AdminLevelFactory.create(region=region, level=3)
+        geo_area_1 = GeoAreaFactory.create(admin_level=admin_level1)
+        geo_area_1_1 = GeoAreaFactory.create(admin_level=admin_level2, parent=geo_area_1)
+        geo_area_1_2 = GeoAreaFactory.create(admin_level=admin_level2, parent=geo_area_1)
+        geo_area_1_1_1 = GeoAreaFactory.create(admin_level=admin_level3, parent=geo_area_1_1)
+        geo_area_2 = GeoAreaFactory.create(admin_level=admin_level1)
+
+        def _get_sub_childrens(*geo_areas, **kwargs):
+            return set(
+                GeoArea.get_sub_childrens([geo_area.pk for geo_area in geo_areas], **kwargs)
+                .values_list('id', flat=True)
+            )
+
+        assert _get_sub_childrens(geo_area_1) == {
+            geo_area_1.pk, geo_area_1_1.pk, geo_area_1_2.pk, geo_area_1_1_1.pk,
+        }
+        assert _get_sub_childrens(geo_area_1, level=2) == {geo_area_1.pk, geo_area_1_1.pk, geo_area_1_2.pk}
+        assert _get_sub_childrens(geo_area_1_1, geo_area_2) == {geo_area_1_1.pk, geo_area_1_1_1.pk, geo_area_2.pk}
+
+        # Sub-regions are also updated when parent is changed
+        geo_area_1_1.parent = geo_area_2
+        geo_area_1_1.save()
+        assert _get_sub_childrens(geo_area_2) == {geo_area_2.pk, geo_area_1_1.pk, geo_area_1_1_1.pk}
+        assert set(
+            GeoAreaClosure.objects.filter(descendant=geo_area_1_1_1).values_list('ancestor', 'depth')
+        ) == {(geo_area_1_1_1.pk, 0), (geo_area_1_1.pk, 1), (geo_area_2.pk, 2)}
+
+        # Re-generated by Region.calc_cache (Eg: After queryset update)
+        GeoArea.objects.filter(pk=geo_area_1_1.pk).update(parent=geo_area_1)
+        region.calc_cache()
+        assert _get_sub_childrens(geo_area_1) == {
+            geo_area_1.pk, geo_area_1_1.pk, geo_area_1_2.pk, geo_area_1_1_1.pk,
+        }
+        assert _get_sub_childrens(geo_area_2) == {geo_area_2.pk}
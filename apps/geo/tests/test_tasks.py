@@ -2,6 +2,7 @@ import re
 import os
 import json
 import tempfile
+from unittest import mock
 
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -114,6 +115,62 @@ class LoadGeoAreasTaskTest(TestCase):
 
         self.assertIsNotNone(sindhupalchowk)
 
+    @mock.patch('geo.tasks.GEO_AREA_CHUNK_SIZE', 2)
+    def test_load_areas_in_chunks(self):
+        def _get_geo_areas():
+            return set(
+                GeoArea.objects.filter(admin_level__region=self.region).values_list(
+                    'id', 'admin_level', 'code', 'title', 'parent__code',
+                )
+            )
+
+        self.assertTrue(load_geo_areas(self.region.pk))
+        geo_areas = _get_geo_areas()
+        self.assertTrue(len(geo_areas) > 2)
+        self.assertTrue(
+            GeoArea.objects.filter(
+                admin_level=self.admin_level1,
+                parent__code='NP-C-BAG',
+                code='NP-C-BAG-23',
+            ).exists()
+        )
+
+        # Re-loading updates the existing geo areas
+        self.assertTrue(load_geo_areas(self.region.pk))
+        self.assertEqual(_get_geo_areas(), geo_areas)
+
+        # Numeric codes (duplicates across chunks are saved as one geo area)
+        region = Region.objects.create(code='NUM', title='Numeric')
+        admin_level = AdminLevel(region=region, title='Numeric', name_prop='NAME', code_prop='CODE')
+        admin_level.geo_shape_file = File.objects.create(
+            title='numeric',
+            file=SimpleUploadedFile(
+                name='numeric.geo.json',
+                content=json.dumps({
+                    'type': 'FeatureCollection',
+                    'features': [
+                        {
+                            'type': 'Feature',
+                            'properties': {'NAME': name, 'CODE': code},
+                            'geometry': {
+                                'type': 'Polygon',
+                                'coordinates': [[[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]]],
+                            },
+                        }
+                        for name, code in [('A', 1), ('B', 2), ('C', 1)]
+                    ],
+                }).encode('utf-8'),
+            )
+        )
+        admin_level.save()
+        for _ in range(2):
+            self.assertTrue(load_geo_areas(region.pk))
+            self.assertEqual(
+                set(GeoArea.objects.filter(admin_level=admin_level).values_list('code', 'title')),
+                {('1', 'C'), ('2', 'B')},
+            )
+        os.unlink(admin_level.geo_shape_file.file.path)
+
     def test_geojson_api(self):
         result = load_geo_areas(self.region.pk)
         self.assertTrue(result)
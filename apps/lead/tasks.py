@@ -31,6 +31,20 @@ def extract_from_lead(self, lead_id):
         logger.error('Lead Core Extraction Failed!!', exc_info=True)
 
 
+@shared_task
+def ingest_lead_preview_attachments(lead_id, images_uri, table_uri):
+    """
+    Save extracted images/tables of a lead (from the extractor callback) as LeadPreviewAttachment
+    """
+    lead = Lead.objects.filter(pk=lead_id).first()
+    if lead is None:
+        return
+    try:
+        return LeadExtractionHandler.save_preview_attachments(lead, images_uri, table_uri)
+    except Exception:
+        logger.error('Lead Preview Attachments Ingestion Failed!!', exc_info=True)
+
+
 @shared_task
 def generate_previews(lead_ids=None):
     """Generate previews of leads which do not have preview"""
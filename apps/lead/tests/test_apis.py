@@ -45,6 +45,8 @@ from lead.models import (
 from user_group.models import UserGroup, GroupMembership
 from ary.models import Assessment
 from lead.factories import LeadFactory, LeadPreviewFactory
+from geo.factories import RegionFactory, AdminLevelFactory, GeoAreaFactory
+from assisted_tagging.models import DraftEntry, AssistedTaggingPrediction
 from unittest import mock
 
 
@@ -1885,6 +1887,13 @@ class AutoEntryExtractionTestCase(TestCase):
     def test_entry_extraction_callback_url(self, get_json_mock):
         url = '/api/v1/callback/auto-assisted-tagging-draft-entry-prediction/'
         self.authenticate()
+        region = RegionFactory.create(is_published=True)
+        self.lead.project.regions.add(region)
+        admin_level = AdminLevelFactory.create(region=region)
+        geo_area1 = GeoAreaFactory.create(admin_level=admin_level, title='Somalia')
+        geo_area2 = GeoAreaFactory.create(admin_level=admin_level, title='nigeria')
+        # Not used: Different region
+        GeoAreaFactory.create(admin_level=AdminLevelFactory.create(region=RegionFactory.create()), title='Somalia')
         SAMPLE_AUTO_ASSISTED_TAGGING = {
             "metadata": {"total_pages": 10, "total_words_count": 5876},
             "blocks": [
@@ -1955,3 +1964,16 @@ class AutoEntryExtractionTestCase(TestCase):
         self.lead.refresh_from_db()
         self.assertEqual(str(LeadPreview.objects.get(lead=self.lead).text_extraction_id), data['text_extraction_id'])
         self.assertEqual(self.lead.auto_entry_extraction_status, Lead.AutoExtractionStatus.SUCCESS)
+
+        draft_entries = list(
+            DraftEntry.objects.filter(lead=self.lead, type=DraftEntry.Type.AUTO).order_by('text_order')
+        )
+        self.assertEqual([draft.excerpt for draft in draft_entries], ['Entry-Text-1', 'Entry-Text-2'])
+        self.assertEqual(
+            [list(draft.related_geoareas.values_list('id', flat=True)) for draft in draft_entries],
+            [[geo_area1.pk], [geo_area2.pk]],
+        )
+        self.assertEqual(
+            AssistedTaggingPrediction.objects.filter(draft_entry__in=draft_entries).count(),
+            2,
+        )
@@ -236,18 +236,12 @@ class Project(UserResource):
         return visible_projects
 
     def fetch_current_user_membership_data(self, user):
-        membership = ProjectMembership.objects\
-            .select_related('role')\
-            .filter(project=self, member=user).first()
-        current_user_role = None
-        badges = []
-        if membership:
-            current_user_role = membership.role.type
-            badges = membership.badges
+        # NOTE: All memberships of the user are fetched once and cached in the user instance
+        membership_data = ProjectMembership.get_user_memberships_data(user).get(self.pk) or {}
         self.current_user_membership_data = dict(
             user_id=user.id,
-            role=current_user_role,
-            badges=badges,
+            role=membership_data.get('role'),
+            badges=membership_data.get('badges') or [],
         )
 
     def get_current_user_attr(self, user, attr):
@@ -550,6 +544,9 @@ class ProjectMembership(models.Model):
     # Represents additional permission like QA
     badges = ArrayField(models.IntegerField(choices=BadgeType.choices), default=list, blank=True)
 
+    # Incremented on any membership change (See receivers). Used to invalidate get_user_memberships_data
+    _memberships_data_version = 0
+
     class Meta:
         unique_together = ('member', 'project')
 
@@ -557,6 +554,30 @@ class ProjectMembership(models.Model):
         return '{} @ {}'.format(str(self.member),
                                 self.project.title)
 
+    @classmethod
+    def invalidate_user_memberships_data(cls):
+        cls._memberships_data_version += 1
+
+    @classmethod
+    def get_user_memberships_data(cls, user):
+        """
+        Return role/badges of all memberships of the user: {project_id: dict(role, badges)}
+        Cached in the user instance (request.user), so memberships are fetched once per request.
+        """
+        if user.id is None:
+            return {}
+        version, memberships_data = getattr(user, '_project_memberships_data', (None, None))
+        if version != cls._memberships_data_version:
+            version = cls._memberships_data_version
+            memberships_data = {
+                project_id: dict(role=role, badges=badges)
+                for project_id, role, badges in cls.objects.filter(member=user).values_list(
+                    'project_id', 'role__type', 'badges',
+                )
+            }
+            user._project_memberships_data = (version, memberships_data)
+        return memberships_data
+
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
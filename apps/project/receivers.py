@@ -1,12 +1,15 @@
-from django.db import models
+from django.db import models, transaction
 from django.dispatch import receiver
 
 from user.models import User
+from lead.models import Lead
+from entry.models import Entry
 from project.models import (
     ProjectMembership,
     ProjectUserGroupMembership,
     ProjectJoinRequest,
 )
+from project.tasks import mark_project_stats_dirty
 
 
 @receiver(models.signals.post_save, sender=ProjectUserGroupMembership)
@@ -19,6 +22,8 @@ def refresh_project_memberships_usergroup_modified(sender, instance, **kwargs):
         linked_group=user_group,
     )
     existing_members.update(role=instance.role, badges=instance.badges)
+    ProjectMembership.invalidate_user_memberships_data()
+    mark_project_stats_dirty([project.pk])
 
     project_ug_members = User.objects.filter(usergroup__project=project)
     new_users = project_ug_members.exclude(id__in=project.get_all_members()).distinct()
@@ -47,6 +52,12 @@ def refresh_project_memberships_usergroup_removed(sender, instance, **kwargs):
             membership.delete()
 
 
+@receiver(models.signals.post_save, sender=ProjectMembership)
+@receiver(models.signals.post_delete, sender=ProjectMembership)
+def invalidate_user_memberships_data(sender, **kwargs):
+    ProjectMembership.invalidate_user_memberships_data()
+
+
 # Whenever a member is saved, if there is a pending request to join
 # same project by same user, accept that request.
 @receiver(models.signals.post_save, sender=ProjectMembership)
@@ -62,3 +73,29 @@ def on_membership_saved(sender, **kwargs):
         responded_by=instance.added_by,
         responded_at=instance.joined_at,
     )
+
+
+# Project stats (See project.tasks.generate_project_stats_cache)
+@receiver(models.signals.post_save, sender=Lead)
+@receiver(models.signals.post_delete, sender=Lead)
+@receiver(models.signals.post_save, sender=Entry)
+@receiver(models.signals.post_delete, sender=Entry)
+@receiver(models.signals.post_save, sender=ProjectMembership)
+@receiver(models.signals.post_delete, sender=ProjectMembership)
+def mark_project_stats_dirty_on_change(sender, instance, **kwargs):
+    project_id = instance.project_id
+    transaction.on_commit(lambda: mark_project_stats_dirty([project_id]))
+
+
+@receiver(models.signals.m2m_changed, sender=Entry.verified_by.through)
+def mark_project_stats_dirty_on_entry_verify(sender, instance, action, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Entry):
+        project_ids = [instance.project_id]
+    else:
+        # Reverse relation (user.entry_set)
+        project_ids = list(
+            Entry.objects.filter(pk__in=kwargs.get('pk_set') or []).values_list('project_id', flat=True).distinct()
+        )
+    transaction.on_commit(lambda: mark_project_stats_dirty(project_ids))
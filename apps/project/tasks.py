@@ -29,6 +29,9 @@ logger = logging.getLogger(__name__)
 VIZ_STATS_WAIT_LOCK_KEY = 'generate_project_viz_stats__wait_lock__{0}'
 STATS_WAIT_LOCK_KEY = 'generate_project_stats__wait_lock'
 STATS_WAIT_TIMEOUT = ProjectStats.THRESHOLD_SECONDS
+# Redis set of projects with lead/entry/membership changes (See receivers)
+STATS_DIRTY_PROJECTS_KEY = 'generate_project_stats__dirty_projects'
+STATS_BATCH_SIZE = 500
 
 
 def _generate_project_viz_stats(project_id):
@@ -106,7 +109,39 @@ def get_project_stats(project, info, filters):
     return project
 
 
-def _generate_project_stats_cache():
+def mark_project_stats_dirty(project_ids):
+    """
+    Add projects to be re-calculated by next generate_project_stats_cache
+    """
+    project_ids = [project_id for project_id in project_ids if project_id]
+    if not project_ids:
+        return
+    try:
+        redis.get_connection().sadd(STATS_DIRTY_PROJECTS_KEY, *project_ids)
+    except Exception:
+        logger.warning(f'Failed to mark project stats dirty: {project_ids}', exc_info=True)
+
+
+def _pop_dirty_project_ids():
+    client = redis.get_connection()
+    project_ids = set()
+    while True:
+        popped_project_ids = client.spop(STATS_DIRTY_PROJECTS_KEY, STATS_BATCH_SIZE)
+        if not popped_project_ids:
+            break
+        project_ids.update(int(project_id) for project_id in popped_project_ids)
+    return project_ids
+
+
+def _generate_project_stats_cache(project_ids=None):
+    """
+    Re-calculate stats_cache for given projects (all projects if project_ids is None)
+    """
+    def _filter_projects(qs):
+        if project_ids is None:
+            return qs
+        return qs.filter(project__in=project_ids)
+
     def _count_by_project_qs(qs):
         return {
             project: count
@@ -134,14 +169,17 @@ def _generate_project_stats_cache():
     threshold = ProjectStats.get_activity_timeframe(current_time)
 
     # Make sure to only look for entries which have same AF as Project's AF
-    all_entries_qs = Entry.objects.filter(analysis_framework=models.F('project__analysis_framework'))
-    recent_leads = Lead.objects.filter(created_at__gte=threshold)
+    all_entries_qs = _filter_projects(
+        Entry.objects.filter(analysis_framework=models.F('project__analysis_framework'))
+    )
+    all_leads_qs = _filter_projects(Lead.objects.all())
+    recent_leads = all_leads_qs.filter(created_at__gte=threshold)
     recent_entries = all_entries_qs.filter(created_at__gte=threshold)
 
     # Calculate
-    leads_count_map = _count_by_project_qs(Lead.objects.all())
+    leads_count_map = _count_by_project_qs(all_leads_qs)
     leads_tagged_and_controlled_count_map = _count_by_project_qs(
-        Lead.objects.filter(status=Lead.Status.TAGGED).annotate(
+        all_leads_qs.filter(status=Lead.Status.TAGGED).annotate(
             entries_count=models.Subquery(
                 all_entries_qs.filter(
                     lead=models.OuterRef('pk'),
@@ -157,15 +195,15 @@ def _generate_project_stats_cache():
             ),
         ).filter(entries_count__gt=0, entries_count=models.F('entries_controlled_count'))
     )
-    leads_not_tagged_count_map = _count_by_project_qs(Lead.objects.filter(status=Lead.Status.NOT_TAGGED))
-    leads_in_progress_count_map = _count_by_project_qs(Lead.objects.filter(status=Lead.Status.IN_PROGRESS))
-    leads_tagged_count_map = _count_by_project_qs(Lead.objects.filter(status=Lead.Status.TAGGED))
+    leads_not_tagged_count_map = _count_by_project_qs(all_leads_qs.filter(status=Lead.Status.NOT_TAGGED))
+    leads_in_progress_count_map = _count_by_project_qs(all_leads_qs.filter(status=Lead.Status.IN_PROGRESS))
+    leads_tagged_count_map = _count_by_project_qs(all_leads_qs.filter(status=Lead.Status.TAGGED))
 
     entries_count_map = _count_by_project_qs(all_entries_qs)
     entries_verified_count_map = _count_by_project_qs(all_entries_qs.filter(verified_by__isnull=False))
     entries_controlled_count_map = _count_by_project_qs(all_entries_qs.filter(controlled=True))
 
-    members_count_map = _count_by_project_qs(ProjectMembership.objects.all())
+    members_count_map = _count_by_project_qs(_filter_projects(ProjectMembership.objects.all()))
 
     # Recent lead/entry stats
     leads_activity_count_map = _count_by_project_qs(recent_leads)
@@ -175,7 +213,11 @@ def _generate_project_stats_cache():
     entries_activity_map = _count_by_project_date_qs(recent_entries)
 
     # Store
-    for project in Project.objects.iterator():
+    projects_qs = Project.objects.only('id')
+    if project_ids is not None:
+        projects_qs = projects_qs.filter(pk__in=project_ids)
+    projects = []
+    for project in projects_qs.iterator():
         pk = project.pk
         project.stats_cache = dict(
             calculated_at=current_time.timestamp(),
@@ -193,7 +235,23 @@ def _generate_project_stats_cache():
             leads_activities=leads_activity_map.get(pk, []),
             entries_activities=entries_activity_map.get(pk, []),
         )
-        project.save(update_fields=['stats_cache'])
+        projects.append(project)
+        if len(projects) >= STATS_BATCH_SIZE:
+            Project.objects.bulk_update(projects, ['stats_cache'])
+            projects = []
+    Project.objects.bulk_update(projects, ['stats_cache'])
+
+
+def _generate_dirty_project_stats_cache():
+    project_ids = _pop_dirty_project_ids()
+    if not project_ids:
+        return
+    try:
+        _generate_project_stats_cache(project_ids=project_ids)
+    except Exception:
+        # Try again next time
+        mark_project_stats_dirty(project_ids)
+        raise
 
 
 @shared_task
@@ -215,9 +273,10 @@ def generate_viz_stats(project_id, force=False):
 
 
 @shared_task
-def generate_project_stats_cache(force=False):
+def generate_project_stats_cache(force=False, all_projects=False):
     """
     Generate stats data for Home
+    Only changed projects are calculated, use all_projects to re-calculate all (Eg: For recent activities)
     """
     key = STATS_WAIT_LOCK_KEY
     lock = redis.get_lock(key, STATS_WAIT_TIMEOUT)
@@ -226,8 +285,11 @@ def generate_project_stats_cache(force=False):
         logger.warning(f'GENERATE_PROJECT_STATS:: Waiting for timeout {key}')
         return False
 
-    logger.info(f'GENERATE_PROJECT_STATS:: Processing for {key}')
-    _generate_project_stats_cache()
+    logger.info(f'GENERATE_PROJECT_STATS:: Processing for {key} ({all_projects=})')
+    if all_projects:
+        _generate_project_stats_cache()
+    else:
+        _generate_dirty_project_stats_cache()
     lock.release()
     return True
 
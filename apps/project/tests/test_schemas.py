@@ -32,7 +32,12 @@ from ary.factories import AssessmentTemplateFactory
 from export.factories import ExportFactory
 from quality_assurance.factories import EntryReviewCommentFactory
 
-from project.tasks import _generate_project_stats_cache
+from project.tasks import (
+    STATS_DIRTY_PROJECTS_KEY,
+    _generate_project_stats_cache,
+    generate_project_stats_cache,
+)
+from redis_store import redis
 from geo.enums import GeoAreaOrderingEnum
 
 from .test_mutations import TestProjectGeneralMutationSnapshotTest
@@ -619,6 +624,62 @@ class TestProjectSchema(GraphQLTestCase):
         self.assertNotIn(QA_PERMISSION, content_projects_permissions[project1.pk], content_projects)
         self.assertIn(QA_PERMISSION, content_projects_permissions[project2.pk], content_projects)
 
+    def test_project_current_user_membership_cache(self):
+        project1, project2, project3 = ProjectFactory.create_batch(3)
+        user = UserFactory.create()
+        project1.add_member(user, role=self.project_role_admin)
+        membership = project2.add_member(user, role=self.project_role_member, badges=[ProjectMembership.BadgeType.QA])
+
+        # Memberships are only fetched once for the user
+        with self.assertNumQueries(2):
+            projects = list(Project.objects.filter(pk__in=[project1.pk, project2.pk, project3.pk]).order_by('pk'))
+            assert [
+                (project.get_current_user_role(user), project.get_current_user_badges(user))
+                for project in projects
+            ] == [
+                (self.project_role_admin.type, []),
+                (self.project_role_member.type, [ProjectMembership.BadgeType.QA]),
+                (None, []),
+            ]
+        # Cached memberships are used for new project instances
+        with self.assertNumQueries(1):
+            for project in Project.objects.filter(pk__in=[project1.pk, project2.pk, project3.pk]):
+                PP.get_permissions(project, user)
+
+        # Invalidated on membership change
+        membership.delete()
+        project3.add_member(user, role=self.project_role_reader)
+        with self.assertNumQueries(2):
+            projects = list(Project.objects.filter(pk__in=[project2.pk, project3.pk]).order_by('pk'))
+            assert [project.get_current_user_role(user) for project in projects] == [
+                None,
+                self.project_role_reader.type,
+            ]
+
+    def test_project_stats_cache_dirty_projects(self):
+        redis.get_connection().delete(STATS_DIRTY_PROJECTS_KEY)
+        project1, project2 = ProjectFactory.create_batch(2)
+        _generate_project_stats_cache()
+
+        # Only changed projects are calculated
+        with self.captureOnCommitCallbacks(execute=True):
+            LeadFactory.create_batch(2, project=project1)
+        ProjectFactory.create_batch(2)  # Not calculated
+        generate_project_stats_cache(force=True)
+        project1.refresh_from_db()
+        project2.refresh_from_db()
+        assert project1.stats_cache['number_of_leads'] == 2
+        assert project2.stats_cache['number_of_leads'] == 0
+        assert Project.objects.filter(stats_cache={}).count() == 2
+        assert not redis.get_connection().exists(STATS_DIRTY_PROJECTS_KEY)
+
+        # Stats are updated on delete as well
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.filter(project=project1).first().delete()
+        generate_project_stats_cache(force=True)
+        project1.refresh_from_db()
+        assert project1.stats_cache['number_of_leads'] == 1
+
     def test_projects_by_region(self):
         query = '''
             query MyQuery ($projectFilter: RegionProjectFilterData) {
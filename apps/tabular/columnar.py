@@ -0,0 +1,190 @@
+import io
+import json
+from datetime import datetime
+
+import numpy as np
+
+
+class ColumnData:
+    """
+    Columnar representation of a tabular Field's data
+
+    values: raw cell values (as extracted from the file)
+    invalid/empty: boolean masks (stored as bitmaps)
+    processed: typed array of casted values (float64 for number, int64 for geo,
+        datetime64[s] for datetime), valid only where processed_mask is set
+
+    The old JSON shape ([{'value', 'invalid', 'empty', 'processed_value'}]) is
+    only generated for the API (See to_json).
+    """
+
+    VERSION = 1
+    PROCESSED_DTYPES = {
+        'number': np.float64,
+        'geo': np.int64,
+        'datetime': 'datetime64[s]',
+    }
+
+    def __init__(self, values, invalid=None, empty=None, processed=None, processed_mask=None):
+        self.values = values
+        length = len(values)
+        self.invalid = np.zeros(length, dtype=bool) if invalid is None else invalid
+        self.empty = np.zeros(length, dtype=bool) if empty is None else empty
+        self.processed = processed
+        self.processed_mask = np.zeros(length, dtype=bool) if processed_mask is None else processed_mask
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def from_values(cls, values):
+        values = list(values)
+        return cls(
+            values,
+            empty=np.fromiter((value is None for value in values), dtype=bool, count=len(values)),
+        )
+
+    @classmethod
+    def from_json(cls, data, type=None):
+        """
+        Create from old JSON shape
+        """
+        data = data or []
+        length = len(data)
+        column = cls(
+            [datum.get('value') for datum in data],
+            invalid=np.fromiter((bool(datum.get('invalid')) for datum in data), dtype=bool, count=length),
+            empty=np.fromiter((bool(datum.get('empty')) for datum in data), dtype=bool, count=length),
+        )
+        dtype = cls.PROCESSED_DTYPES.get(type)
+        if dtype is not None:
+            processed_mask = np.fromiter(
+                (datum.get('processed_value') is not None for datum in data), dtype=bool, count=length,
+            )
+            processed = np.zeros(length, dtype=dtype)
+            for index in np.flatnonzero(processed_mask):
+                processed[index] = data[index]['processed_value']
+            column.processed, column.processed_mask = processed, processed_mask
+        return column
+
+    # Serialization
+    def to_bytes(self):
+        arrays = {
+            'version': np.array([self.VERSION]),
+            'length': np.array([len(self)]),
+            # JSON preserves the types of raw values (str/int/float/None)
+            'values': np.frombuffer(json.dumps(self.values, default=str).encode('utf-8'), dtype=np.uint8),
+            'invalid': np.packbits(self.invalid),
+            'empty': np.packbits(self.empty),
+            'processed_mask': np.packbits(self.processed_mask),
+        }
+        if self.processed is not None:
+            arrays['processed'] = self.processed
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        if not data:
+            return cls([])
+        with np.load(io.BytesIO(bytes(data)), allow_pickle=False) as arrays:
+            length = int(arrays['length'][0])
+
+            def _unpack(key):
+                return np.unpackbits(arrays[key], count=length).astype(bool)
+
+            return cls(
+                json.loads(arrays['values'].tobytes().decode('utf-8')),
+                invalid=_unpack('invalid'),
+                empty=_unpack('empty'),
+                processed=arrays['processed'] if 'processed' in arrays.files else None,
+                processed_mask=_unpack('processed_mask'),
+            )
+
+    # Access
+    def get_processed_value(self, index):
+        if self.processed is None or not self.processed_mask[index]:
+            return None
+        value = self.processed[index]
+        if np.issubdtype(self.processed.dtype, np.datetime64):
+            return value.astype(datetime).isoformat()
+        return value.item()
+
+    def to_json(self, start=0):
+        data = []
+        for index in range(start, len(self)):
+            datum = {
+                'value': self.values[index],
+                'invalid': bool(self.invalid[index]),
+                'empty': bool(self.empty[index]),
+            }
+            processed_value = self.get_processed_value(index)
+            if processed_value is not None:
+                datum['processed_value'] = processed_value
+            data.append(datum)
+        return data
+
+    def get_display_values(self, start=0):
+        """
+        Processed value if available else raw value
+        """
+        return [
+            self.get_processed_value(index) or self.values[index]
+            for index in range(start, len(self))
+        ]
+
+    def get_valid_mask(self, start=0):
+        mask = ~(self.empty | self.invalid)
+        mask[:start] = False
+        return mask
+
+    def get_valid_values(self, use_processed, start=0):
+        """
+        Returns numpy array of non empty/invalid values (processed or raw)
+        """
+        mask = self.get_valid_mask(start)
+        if use_processed:
+            if self.processed is None:
+                return np.array([])
+            mask &= self.processed_mask
+            values = self.processed[mask]
+            if np.issubdtype(values.dtype, np.datetime64):
+                return np.datetime_as_string(values, unit='s')
+            return values
+        return np.array([value for value, is_valid in zip(self.values, mask) if is_valid], dtype=object)
+
+    # Casting
+    def cast(self, type, cast_func, options, processed_getter=None):
+        """
+        Returns new ColumnData with invalid/empty/processed calculated using cast_func
+        and the casted values (by distinct value), as each distinct value is only casted once.
+        """
+        length = len(self)
+        empty = np.fromiter((value is None or value == '' for value in self.values), dtype=bool, count=length)
+        invalid = np.zeros(length, dtype=bool)
+        dtype = self.PROCESSED_DTYPES.get(type)
+        processed = np.zeros(length, dtype=dtype) if dtype is not None else None
+        processed_mask = np.zeros(length, dtype=bool)
+
+        casted_values = {}
+        for index in np.flatnonzero(~empty):
+            value = self.values[index]
+            # NOTE: Values are cached with their class as well (1 and 1.0 are same dict keys)
+            cache_key = (value.__class__, value)
+            if cache_key not in casted_values:
+                casted_values[cache_key] = cast_func(value, **options)
+            casted = casted_values[cache_key]
+            if casted is None:
+                invalid[index] = True
+            elif processed is not None:
+                processed[index] = processed_getter(casted)
+                processed_mask[index] = True
+
+        return ColumnData(
+            self.values,
+            invalid=invalid,
+            empty=empty,
+            processed=processed,
+            processed_mask=processed_mask,
+        ), casted_values
@@ -1,10 +1,64 @@
-import io
+import codecs
 import csv
+import logging
 from itertools import chain
+
+from charset_normalizer import from_bytes as detect_charset
+
 from ..models import Sheet, Field
+from ..columnar import ColumnData
 
 from utils.common import LogTime
 
+logger = logging.getLogger(__name__)
+
+# Bytes read from the file at once
+CHUNK_SIZE = 1024 * 1024
+# Bytes used to detect the encoding (first chunk)
+ENCODING_SAMPLE_SIZE = 64 * 1024
+DEFAULT_ENCODING = 'utf-8'
+FALLBACK_ENCODING = 'latin-1'
+
+
+def detect_encoding(sample):
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        # Sample can end in the middle of a character
+        codecs.getincrementaldecoder(DEFAULT_ENCODING)().decode(sample, final=False)
+        return DEFAULT_ENCODING
+    except UnicodeDecodeError:
+        pass
+    match = detect_charset(sample).best()
+    if match is None:
+        return FALLBACK_ENCODING
+    return match.encoding
+
+
+def iter_decoded_lines(file, chunk_size=CHUNK_SIZE):
+    """
+    Read file by chunks and yield decoded lines (Same lines as io.StringIO of the decoded file)
+    """
+    sample = file.read(ENCODING_SAMPLE_SIZE)
+    encoding = detect_encoding(sample)
+    logger.info(f'Using {encoding} encoding for csv extraction')
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    pending = ''
+    chunk = sample
+    while True:
+        pending += decoder.decode(chunk, final=not chunk)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+        if not chunk:
+            break
+        chunk = file.read(chunk_size)
+    if pending:
+        yield pending
+
 
 @LogTime()
 def extract(book):
@@ -16,7 +70,7 @@ def extract(book):
             book=book,
         )
         reader = csv.reader(
-            io.StringIO(csv_file.read().decode('utf-8')),
+            iter_decoded_lines(csv_file),
             delimiter=options.get('delimiter', ','),
             quotechar=options.get('quotechar', '"'),
             skipinitialspace=True,
@@ -25,46 +79,35 @@ def extract(book):
         no_headers = options.get('no_headers', False)
         data_index = 0 if no_headers else 1
 
-        fields = []
-        ordering = 1
-
         first_row = list(next(reader))  # first row might be used later as data
+        columns_count = len(first_row)
 
-        for header in first_row:
+        # Create a new iterator with already extracted first row if no_headers
+        rows_iterator = chain(iter([first_row]), reader)
+
+        # Per column buffers, missing cells are empty (None)
+        columns_values = [[] for _ in range(columns_count)]
+        for _row in rows_iterator:
+            row_len = len(_row)
+            for index, column_values in enumerate(columns_values):
+                column_values.append(_row[index] if index < row_len else None)
+
+        fields = []
+        for index, header in enumerate(first_row):
+            ordering = index + 1
             fields.append(
                 Field(
                     title=(header if not no_headers
                            else 'Column ' + str(ordering)),
                     sheet=sheet,
                     ordering=ordering,
+                    # Only keep the serialized column in memory
+                    column_data=ColumnData.from_values(columns_values[index]).to_bytes(),
                 )
             )
-            ordering += 1
-        Field.objects.bulk_create(fields)
+            columns_values[index] = None
+        with LogTime(block_name='Fields Save csv extract'):
+            Field.objects.bulk_create(fields)
 
-        # Create a new iterator with already extracted first row if no_headers
-        rows_iterator = chain(iter([first_row]), reader)
-
-        fields_data = {}
-        for _row in rows_iterator:
-            try:
-                for index, field in enumerate(fields):
-                    field_data = fields_data.get(field.id, [])
-                    field_data.append({
-                        'value': _row[index],
-                        'invalid': False,
-                        'empty': False,
-                    })
-                    fields_data[field.id] = field_data
-            except Exception:
-                pass
-
-        for field in sheet.field_set.all():
-            field.data = fields_data.get(field.id, [])
-            block_name = 'Field Save csv extract {}'.format(field.title)
-            with LogTime(block_name=block_name):
-                field.save()
-
-        options = sheet.options or {}
         sheet.data_row_index = data_index
         sheet.save()
@@ -3,6 +3,7 @@ from datetime import datetime
 import logging
 
 from ..models import Sheet, Field
+from ..columnar import ColumnData
 
 from utils.common import LogTime
 
@@ -45,37 +46,30 @@ def extract(book):
                                else 'Column ' + str(ordering)),
                         sheet=sheet,
                         ordering=ordering,
-                        data=[{
-                            'value': value,
-                            'empty': False,
-                            'invalid': False
-                        }]
                     )
                 )
                 ordering += 1
             Field.objects.bulk_create(fields)
 
-            fields_data = {}
+            # First value is the header
+            fields_values = {
+                field.id: [value]
+                for field, value in zip(fields, header_row)
+            }
             # Data
             for _row in wb_sheet[data_index:]:
                 try:
                     for index, field in enumerate(fields):
-                        field_data = fields_data.get(field.id, [])
                         value = _row[index]
                         if isinstance(value, (datetime, date_type)):
                             value = _row[index].isoformat()
-                        field_data.append({
-                            'value': value,
-                            'empty': False,
-                            'invalid': False
-                        })
-                        fields_data[field.id] = field_data
+                        fields_values[field.id].append(value)
                 except Exception:
                     pass
 
             # Save field
             for field in sheet.field_set.all():
-                field.data.extend(fields_data.get(field.id, []))
+                field.column = ColumnData.from_values(fields_values.get(field.id, []))
                 block_name = 'Field Save ods extract {}'.format(field.title)
                 with LogTime(block_name=block_name):
                     field.save()
@@ -2,6 +2,7 @@ import logging
 from openpyxl import load_workbook
 
 from ..models import Sheet, Field
+from ..columnar import ColumnData
 from datetime import datetime
 
 from utils.common import (
@@ -77,30 +78,33 @@ def extract(book, filename=None):
             if not sheet_rows:
                 return
 
+            # Now collect column values (None for missing cells)
+            columns_values = [[] for _ in range(max_col_length)]
+            for row in sheet_rows:
+                row_len = len(row)
+                for x in range(max_col_length):
+                    columns_values[x].append(row[x] if x < row_len else None)
+
             if no_headers:
                 fields = [
-                    Field(title=f'Column {x}', sheet=sheet, ordering=x, data=[])
+                    Field(
+                        title=f'Column {x}', sheet=sheet, ordering=x,
+                        column=ColumnData.from_values(columns_values[x]),
+                    )
                     for x in range(max_col_length)
                 ]
             else:
                 fields = []
                 for x in range(max_col_length):
                     row_len = len(sheet_rows[0])
-                    title_val = sheet_rows[0][x]['value'] if row_len > x else None
+                    title_val = sheet_rows[0][x] if row_len > x else None
                     title = title_val or f'Column {x}'
-                    fields.append(Field(title=title, sheet=sheet, ordering=x, data=[]))
-
-            empty_value = {
-                'value': None,
-                'invalid': False,
-                'empty': True
-            }
-            # Now append data to fields
-            for row in sheet_rows:
-                row_len = len(row)
-                for x in range(max_col_length):
-                    cell_data = row[x] if x < row_len else {**empty_value}
-                    fields[x].data.append(cell_data)
+                    fields.append(
+                        Field(
+                            title=title, sheet=sheet, ordering=x,
+                            column=ColumnData.from_values(columns_values[x]),
+                        )
+                    )
 
             # Bulk save fields
             Field.objects.bulk_create(fields)
@@ -119,12 +123,7 @@ def get_row_data(row):
     for cell in row:
         if cell.value is not None:
             max_data_col = curr_col
-        value = get_excel_value(cell)
-        data.append({
-            'value': value,
-            'empty': value is None,
-            'invalid': False
-        })
+        data.append(get_excel_value(cell))
         curr_col += 1
     # Now clip the data beyond which there is nothing
     return data[:max_data_col + 1]
@@ -0,0 +1,134 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:00
+
+import io
+import json
+from datetime import datetime
+
+import numpy as np
+from django.db import migrations, models
+
+BATCH_SIZE = 100
+
+# NOTE: Copy of tabular.columnar.ColumnData (VERSION 1) conversion, kept here as the model code can change later.
+PROCESSED_DTYPES = {
+    'number': np.float64,
+    'geo': np.int64,
+    'datetime': 'datetime64[s]',
+}
+
+
+def json_to_column_bytes(data, type):
+    data = data or []
+    length = len(data)
+
+    def _mask(key):
+        return np.fromiter((bool(datum.get(key)) for datum in data), dtype=bool, count=length)
+
+    processed_mask = np.zeros(length, dtype=bool)
+    arrays = {
+        'version': np.array([1]),
+        'length': np.array([length]),
+        'values': np.frombuffer(
+            json.dumps([datum.get('value') for datum in data], default=str).encode('utf-8'),
+            dtype=np.uint8,
+        ),
+        'invalid': np.packbits(_mask('invalid')),
+        'empty': np.packbits(_mask('empty')),
+    }
+    dtype = PROCESSED_DTYPES.get(type)
+    if dtype is not None:
+        processed_mask = np.fromiter(
+            (datum.get('processed_value') is not None for datum in data), dtype=bool, count=length,
+        )
+        processed = np.zeros(length, dtype=dtype)
+        for index in np.flatnonzero(processed_mask):
+            processed[index] = data[index]['processed_value']
+        arrays['processed'] = processed
+    arrays['processed_mask'] = np.packbits(processed_mask)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def column_bytes_to_json(column_data):
+    if not column_data:
+        return []
+    with np.load(io.BytesIO(bytes(column_data)), allow_pickle=False) as arrays:
+        length = int(arrays['length'][0])
+
+        def _unpack(key):
+            return np.unpackbits(arrays[key], count=length).astype(bool)
+
+        values = json.loads(arrays['values'].tobytes().decode('utf-8'))
+        invalid, empty, processed_mask = _unpack('invalid'), _unpack('empty'), _unpack('processed_mask')
+        processed = arrays['processed'] if 'processed' in arrays.files else None
+
+    data = []
+    for index in range(length):
+        datum = {
+            'value': values[index],
+            'invalid': bool(invalid[index]),
+            'empty': bool(empty[index]),
+        }
+        if processed is not None and processed_mask[index]:
+            value = processed[index]
+            if np.issubdtype(processed.dtype, np.datetime64):
+                datum['processed_value'] = value.astype(datetime).isoformat()
+            else:
+                datum['processed_value'] = value.item()
+        data.append(datum)
+    return data
+
+
+def _update_fields_in_batch(Field, only_fields, update_field, convert):
+    fields_qs = Field.objects.only('id', 'type', *only_fields).order_by('id')
+    fields = []
+    for field in fields_qs.iterator(chunk_size=BATCH_SIZE):
+        setattr(field, update_field, convert(field))
+        fields.append(field)
+        if len(fields) >= BATCH_SIZE:
+            Field.objects.bulk_update(fields, (update_field,))
+            fields = []
+    if fields:
+        Field.objects.bulk_update(fields, (update_field,))
+
+
+def migrate_field_data_to_column_data(apps, schema_editor):
+    _update_fields_in_batch(
+        apps.get_model('tabular', 'Field'),
+        ('data',),
+        'column_data',
+        lambda field: json_to_column_bytes(field.data, field.type),
+    )
+
+
+def migrate_column_data_to_field_data(apps, schema_editor):
+    _update_fields_in_batch(
+        apps.get_model('tabular', 'Field'),
+        ('column_data',),
+        'data',
+        lambda field: column_bytes_to_json(field.column_data),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tabular', '0022_auto_20210503_0431'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='field',
+            name='column_data',
+            field=models.BinaryField(default=None, null=True),
+        ),
+        migrations.RunPython(
+            migrate_field_data_to_column_data,
+            reverse_code=migrate_column_data_to_field_data,
+        ),
+        migrations.RemoveField(
+            model_name='field',
+            name='data',
+        ),
+    ]
@@ -7,6 +7,7 @@ from project.models import Project
 from utils.common import get_file_from_url
 
 from tabular.utils import get_cast_function
+from tabular.columnar import ColumnData
 
 
 class Book(UserResource):
@@ -128,7 +129,7 @@ class Sheet(models.Model):
                 field.cache['time'] = time.time()
                 # Update the field title
                 if self.data_row_index > 0:
-                    field.title = str(field.data[self.data_row_index - 1]['value'])
+                    field.title = str(field.column.values[self.data_row_index - 1])
                 field.save()
             field_ids = self.field_set.values_list('id', flat=True)
             transaction.on_commit(
@@ -161,6 +162,12 @@ class Field(models.Model):
         (GEO, 'Geo'),
     )
 
+    PROCESSED_VALUE_GETTERS = {
+        GEO: lambda casted: casted['id'],
+        NUMBER: lambda casted: casted[0],  # (number, separator)
+        DATETIME: lambda casted: casted,  # (parsed_date)
+    }
+
     title = models.CharField(max_length=255)
     sheet = models.ForeignKey(Sheet, on_delete=models.CASCADE)
     type = models.CharField(
@@ -172,64 +179,73 @@ class Field(models.Model):
     options = models.JSONField(default=None, blank=True, null=True)
     cache = models.JSONField(default=dict, blank=True, null=True)
     ordering = models.IntegerField(default=1)
-    data = models.JSONField(default=list)
+    # Serialized ColumnData (Use Field.column)
+    column_data = models.BinaryField(default=None, null=True)
+
+    @property
+    def column(self) -> ColumnData:
+        if self._column is None:
+            self._column = ColumnData.from_bytes(self.column_data)
+        return self._column
+
+    @column.setter
+    def column(self, column: ColumnData):
+        self._column = column
+        self.column_data = column.to_bytes()
+
+    @property
+    def data(self):
+        """
+        Data in old JSON shape, use only for API/Exports
+        """
+        return self.column.to_json()
 
     @property
     def actual_data(self):
         row_index = self.sheet.data_row_index
-        return self.data[row_index:]
+        return self.column.to_json(start=row_index)
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, column=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self._column = None
+        if column is not None:
+            self.column = column
         self.current_type = self.type
         self.current_options = self.options
 
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._column = None
+
     def __str__(self):
         return '{}:{}:{} '.format(self.pk, self.title, self.type)
 
     def cast_data(self, geos_names={}, geos_codes={}):
         """
-        Returns processed, invalid and empty values corresponding to the fields
+        Returns column with processed, invalid and empty values corresponding to the field
         after trying to cast
         """
         type = self.type
         options = self.options
 
         cast_func = get_cast_function(type, geos_names, geos_codes)
+        processed_getter = self.PROCESSED_VALUE_GETTERS.get(type)
+
+        column, casted_values = self.column.cast(type, cast_func, self.options, processed_getter)
 
-        values = self.data
-        regions = {}
-
-        # Now iterate through every item to find empty/invalid values
-        for i, value in enumerate(values):
-            val = value['value']
-
-            value.pop('invalid', None)
-            value.pop('empty', None)
-            value.pop('processed_value', None)
-
-            if val is None or val == '':
-                value['empty'] = True
-                continue
-            casted = cast_func(val, **self.options)
-
-            if casted is None:
-                value['invalid'] = True
-            elif type == Field.GEO:
-                value['processed_value'] = casted['id']
-                regions[casted['region']] = casted['region_title']
-            elif type == Field.NUMBER:
-                value['processed_value'] = casted[0]  # (number, separator)
-            elif type == Field.DATETIME:
-                value['processed_value'] = casted.isoformat()  # (parsed_date)
-
-        if type == Field.GEO and regions:
-            options['regions'] = [
-                {'id': k, 'title': v} for k, v in regions.items()
-            ]
+        if type == Field.GEO:
+            regions = {
+                casted['region']: casted['region_title']
+                for casted in casted_values.values()
+                if casted is not None
+            }
+            if regions:
+                options['regions'] = [
+                    {'id': k, 'title': v} for k, v in regions.items()
+                ]
 
         return {
-            'values': values,
+            'column': column,
             'options': options
         }
 
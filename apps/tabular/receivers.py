@@ -2,7 +2,7 @@ from django.db import models
 from django.dispatch import receiver
 
 from tabular.models import Field
-from tabular.utils import get_geos_dict, get_geos_codes_from_geos_names
+from tabular.utils import get_project_geos
 
 
 @receiver(models.signals.pre_save, sender=Field)
@@ -21,11 +21,10 @@ def on_field_saved(sender, **kwargs):
 
     geos_names = geos_codes = {}
     if field.type == Field.GEO:
-        geos_names = get_geos_dict(field.sheet.book.project)
-        geos_codes = get_geos_codes_from_geos_names(geos_names)
+        geos_names, geos_codes = get_project_geos(field.sheet.book.project)
     cast_info = field.cast_data(geos_names, geos_codes)
 
-    field.data = cast_info['values']
+    field.column = cast_info['column']
 
     field.options = cast_info['options']
     # But don't save here, will cause recursion
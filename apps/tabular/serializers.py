@@ -52,11 +52,13 @@ class FieldSerializer(
         serializers.ModelSerializer
 ):
     geodata = serializers.SerializerMethodField()
+    # NOTE: Column data is only converted to old JSON shape here
+    data = serializers.ListField(read_only=True)
 
     class Meta:
         model = Field
         ref_name = 'TabularFieldSerializer'
-        exclude = ('sheet', 'cache',)
+        exclude = ('sheet', 'cache', 'column_data',)
 
     def get_geodata(self, obj):
         if obj.type == Field.GEO and hasattr(obj, 'geodata'):
@@ -74,16 +76,19 @@ class FieldSerializer(
 
 class FieldMetaSerializer(FieldSerializer):
     geodata = None
+    data = None
 
     class Meta:
         model = Field
-        exclude = ('sheet', 'data', 'cache',)
+        exclude = ('sheet', 'cache', 'column_data',)
 
 
 class FieldProcessedOnlySerializer(FieldSerializer):
+    data = None
+
     class Meta:
         model = Field
-        exclude = ('data',)
+        exclude = ('column_data',)
 
 
 class SheetSerializer(
@@ -3,10 +3,9 @@ import logging
 
 from celery import shared_task
 from redis_store import redis
-from django.db import transaction
-from django.contrib.postgres import search
+from django.db import transaction, connection
 
-from geo.models import models, GeoArea
+from geo.models import GeoArea
 
 from utils.common import redis_lock, LogTime
 
@@ -17,9 +16,8 @@ from .viz.renderer import (
     render_field_chart,
 )
 from .utils import (
-    get_geos_dict,
+    get_project_geos,
     sample_and_detect_type_and_options,
-    get_geos_codes_from_geos_names,
 )
 
 logger = logging.getLogger(__name__)
@@ -27,6 +25,8 @@ logger = logging.getLogger(__name__)
 AUTO_DETECT_THRESHOLD = 0.8
 # Means, 80% of entries in a column should be of same type in order for column
 # to be of that type
+GEO_MATCH_SIMILARITY_THRESHOLD = 0.2
+GEO_MATCH_BATCH_SIZE = 1000
 
 
 def _tabular_extract_book(book):
@@ -44,12 +44,7 @@ def _tabular_extract_book(book):
 
 @LogTime()
 def auto_detect_and_update_fields(book):
-    # TODO: Find some ways to lazily calculate geos_names, geos_codes
-    geos_names = get_geos_dict(book.project)
-    geos_codes = get_geos_codes_from_geos_names(geos_names)
-
-    def isValueNotEmpty(v):
-        return v.get('value')
+    geos_names, geos_codes = get_project_geos(book.project)
 
     generate_column_columns = []
 
@@ -60,8 +55,7 @@ def auto_detect_and_update_fields(book):
             row_index = sheet.data_row_index
 
             for field in fields:
-                data = field.data[row_index:]
-                emptyFiltered = list(filter(isValueNotEmpty, data))
+                emptyFiltered = [value for value in field.column.values[row_index:] if value]
                 detected_info = sample_and_detect_type_and_options(
                     emptyFiltered, geos_names, geos_codes
                 )
@@ -69,7 +63,7 @@ def auto_detect_and_update_fields(book):
                 field.options = detected_info['options']
 
                 cast_info = field.cast_data(geos_names, geos_codes)
-                field.data = cast_info['values']
+                field.column = cast_info['column']
                 field.options = cast_info['options']
 
                 field.cache = {
@@ -85,13 +79,52 @@ def auto_detect_and_update_fields(book):
     tabular_generate_columns_image.s(generate_column_columns).delay()
 
 
+def get_similar_geoareas(project_geoareas, queries, is_code=False):
+    """
+    Returns {query: [{'id', 'similarity'}, ...]} (Most similar first) for distinct queries
+    using set-based queries (one per GEO_MATCH_BATCH_SIZE queries)
+    """
+    similar_areas = {query: [] for query in queries}
+    queries = [query for query in similar_areas if query is not None]
+    if is_code:
+        for batch_index in range(0, len(queries), GEO_MATCH_BATCH_SIZE):
+            batch = queries[batch_index:batch_index + GEO_MATCH_BATCH_SIZE]
+            for geoarea_id, code in project_geoareas.filter(code__in=batch).values_list('id', 'code'):
+                similar_areas[code].append({
+                    'id': geoarea_id,
+                    'similarity': 1.0,
+                })
+        return similar_areas
+
+    geoareas_id = list(project_geoareas.values_list('id', flat=True))
+    if not geoareas_id:
+        return similar_areas
+    # Same as TrigramSimilarity('title', query) > 0.2 for each query
+    sql = f'''
+        SELECT q.value, g.id, similarity(g.title, q.value) AS similarity
+        FROM unnest(%s::text[]) AS q(value)
+        JOIN "{GeoArea._meta.db_table}" AS g ON g.id = ANY(%s)
+        WHERE similarity(g.title, q.value) > {GEO_MATCH_SIMILARITY_THRESHOLD}
+        ORDER BY q.value, similarity DESC, g.id
+    '''
+    with connection.cursor() as cursor:
+        for batch_index in range(0, len(queries), GEO_MATCH_BATCH_SIZE):
+            batch = queries[batch_index:batch_index + GEO_MATCH_BATCH_SIZE]
+            cursor.execute(sql, [batch, geoareas_id])
+            for query, geoarea_id, similarity in cursor.fetchall():
+                similar_areas[query].append({
+                    'id': geoarea_id,
+                    'similarity': similarity,
+                })
+    return similar_areas
+
+
 def _tabular_meta_extract_geo(geodata):
     field = geodata.field
     project = field.sheet.book.project
     project_geoareas = GeoArea.objects.filter(
         admin_level__region__project=project
     )
-    geodata_data = []
 
     is_code = field.get_option('geo_type', 'name') == 'code'
     admin_level = field.get_option('admin_level')
@@ -100,27 +133,19 @@ def _tabular_meta_extract_geo(geodata):
             admin_level__level=admin_level
         )
 
-    for row in geodata.field.sheet.data:
-        similar_areas = []
-        query = row.get(str(field.pk))
-
-        if is_code:
-            geoareas = project_geoareas.filter(code=query).annotate(
-                similarity=models.Value(1, models.FloatField()),
-            )
-        else:
-            geoareas = project_geoareas.annotate(
-                similarity=search.TrigramSimilarity('title', query),
-            ).filter(similarity__gt=0.2).order_by('-similarity')
-
-        for geoarea in geoareas:
-            similar_areas.append({
-                'id': geoarea.pk,
-                'similarity': geoarea.similarity,
-            })
+    rows_query = [
+        None if value is None else str(value)
+        for value in field.column.values[field.sheet.data_row_index:]
+    ]
+    # Each distinct value is only matched once
+    similar_areas_by_query = get_similar_geoareas(project_geoareas, set(rows_query), is_code=is_code)
+
+    geodata_data = []
+    for query in rows_query:
+        similar_areas = similar_areas_by_query[query]
         geodata_data.append({
             'similar_areas': similar_areas,
-            'selected_id': geoareas.first().pk if geoareas.exists() else None,
+            'selected_id': similar_areas[0]['id'] if similar_areas else None,
         })
     geodata.data = geodata_data
     geodata.save()
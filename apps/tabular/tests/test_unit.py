@@ -1,4 +1,6 @@
+import io
 import os
+import csv as pycsv
 from autofixture.base import AutoFixture
 from tempfile import NamedTemporaryFile
 
@@ -9,14 +11,17 @@ from gallery.models import File
 from geo.models import GeoArea, Region, AdminLevel
 from project.models import Project
 
-from tabular.tasks import auto_detect_and_update_fields
+from tabular.tasks import auto_detect_and_update_fields, _tabular_meta_extract_geo
 from tabular.extractor import csv
-from tabular.models import Book, Field, Sheet
+from tabular.models import Book, Field, Sheet, Geodata
+from tabular.columnar import ColumnData
 from tabular.utils import (
+    parse_none_separated,
     parse_comma_separated,
     parse_dot_separated,
     parse_space_separated,
     auto_detect_datetime,
+    get_project_geos,
 )
 
 consistent_csv_data = '''id,age,name,date,place
@@ -262,6 +267,38 @@ class TestTabularExtraction(TestCase):
                 or v.get('invalid') \
                 or v['processed_value'] == kathmandu_geo.id
 
+    def test_extract_geo(self):
+        """
+        Testing geodata generation (similar areas by row)
+        """
+        book = self.initialize_data_and_basic_test(geo_data_type_name)
+        auto_detect_and_update_fields(book)
+
+        field = Field.objects.get(sheet__book=book, title='place')
+        geodata = Geodata.objects.create(field=field)
+        assert _tabular_meta_extract_geo(geodata) is True
+
+        geodata.refresh_from_db()
+        assert len(geodata.data) == 6
+        for datum in geodata.data[:5]:
+            assert datum['selected_id'] == self.geo.pk
+            assert datum['similar_areas'][0]['id'] == self.geo.pk
+        # Empty cell
+        assert geodata.data[5] == {'similar_areas': [], 'selected_id': None}
+
+    def test_project_geos_cache(self):
+        geos_names, geos_codes = get_project_geos(self.project)
+        assert geos_names[1]['kathmandu']['id'] == self.geo.pk
+        assert geos_codes[1]['kat']['id'] == self.geo.pk
+
+        new_geo = GeoArea.objects.create(admin_level=self.admin1, title='Lalitpur', code='LAT')
+        # Cached until region cache is re-calculated
+        geos_names, _ = get_project_geos(self.project)
+        assert 'lalitpur' not in geos_names[1]
+        self.region.calc_cache()
+        geos_names, _ = get_project_geos(self.project)
+        assert geos_names[1]['lalitpur']['id'] == new_geo.pk
+
     def test_sheet_data_change_on_datefield_change_to_string(self):
         """
         Update value type in sheet data rows when field type changed
@@ -510,3 +547,34 @@ def test_parse_date():
 
     assert auto_detect_datetime('2019-December-15') is not None
     assert auto_detect_datetime('2019 October 15') is not None
+
+
+def test_column_data():
+    column = ColumnData.from_values(['id', '1', '2', 'x', '', None, '2'])
+    assert list(column.empty) == [False, False, False, False, False, True, False]
+
+    casted_column, _ = column.cast(
+        Field.NUMBER, lambda value, **_: parse_none_separated(value), {}, Field.PROCESSED_VALUE_GETTERS[Field.NUMBER],
+    )
+    # Serialization should keep everything
+    casted_column = ColumnData.from_bytes(casted_column.to_bytes())
+    assert casted_column.to_json(start=1) == [
+        {'value': '1', 'invalid': False, 'empty': False, 'processed_value': 1.0},
+        {'value': '2', 'invalid': False, 'empty': False, 'processed_value': 2.0},
+        {'value': 'x', 'invalid': True, 'empty': False},
+        {'value': '', 'invalid': False, 'empty': True},
+        {'value': None, 'invalid': False, 'empty': True},
+        {'value': '2', 'invalid': False, 'empty': False, 'processed_value': 2.0},
+    ]
+    assert list(casted_column.get_valid_values(True, start=1)) == [1.0, 2.0, 2.0]
+    assert casted_column.get_display_values(start=1) == [1.0, 2.0, 'x', '', None, 2.0]
+    # Old JSON shape can be converted back
+    assert ColumnData.from_json(casted_column.to_json(), Field.NUMBER).to_json() == casted_column.to_json()
+
+
+def test_csv_iter_decoded_lines():
+    text = 'id,name,"multi\nline"\r\n1,Kathmandu,ä\n\n2,Central,ö'
+    expected_rows = list(pycsv.reader(io.StringIO(text)))
+    for encoding in ['utf-8', 'utf-8-sig', 'utf-16']:
+        lines = csv.iter_decoded_lines(io.BytesIO(text.encode(encoding)), chunk_size=3)
+        assert list(pycsv.reader(lines)) == expected_rows
@@ -1,10 +1,16 @@
 import re
 import random
 from datetime import datetime
+from django.core.cache import cache
+
+from deep.caches import CacheKey, CacheHelper
 from geo.models import GeoArea
 
 from utils.common import calculate_sample_size, get_max_occurence_and_count
 
+# Project geos are refreshed whenever project's regions (or their cache_index) change
+PROJECT_GEOS_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 DATE_FORMATS = [
     '%m-%d-%Y',
@@ -163,32 +169,55 @@ def get_geos_dict(project=None, **kwargs):
     return admin_levels_areas
 
 
+def get_project_geos(project):
+    """
+    Returns (geos_names, geos_codes) for the project.
+    Cached using project's regions cache_index, which is incremented by Region.calc_cache
+    """
+    if project is None:
+        return {}, {}
+    regions_cache_index = list(
+        project.regions.order_by('id').values_list('id', 'cache_index')
+    )
+    cache_key = CacheKey.TABULAR_PROJECT_GEOS_KEY_FORMAT.format(
+        project_id=project.pk,
+        regions_hash=CacheHelper.calculate_md5_str(str(regions_cache_index).encode('utf-8')),
+    )
+
+    def _get_project_geos():
+        geos_names = get_geos_dict(project)
+        return geos_names, get_geos_codes_from_geos_names(geos_names)
+
+    return cache.get_or_set(cache_key, _get_project_geos, PROJECT_GEOS_CACHE_TIMEOUT)
+
+
+def _get_geos_by_level(geos_by_level, admin_level):
+    if admin_level is not None:
+        geos = geos_by_level.get(admin_level)
+        return [geos] if geos else []
+    return geos_by_level.values()
+
+
 def parse_geo(value, geos_names={}, geos_codes={}, **kwargs):
     val = str(value).lower()
     admin_level = kwargs.get('admin_level')
 
-    name_matched = None
-    for level, geos in geos_names.items():
+    for geos in _get_geos_by_level(geos_names, admin_level):
         name_matched = geos.get(val)
-        if admin_level is not None and admin_level != level:
-            name_matched = None
         if name_matched:
-            break
-
-    if name_matched:
-        return {**name_matched, 'geo_type': 'name'}
+            return {**name_matched, 'geo_type': 'name'}
 
-    code_matched = None
-    for level, geos in geos_codes.items():
+    for geos in _get_geos_by_level(geos_codes, admin_level):
         code_matched = geos.get(val)
-        if admin_level is not None and admin_level != level:
-            code_matched = None
         if code_matched:
-            break
-    return code_matched and {**code_matched, 'geo_type': 'code'}
+            return {**code_matched, 'geo_type': 'code'}
+    return None
 
 
 def sample_and_detect_type_and_options(values, geos_names={}, geos_codes={}):
+    """
+    values: non empty raw values of the column
+    """
     # Importing here coz this is util and might be imported in models
     from .models import Field  # noqa
 
@@ -210,8 +239,7 @@ def sample_and_detect_type_and_options(values, geos_names={}, geos_codes={}):
     date_options = []
     number_options = []
 
-    for sample in samples:
-        value = sample['value']
+    for value in samples:
         number_parsed = parse_number(value)
         if number_parsed:
             types.append(Field.NUMBER)
@@ -2,6 +2,7 @@ import os
 import logging
 from datetime import datetime
 
+import numpy as np
 from django.conf import settings
 
 from deep.documents_types import CHART_IMAGE_MIME
@@ -59,52 +60,49 @@ def get_val_column(field):
     return 'value'
 
 
-def clean_real_data(data, val_column):
+def get_clean_values(field, val_column):
     """
-    Return clean_dataframe, original_dataframe
+    Return numpy array of non empty/invalid values of the field
     """
-    # NOTE: The folloing loop adds the keys empty and invalid if not present
-    # TODO: Handle the following case from pandas itself
-    formatted_data = []
-    for datum in data:
-        formatted_data.append({
-            **datum,
-            'empty': datum.get('empty', False),
-            'invalid': datum.get('invalid', False),
-        })
-
-    df = pd.DataFrame(formatted_data)
-
-    if df.empty:
-        return df, df
-
-    filterd_df = df[~(df['empty'] == True) & ~(df['invalid'] == True)]  # noqa
-    return filterd_df, df
+    return field.column.get_valid_values(
+        val_column == 'processed_value',
+        start=field.sheet.data_row_index,
+    )
 
 
 def calc_data(field):
     val_column = get_val_column(field)
+    column = field.column
+    row_index = field.sheet.data_row_index
 
-    data, df = clean_real_data(field.actual_data, val_column)
-
-    if data.empty:
+    if len(column) <= row_index or not column.get_valid_mask(row_index).any():
         logger.warning('Empty DataFrame: no numeric data to calculate for field ({})'.format(field.pk))
         return [], {}
 
-    if val_column not in data.columns:
+    if val_column == 'processed_value' and column.processed is None:
         logger.warning('{} not present in field ({})'.format(val_column, field.pk))
         return None, {}
 
-    data = data.groupby(val_column).count()['empty'].sort_values().to_frame()
-    data = data.rename(columns={'empty': 'count', val_column: 'value'})
-
-    data['value'] = data.index
+    values = get_clean_values(field, val_column)
+    if val_column == 'value':
+        # Raw values can be of mixed types
+        values = values.astype(str)
+    unique_values, counts = np.unique(values, return_counts=True)
+    # Ascending order by count
+    order = np.argsort(counts, kind='stable')
+    series = [
+        {
+            'count': int(counts[index]),
+            'value': unique_values[index].item(),
+        }
+        for index in order
+    ]
     health_stats = {
-        'empty': int(df[df['empty'] == True]['empty'].count()), # noqa
-        'invalid': int(df[df['invalid'] == True]['invalid'].count()), # noqa
-        'total': len(df.index),
+        'empty': int(column.empty[row_index:].sum()),
+        'invalid': int(column.invalid[row_index:].sum()),
+        'total': len(column) - row_index,
     }
-    return data.to_dict(orient='records'), health_stats
+    return series, health_stats
 
 
 def generate_chart(field, chart_type, images_format=['svg']):
@@ -143,12 +141,11 @@ def generate_chart(field, chart_type, images_format=['svg']):
                 params['x_params']['tickvals'] = df['value']
 
     else:
-        val_column = get_val_column(field)
-        df, _ = clean_real_data(field.actual_data, val_column)
+        values = get_clean_values(field, get_val_column(field))
         if chart_type == HISTOGRAM:
-            params['data'] = pd.to_numeric(df[val_column])
+            params['data'] = pd.to_numeric(pd.Series(values))
         elif chart_type == WORDCLOUD:
-            params['data'] = ' '.join(df[val_column].values)
+            params['data'] = ' '.join(values.astype(str))
 
     if isinstance(params['data'], pd.DataFrame) and params['data'].empty:
         logger.warning('Empty DataFrame: no numeric data to plot for field ({})'.format(field.pk))
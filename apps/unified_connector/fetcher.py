@@ -0,0 +1,80 @@
+import copy
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+# Sources fetched at once
+MAX_WORKERS = 8
+# Sources fetched at once from same host (Eg: multiple RSS feeds from same site)
+MAX_CONCURRENT_FETCH_PER_HOST = 2
+
+
+class SourceFetch():
+    """
+    Network fetch result of a ConnectorSource (See Source.fetch)
+    """
+    def __init__(self, source):
+        self.source = source
+        self.params = copy.deepcopy(source.params)
+        self.leads_data = []
+        self.total_count = 0
+        self.error = None
+        self.start_date = None
+        self.end_date = None
+        # NOTE: Initialized in the caller thread as some fetchers use database on init (Eg: EMM)
+        self.source_fetcher = None
+        try:
+            self.source_fetcher = source.source_fetcher()
+        except Exception as e:
+            logger.error(f'Failed to initialize source: {source}', exc_info=True)
+            self.error = e
+
+    @property
+    def host(self):
+        feed_url = (self.params or {}).get('feed-url')
+        if feed_url:
+            return urlparse(feed_url).netloc
+        return self.source.source
+
+    def fetch(self):
+        self.start_date = timezone.now()
+        try:
+            self.leads_data, self.total_count = self.source_fetcher.fetch(copy.deepcopy(self.params))
+        except Exception as e:
+            logger.error(f'Failed to fetch source: {self.source}', exc_info=True)
+            self.error = e
+        self.end_date = timezone.now()
+        return self
+
+
+def fetch_sources(sources):
+    """
+    Fetch sources concurrently with per host concurrency limit.
+    Only the network part (Source.fetch) runs in the threads, leads are generated by the caller.
+    Returns list of SourceFetch (same order as sources)
+    """
+    source_fetches = [SourceFetch(source) for source in sources]
+    pending_source_fetches = [
+        source_fetch
+        for source_fetch in source_fetches
+        if source_fetch.error is None
+    ]
+    # Created here to avoid race in threads
+    host_semaphores = {
+        host: threading.BoundedSemaphore(MAX_CONCURRENT_FETCH_PER_HOST)
+        for host in set(source_fetch.host for source_fetch in pending_source_fetches)
+    }
+
+    def _fetch(source_fetch):
+        with host_semaphores[source_fetch.host]:
+            return source_fetch.fetch()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(_fetch, pending_source_fetches))
+    return source_fetches
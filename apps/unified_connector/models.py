@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Union, List
 
 from django.db import models
 from django.db import transaction
@@ -72,6 +72,48 @@ class ConnectorLead(models.Model):
             instance.authors.set(authors)
         return instance, True
 
+    @classmethod
+    def get_or_create_from_leads(cls, leads: List[Lead]) -> List['ConnectorLead']:
+        """
+        Bulk version of get_or_create_from_lead.
+        Returns connector leads in the same order as leads (Same url returns same connector lead)
+        """
+        urls = set(lead.url for lead in leads)
+        connector_lead_by_url = {
+            connector_lead.url: connector_lead
+            for connector_lead in cls.objects.filter(url__in=urls)
+        }
+        new_leads_by_url = {}
+        for lead in leads:
+            if lead.url not in connector_lead_by_url and lead.url not in new_leads_by_url:
+                new_leads_by_url[lead.url] = lead
+        if new_leads_by_url:
+            # NOTE: ignore_conflicts for leads created by other processes in the meantime
+            cls.objects.bulk_create([
+                cls(
+                    url=lead.url,
+                    title=lead.title,
+                    published_on=lead.published_on,
+                    source_raw=lead.source_raw or '',
+                    author_raw=lead.author_raw or '',
+                    source=lead.source,
+                )
+                for lead in new_leads_by_url.values()
+            ], ignore_conflicts=True)
+            # bulk_create doesn't return pk with ignore_conflicts
+            new_connector_leads = list(cls.objects.filter(url__in=new_leads_by_url.keys()))
+            # NOTE: Custom attributes from connector
+            cls.authors.through.objects.bulk_create([
+                cls.authors.through(connectorlead=connector_lead, organization=author)
+                for connector_lead in new_connector_leads
+                for author in (getattr(new_leads_by_url[connector_lead.url], '_authors', None) or [])
+            ], ignore_conflicts=True)
+            connector_lead_by_url.update({
+                connector_lead.url: connector_lead
+                for connector_lead in new_connector_leads
+            })
+        return [connector_lead_by_url[lead.url] for lead in leads]
+
     def update_extraction_status(self, new_status, commit=True):
         self.extraction_status = new_status
         if commit:
@@ -194,6 +236,32 @@ class ConnectorSource(UserResource):
             **kwargs,
         )
 
+    def add_leads(self, leads: List[ConnectorLead]):
+        """
+        Bulk version of add_lead, leads already added to the source are skipped.
+        """
+        current_leads_id = set(self.source_leads.values_list('connector_lead_id', flat=True))
+        new_leads = {
+            lead.pk: lead
+            for lead in leads
+            if lead.pk not in current_leads_id
+        }.values()
+        if not new_leads:
+            return []
+        already_added_urls = set(
+            self.unified_connector.project.lead_set.filter(
+                url__in=[lead.url for lead in new_leads],
+            ).values_list('url', flat=True)
+        )
+        return ConnectorSourceLead.objects.bulk_create([
+            ConnectorSourceLead(
+                connector_lead=lead,
+                source=self,
+                already_added=lead.url in already_added_urls,
+            )
+            for lead in new_leads
+        ])
+
     def save(self, *args, **kwargs):
         params_changed = (
             self.old_params != self.params and
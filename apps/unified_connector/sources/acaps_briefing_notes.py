@@ -139,7 +139,7 @@ class AcapsBriefingNotes(Source):
     ]
 
     def get_content(self, url, params):
-        resp = requests.get(url, params=params)
+        resp = requests.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
         return resp.text
 
     def fetch(self, params):
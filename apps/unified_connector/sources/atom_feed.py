@@ -15,7 +15,7 @@ class AtomFeed(RssFeed):
     key = 'atom-feed'
 
     def get_content(self, url, params):
-        resp = requests.get(url)
+        resp = requests.get(url, timeout=self.REQUEST_TIMEOUT)
         return resp.content
 
     def query_fields(self, params):
@@ -19,8 +19,8 @@ class OrganizationSearch():
         self.creator = creator
         self.fetch(texts)
 
-    def create_organization(self, text):
-        return Organization.objects.create(
+    def get_new_organization(self, text):
+        return Organization(
             title=text,
             short_name=text,
             long_name=text,
@@ -57,10 +57,14 @@ class OrganizationSearch():
         }
 
         # For remaining organizations
+        new_organizations = {}
         for label, org_text in text_queries:
-            if org_text in organization_map:
+            if org_text in organization_map or org_text in new_organizations:
                 continue
-            organization_map[org_text] = self.create_organization(label)
+            new_organizations[org_text] = self.get_new_organization(label)
+        if new_organizations:
+            Organization.objects.bulk_create(new_organizations.values())
+            organization_map.update(new_organizations)
 
         self.organization_map = organization_map
         return self.organization_map
@@ -72,6 +76,8 @@ class OrganizationSearch():
 
 class Source(ABC):
     DEFAULT_PER_PAGE = 25
+    # Timeout (seconds) for each request to the source
+    REQUEST_TIMEOUT = 60
     UNIFIED_CONNECTOR_SOURCE_MAX_PAGE_NUMBER = 100
 
     def __init__(self):
@@ -87,6 +93,13 @@ class Source(ABC):
         return [], 0
 
     def get_leads(self, params, request_user) -> Tuple[List[Lead], int]:
+        leads_data, total_count = self.fetch(copy.deepcopy(params))
+        return self.get_leads_from_data(leads_data, total_count, request_user)
+
+    def get_leads_from_data(self, leads_data, total_count, request_user) -> Tuple[List[Lead], int]:
+        """
+        Generate leads from already fetched data (See fetch)
+        """
         def _parse_date(date_raw) -> Union[None, datetime.date]:
             if isinstance(date_raw, datetime.date):
                 return date_raw
@@ -97,7 +110,6 @@ class Source(ABC):
                 if published_on:
                     return published_on.date()
 
-        leads_data, total_count = self.fetch(copy.deepcopy(params))
         if not leads_data:
             return [], total_count
 
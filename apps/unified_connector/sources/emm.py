@@ -92,7 +92,7 @@ class EMM(RssFeed):
         return real_fields
 
     def get_content(self, url, params):
-        resp = requests.get(url)
+        resp = requests.get(url, timeout=self.REQUEST_TIMEOUT)
         return resp.content
 
     def fetch(self, params):
@@ -122,7 +122,6 @@ class EMM(RssFeed):
 
         total_count = len(items)
 
-        entities = {}
         leads_infos = []  # Contains kwargs dict
         for item in items:
             # Extract info from item
@@ -131,26 +130,34 @@ class EMM(RssFeed):
             item_entities = lead_info.pop('entities', {})
             item_triggers = lead_info.pop('triggers', [])
 
-            entities.update(item_entities)
-
             leads_infos.append({
                 'id': random_key(),
                 'source_type': Lead.SourceType.EMM,
                 'emm_triggers': [LeadEMMTrigger(**x) for x in item_triggers],
-                'emm_entities': item_entities,
+                # NOTE: Only names here, EMMEntity are resolved in get_leads_from_data (fetch can run in a thread)
+                'emm_entities': list(item_entities.values()),
                 **lead_info,
             })
 
+        return leads_infos, total_count
+
+    def get_leads_from_data(self, leads_data, total_count, request_user):
         # Get or create EMM entities
+        entities = {}
         with transaction.atomic():
-            for eid, val in entities.items():
-                obj, _ = EMMEntity.objects.get_or_create(name=val)
-                entities[eid] = obj
-
-        for leadinfo in leads_infos:
-            leadinfo['emm_entities'] = [entities[eid] for eid, _ in leadinfo['emm_entities'].items()]
-
-        return leads_infos, total_count
+            for ldata in leads_data:
+                for name in ldata['emm_entities']:
+                    if name not in entities:
+                        entities[name], _ = EMMEntity.objects.get_or_create(name=name)
+
+        leads_data = [
+            {
+                **ldata,
+                'emm_entities': [entities[name] for name in ldata['emm_entities']],
+            }
+            for ldata in leads_data
+        ]
+        return super().get_leads_from_data(leads_data, total_count, request_user)
 
     def parse_emm_item(self, item):
         info = {}
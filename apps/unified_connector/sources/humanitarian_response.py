@@ -177,7 +177,7 @@ class HumanitarianResponse(Source):
     ]
 
     def get_content(self, url, params):
-        resp = requests.get(url, params={})
+        resp = requests.get(url, params={}, timeout=self.REQUEST_TIMEOUT)
         return resp.text
 
     def fetch(self, params):
@@ -85,7 +85,7 @@ class PDNA(Source):
     ]
 
     def get_content(self, url, params):
-        resp = requests.get(url)
+        resp = requests.get(url, timeout=self.REQUEST_TIMEOUT)
         return resp.text
 
     def fetch(self, params):
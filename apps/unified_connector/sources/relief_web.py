@@ -312,7 +312,7 @@ class ReliefWeb(Source):
     ]
 
     def get_content(self, url, params):
-        resp = requests.post(url, json=params)
+        resp = requests.post(url, json=params, timeout=self.REQUEST_TIMEOUT)
         return resp.text
 
     def parse_filter_params(self, params):
@@ -69,7 +69,7 @@ class ResearchResourceCenter(Source):
     ]
 
     def get_content(self, url, params):
-        resp = requests.get(self.URL, params=params)
+        resp = requests.get(self.URL, params=params, timeout=self.REQUEST_TIMEOUT)
         return resp.text
 
     def fetch(self, params):
@@ -70,7 +70,7 @@ class RssFeed(Source):
     dynamic_fields = [1, 2, 3, 4, 5]
 
     def get_content(self, url, params):
-        resp = requests.get(url, headers=DEFAULT_HEADERS)
+        resp = requests.get(url, headers=DEFAULT_HEADERS, timeout=self.REQUEST_TIMEOUT)
         return resp.content
 
     def query_fields(self, params):
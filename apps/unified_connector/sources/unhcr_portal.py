@@ -255,7 +255,7 @@ class UNHCRPortal(Source):
     }
 
     def get_content(self, url, params):
-        return requests.get(url, params=params).text
+        return requests.get(url, params=params, timeout=self.REQUEST_TIMEOUT).text
 
     def fetch(self, params):
         results = []
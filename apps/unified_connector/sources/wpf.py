@@ -158,7 +158,7 @@ class WorldFoodProgramme(Source):
     ]
 
     def get_content(self, url, params):
-        resp = requests.get(self.URL, params=params)
+        resp = requests.get(self.URL, params=params, timeout=self.REQUEST_TIMEOUT)
         return resp.text
 
     def fetch(self, params):
@@ -26,6 +26,17 @@ def process_unified_connector(_id):
         logger.error('Unified connector process failed', exc_info=True)
 
 
+@shared_task
+def ingest_connector_lead_preview_attachments(connector_lead_id, images_uri, table_uri):
+    connector_lead = ConnectorLead.objects.filter(pk=connector_lead_id).first()
+    if connector_lead is None:
+        return
+    try:
+        return UnifiedConnectorLeadHandler.save_preview_attachments(connector_lead, images_uri, table_uri)
+    except Exception:
+        logger.error('Connector lead preview attachments ingestion failed', exc_info=True)
+
+
 @shared_task
 @redis_lock('retry_connector_leads', 60 * 60 * 0.5)
 def retry_connector_leads():
@@ -49,13 +60,12 @@ def trigger_connector_sources(max_execution_time, threshold, limit):
         last_fetched_at__lte=timezone.now() - threshold,
     ).order_by('execution_time')
 
-    processed_unified_connectors = set()
-    for source in sources_qs.all()[:limit]:
-        try:
-            UnifiedConnectorLeadHandler.process_unified_connector_source(source)
-            processed_unified_connectors.add(source.unified_connector_id)
-        except Exception:
-            logger.error('Failed to trigger connector source', exc_info=True)
+    sources = list(sources_qs.all()[:limit])
+    try:
+        UnifiedConnectorLeadHandler.process_unified_connector_sources(sources)
+    except Exception:
+        logger.error('Failed to trigger connector sources', exc_info=True)
+    processed_unified_connectors = set(source.unified_connector_id for source in sources)
     # Trigger connector leads
     for unified_connector_id in processed_unified_connectors:
         UnifiedConnectorLeadHandler.send_trigger_request_to_extractor(
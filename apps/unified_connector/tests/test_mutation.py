@@ -14,7 +14,9 @@ from unified_connector.models import (
     ConnectorSource,
     ConnectorLeadPreviewAttachment
 )
-from deepl_integration.handlers import UnifiedConnectorLeadHandler
+from deepl_integration.handlers import LeadExtractionHandler, UnifiedConnectorLeadHandler
+from lead.factories import LeadFactory
+from lead.models import LeadPreviewAttachment
 from deepl_integration.serializers import DeeplServerBaseCallbackSerializer
 from unified_connector.factories import (
     ConnectorLeadFactory,
@@ -557,7 +559,8 @@ class UnifiedConnectorCallbackApiTest(TestCase):
         _check_connector_lead_status(connector_lead2, ConnectorLead.ExtractionStatus.PENDING)
 
         data['client_id'] = UnifiedConnectorLeadHandler.get_client_id(connector_lead2)
-        response = self.client.post(url, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
         self.assert_200(response)
         connector_lead2.refresh_from_db()
         _check_connector_lead_status(connector_lead2, ConnectorLead.ExtractionStatus.SUCCESS)
@@ -572,3 +575,42 @@ class UnifiedConnectorCallbackApiTest(TestCase):
         self.assertEqual(connector_lead2.simplified_text, SAMPLE_SIMPLIFIED_TEXT)
         self.assertEqual(preview_attachment_qs.count(), 2)
         self.assertIsNotNone(preview_attachment and preview_attachment.file)
+
+    def test_save_lead_data_using_connector_lead(self):
+        connector_lead = ConnectorLeadFactory.create(extraction_status=ConnectorLead.ExtractionStatus.SUCCESS)
+        image_attachment = ConnectorLeadPreviewAttachment(
+            connector_lead=connector_lead,
+            order=1,
+            type=ConnectorLeadPreviewAttachment.ConnectorAttachmentFileType.IMAGE,
+        )
+        image_attachment.file.save('image.png', SimpleUploadedFile(name='image.png', content=b'image'), save=False)
+        image_attachment.file_preview = image_attachment.file
+        image_attachment.save()
+        table_attachment = ConnectorLeadPreviewAttachment(connector_lead=connector_lead, order=2)
+        table_attachment.file.save('table.xlsx', SimpleUploadedFile(name='table.xlsx', content=b'table'), save=False)
+        table_attachment.file_preview.save(
+            'table.png', SimpleUploadedFile(name='table.png', content=b'table-preview'), save=False,
+        )
+        table_attachment.save()
+
+        lead = LeadFactory.create()
+        assert LeadExtractionHandler.save_lead_data_using_connector_lead(lead, connector_lead)
+        lead_attachments = list(LeadPreviewAttachment.objects.filter(lead=lead).order_by('order'))
+        self.assertEqual(
+            [
+                (
+                    attachment.type,
+                    attachment.file.name.startswith('lead-preview/attachments/'),
+                    attachment.file.read(),
+                    attachment.file_preview.read(),
+                )
+                for attachment in lead_attachments
+            ],
+            [
+                (LeadPreviewAttachment.AttachmentFileType.IMAGE, True, b'image', b'image'),
+                (LeadPreviewAttachment.AttachmentFileType.XLSX, True, b'table', b'table-preview'),
+            ],
+        )
+        # Connector lead files are not shared
+        for attachment in lead_attachments:
+            assert attachment.file.name not in [image_attachment.file.name, table_attachment.file.name]
@@ -8,10 +8,12 @@ from unified_connector.factories import (
     ConnectorSourceFactory,
     UnifiedConnectorFactory,
 )
-from unified_connector.models import ConnectorSource
+from unified_connector.models import ConnectorSource, ConnectorLead
 from unified_connector.tests.mock_data.store import ConnectorSourceResponseMock
 from unified_connector.sources.base import OrganizationSearch
+from unified_connector.fetcher import fetch_sources
 from organization.models import Organization
+from lead.models import EMMEntity
 
 
 class TestUnifiedConnectorResponse(GraphQLTestCase):
@@ -58,6 +60,84 @@ class TestUnifiedConnectorResponse(GraphQLTestCase):
         self._connector_response_check(source_type, response_mock)
         response_mock_patch.stop()
 
+    @patch('unified_connector.sources.rss_feed.RssFeed.get_content')
+    @patch('unified_connector.sources.relief_web.ReliefWeb.get_content')
+    def test_fetch_sources(self, relief_web_mock, rss_feed_mock):
+        relief_web_data = ConnectorSourceResponseMock(ConnectorSource.Source.RELIEF_WEB)
+        rss_feed_data = ConnectorSourceResponseMock(ConnectorSource.Source.RSS_FEED)
+        relief_web_mock.side_effect = relief_web_data.get_content_side_effect
+        rss_feed_mock.side_effect = rss_feed_data.get_content_side_effect
+        sources = [
+            ConnectorSourceFactory.create(unified_connector=self.uc, source=source_type, params=mock_data.params)
+            for source_type, mock_data in [
+                (ConnectorSource.Source.RELIEF_WEB, relief_web_data),
+                (ConnectorSource.Source.RSS_FEED, rss_feed_data),
+            ]
+        ]
+        source_fetches = fetch_sources(sources)
+        self.assertEqual([source_fetch.source for source_fetch in source_fetches], sources)
+        for source_fetch, mock_data in zip(source_fetches, [relief_web_data, rss_feed_data]):
+            self.assertIsNone(source_fetch.error)
+            leads_result, count = source_fetch.source_fetcher.get_leads_from_data(
+                source_fetch.leads_data, source_fetch.total_count, None,
+            )
+            self.assertEqual(len(leads_result), count)
+            self._assert_lead_equal_to_expected_data(leads_result, mock_data.expected_data)
+
+        # Failed fetch are returned with error
+        relief_web_mock.side_effect = Exception('Mock error')
+        source_fetch, = fetch_sources(sources[:1])
+        self.assertIsNotNone(source_fetch.error)
+
+    @patch('unified_connector.sources.emm.EMM.get_content')
+    def test_fetch_sources_emm_entities(self, emm_mock):
+        mock_data = ConnectorSourceResponseMock(ConnectorSource.Source.EMM)
+        emm_mock.side_effect = mock_data.get_content_side_effect
+        source = ConnectorSourceFactory.create(
+            unified_connector=self.uc, source=ConnectorSource.Source.EMM, params=mock_data.params,
+        )
+        source_fetch, = fetch_sources([source])
+        self.assertIsNone(source_fetch.error)
+        # EMM entities are not created in the fetch threads
+        self.assertEqual(EMMEntity.objects.count(), 0)
+        entity_names = {
+            name
+            for ldata in source_fetch.leads_data
+            for name in ldata['emm_entities']
+        }
+        self.assertNotEqual(entity_names, set())
+
+        leads, _ = source_fetch.source_fetcher.get_leads_from_data(
+            source_fetch.leads_data, source_fetch.total_count, None,
+        )
+        self.assertEqual(set(EMMEntity.objects.values_list('name', flat=True)), entity_names)
+        self.assertEqual(
+            {entity.name for lead in leads for entity in lead._emm_entities},
+            entity_names,
+        )
+
+    @patch('unified_connector.sources.relief_web.ReliefWeb.get_content')
+    def test_source_bulk_add_leads(self, response_mock):
+        mock_data = ConnectorSourceResponseMock(ConnectorSource.Source.RELIEF_WEB)
+        response_mock.side_effect = mock_data.get_content_side_effect
+        source = ConnectorSourceFactory.create(unified_connector=self.uc, source=ConnectorSource.Source.RELIEF_WEB)
+        leads, _ = source.source_fetcher().get_leads(source.params, None)
+        existing_connector_lead = ConnectorLead.get_or_create_from_lead(leads[0])[0]
+
+        connector_leads = ConnectorLead.get_or_create_from_leads(leads)
+        self.assertEqual([connector_lead.url for connector_lead in connector_leads], [lead.url for lead in leads])
+        self.assertEqual(connector_leads[0], existing_connector_lead)
+        self.assertEqual(ConnectorLead.objects.count(), len(set(lead.url for lead in leads)))
+        for lead, connector_lead in zip(leads, connector_leads):
+            self.assertEqual(
+                set(connector_lead.authors.all()),
+                set(getattr(lead, '_authors', None) or []),
+            )
+
+        source.add_leads(connector_leads[:1])
+        source.add_leads(connector_leads)  # Already added are skipped
+        self.assertEqual(source.source_leads.count(), len(set(connector_leads)))
+
     def test_source_organization(self):
         def _get_orgs(titles):
             qs = Organization.objects.filter(title__in=titles)
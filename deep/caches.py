@@ -27,6 +27,7 @@ class CacheKey:
     GENERIC_EXPORT_TASK_CACHE_KEY_FORMAT = 'GENERIC-EXPORT-{}-TASK-ID'
     PROJECT_EXPLORE_STATS_LOADER_KEY = 'project-explore-stats-loader'
     RECENT_ACTIVITIES_KEY_FORMAT = 'user-recent-activities-{}'
+    TABULAR_PROJECT_GEOS_KEY_FORMAT = 'tabular-project-geos-{project_id}-{regions_hash}'
 
     # Local (RAM) Cache
     TEMP_CLIENT_ID_KEY_FORMAT = 'client-id-mixin-{request_hash}-{instance_type}-{instance_id}'
@@ -489,10 +489,18 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(minute=0, hour='*/6'),
     },
     'project_generate_stats': {
+        # Only for changed projects
         'task': 'project.tasks.generate_project_stats_cache',
         # Every 5 min
         'schedule': crontab(minute="*/5"),
     },
+    'project_generate_stats_all': {
+        # For all projects (Recent activities are changed with time)
+        'task': 'project.tasks.generate_project_stats_cache',
+        'kwargs': {'all_projects': True},
+        # Every day at 00:30
+        'schedule': crontab(minute=30, hour=0),
+    },
     # UNIFIED CONNECTORS
     'schedule_trigger_quick_unified_connectors': {
         'task': 'unified_connector.tasks.schedule_trigger_quick_unified_connectors',
@@ -529,20 +537,32 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'organization.tasks.update_organization_popularity',
         'schedule': crontab(minute=0, hour=0),  # execute every day
     },
+    # Analysis Framework
+    'resume_widget_attribute_refreshes': {
+        'task': 'analysis_framework.tasks.resume_widget_attribute_refreshes',
+        # Every 10 minutes
+        'schedule': crontab(minute="*/10"),
+    },
     # Lead indexing for deduplication
     'index_leads': {
         'task': 'deduplication.tasks.indexing.create_indices',
         'schedule': crontab(minute=0, hour=2),  # execute every second hour of the day
     },
+    # Assessment Registry
+    'update_assessment_dashboard_aggregates_task': {
+        'task': 'assessment_registry.tasks.update_assessment_dashboard_aggregates_task',
+        # Every day at 00:30
+        'schedule': crontab(minute=30, hour=0),
+    },
     # Deep Explore
     'update_deep_explore_entries_count_by_geo_aggreagate_task': {
         'task': 'deep_explore.tasks.update_deep_explore_entries_count_by_geo_aggreagate_task',
         # Every day at 01:00
         'schedule': crontab(minute=0, hour=1),
     },
-    'update_public_deep_explore_snapshot': {
-        'task': 'deep_explore.tasks.update_public_deep_explore_snapshot',
-        # Every day at 01:00
+    'update_deep_explore_project_daily_aggregates_task': {
+        'task': 'deep_explore.tasks.update_deep_explore_project_daily_aggregates_task',
+        # Every day at 01:00 (Public snapshots are generated after this, see the task)
         'schedule': crontab(minute=0, hour=1),
     },
     'schedule_tracker_data_handler': {
@@ -1,7 +1,13 @@
 from typing import Dict, List, Tuple, Union, IO
+import os
 import json
+import shutil
 
 from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models.fields.files import FieldFile
+from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 from django.core.serializers.json import DjangoJSONEncoder
 
 
@@ -20,3 +26,32 @@ def generate_json_file_for_upload(data: Union[Dict, List, Tuple], **kwargs) -> C
             **kwargs,
         ).encode('utf-8'),
     )
+
+
+def copy_storage_file(field_file: FieldFile, name: str) -> str:
+    """
+    Copy file to the provided name within the same storage.
+    S3 and filesystem storages copy the file without reading it through this process.
+    Returns the name of the copy (Can be different from the provided name if it is already used)
+    """
+    storage = field_file.storage
+    name = storage.get_available_name(name)
+    if isinstance(storage, S3Boto3Storage):
+        # Server side copy
+        extra_args = {}
+        if storage.default_acl:
+            extra_args['ACL'] = storage.default_acl
+        storage.bucket.Object(storage._normalize_name(clean_name(name))).copy_from(
+            CopySource={
+                'Bucket': storage.bucket.name,
+                'Key': storage._normalize_name(clean_name(field_file.name)),
+            },
+            **extra_args,
+        )
+        return name
+    if isinstance(storage, FileSystemStorage):
+        path = storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(storage.path(field_file.name), path)
+        return name
+    return storage.save(name, field_file)
@@ -21,6 +21,8 @@ class RequestHelper:
     url: str
     ignore_error: bool = False
     custom_error_handler: Union[Callable, None] = None
+    # Use to reuse HTTP connections for multiple requests
+    session: Union[None, requests.Session] = field(default=None, repr=False)
     response: Union[None, requests.Response] = field(init=False, repr=False)
     error_on_response: Union[bool, None] = field(init=False)
 
@@ -33,7 +35,7 @@ class RequestHelper:
 
     def fetch(self):
         try:
-            self.response = requests.get(self.url)
+            self.response = (self.session or requests).get(self.url)
             self.error_on_response = False
         except Exception as e:
             self.error_on_response = True